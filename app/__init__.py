@@ -7,6 +7,12 @@ from .config import Config
 
 from .db.connection import Database
 
+from .services.postgres_pubsub import PostgresManager
+from .services.presence import PresenceRegistry
+from .services.storage_gateway import StorageGateway, LocalStorageBackend
+
+from .utils.clock import SystemClock
+
 import os
 
 import atexit
@@ -27,7 +33,21 @@ def create_app():
     app.config.from_object(Config)
 
     jwt.init_app(app)
-    socketio.init_app(app)
+
+    # Without a message queue, emits only reach clients of the emitting process
+    if app.config.get("SOCKETIO_MESSAGE_QUEUE") == "postgres":
+        socketio.init_app(
+            app,
+            client_manager=PostgresManager(
+                app.config.get("SOCKETIO_LISTEN_DATABASE_URL")
+                or app.config["DATABASE_URL"],
+                channel=app.config.get("SOCKETIO_CHANNEL", "socketio"),
+            ),
+        )
+    else:
+        socketio.init_app(app)
+
+    PresenceRegistry.init_app(app)
 
     CORS(app, origins=["http://127.0.0.1:3000"], supports_credentials=True)
 
@@ -42,6 +62,12 @@ def create_app():
         db.init_app(app)
         app.extensions["db"] = db
 
+    storage = StorageGateway()
+    storage.init_app(app)
+    app.extensions["storage"] = storage
+
+    app.extensions["clock"] = SystemClock()
+
     # Close pool gracefully only when the app exits
     atexit.register(lambda: app.extensions.get("db") and app.extensions["db"].close())
 
@@ -58,6 +84,13 @@ def create_app():
         # Serve images that Nuxt Image tries to optimize via IPX
         return send_from_directory(os.path.join(NUXT_DIST_DIR, "images"), filename)
 
+    if app.config.get("STORAGE_BACKEND") == "local":
+
+        @app.route(f"{LocalStorageBackend.URL_PREFIX}/<path:filename>")
+        def local_storage(filename):
+            # Serve files uploaded through the local storage backend
+            return send_from_directory(app.config["LOCAL_STORAGE_DIR"], filename)
+
     @app.route("/favicon.svg")
     def favicon_svg():
         return send_from_directory(NUXT_DIST_DIR, "favicon.svg")
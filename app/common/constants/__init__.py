@@ -2,8 +2,12 @@ from .enums import (  # noqa: F401
     GenderEnum,
     BookAvailabilityEnum,
     BookConditionEnum,
+    BookImagesStatusEnum,
     NotificationTypeEnum,
+    OutboxEventTypeEnum,
+    OutboxEventStatusEnum,
     AuthProviderEnum,
 )
 
 from .notification_messages import NotificationMessages  # noqa: F401
+from .notification_templates import NotificationTemplates  # noqa: F401
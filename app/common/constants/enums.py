@@ -21,12 +21,32 @@ class BookAvailabilityEnum(enum.Enum):
     both = "both"
 
 
+class BookImagesStatusEnum(enum.Enum):
+    pending = "pending"
+    ready = "ready"
+    failed = "failed"
+
+
 class NotificationTypeEnum(enum.Enum):
     rent = "rent"
     purchase = "purchase"
     system = "system"
 
 
+class OutboxEventTypeEnum(enum.Enum):
+    notification = "notification"
+    notifications = "notifications"
+    email = "email"
+    socket_emit = "socket_emit"
+
+
+class OutboxEventStatusEnum(enum.Enum):
+    pending = "pending"
+    processing = "processing"
+    done = "done"
+    failed = "failed"
+
+
 class AuthProviderEnum(enum.Enum):
     local = "local"
     google = "google"
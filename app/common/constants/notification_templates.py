@@ -0,0 +1,160 @@
+from .notification_messages import NotificationMessages
+
+
+class NotificationTemplates:
+    """
+    IDs of the notification templates.
+
+    Notifications are stored as one of these IDs plus their parameters (username,
+    title, reason, meetup_location) instead of rendered text, and are rendered from
+    TEMPLATES when read. Rewording a message in NotificationMessages therefore also
+    changes the notifications already sent. The IDs are stored in the database, so
+    never rename one.
+    """
+
+    # --------------- Rent related
+
+    RENTAL_REQUEST = "rental_request"
+    RENTAL_REQUEST_EXPIRED = "rental_request_expired"
+    RENTAL_REQUEST_REJECTED = "rental_request_rejected"
+    RENTAL_REQUEST_CANCELLED = "rental_request_cancelled"
+    RENTAL_REQUEST_APPROVED = "rental_request_approved"
+    RENTAL_PICKUP_REMINDER_RENTER = "rental_pickup_reminder_renter"
+    RENTAL_PICKUP_REMINDER_OWNER = "rental_pickup_reminder_owner"
+    RENTAL_CONFIRM_BOOK_PICKUP_RENTER = "rental_confirm_book_pickup_renter"
+    RENTAL_CONFIRM_BOOK_PICKUP_OWNER = "rental_confirm_book_pickup_owner"
+    RENTAL_STARTED = "rental_started"
+    RENTAL_RETURN_REMINDER_RENTER = "rental_return_reminder_renter"
+    RENTAL_RETURN_REMINDER_OWNER = "rental_return_reminder_owner"
+    RENTAL_RETURN_VERIFICATION_NEEDED_RENTER = (
+        "rental_return_verification_needed_renter"
+    )
+    RENTAL_RETURN_VERIFICATION_NEEDED_OWNER = "rental_return_verification_needed_owner"
+    RENTAL_COMPLETED_RENTER = "rental_completed_renter"
+    RENTAL_COMPLETED_OWNER = "rental_completed_owner"
+
+    # --------------- Purchase related
+
+    PURCHASE_REQUEST = "purchase_request"
+    PURCHASE_REQUEST_EXPIRED = "purchase_request_expired"
+    PURCHASE_REQUEST_REJECTED = "purchase_request_rejected"
+    PURCHASE_REQUEST_CANCELLED = "purchase_request_cancelled"
+    PURCHASE_REQUEST_APPROVED = "purchase_request_approved"
+    PURCHASE_PICKUP_REMINDER_BUYER = "purchase_pickup_reminder_buyer"
+    PURCHASE_PICKUP_REMINDER_OWNER = "purchase_pickup_reminder_owner"
+    PURCHASE_CONFIRM_BOOK_PICKUP_BUYER = "purchase_confirm_book_pickup_buyer"
+    PURCHASE_CONFIRM_BOOK_PICKUP_OWNER = "purchase_confirm_book_pickup_owner"
+    PURCHASE_COMPLETED_BUYER = "purchase_completed_buyer"
+    PURCHASE_COMPLETED_OWNER = "purchase_completed_owner"
+
+    # (header, message) of each template
+    TEMPLATES: dict[str, tuple[str, str]] = {
+        RENTAL_REQUEST: (
+            NotificationMessages.RENTAL_REQUEST_HEADER,
+            NotificationMessages.RENTAL_REQUEST_MESSAGE,
+        ),
+        RENTAL_REQUEST_EXPIRED: (
+            NotificationMessages.RENTAL_REQUEST_EXPIRED_HEADER,
+            NotificationMessages.RENTAL_REQUEST_EXPIRED_MESSAGE,
+        ),
+        RENTAL_REQUEST_REJECTED: (
+            NotificationMessages.RENTAL_REQUEST_REJECTED_HEADER,
+            NotificationMessages.RENTAL_REQUEST_REJECTED_MESSAGE,
+        ),
+        RENTAL_REQUEST_CANCELLED: (
+            NotificationMessages.RENTAL_REQUEST_CANCELLED_HEADER,
+            NotificationMessages.RENTAL_REQUEST_CANCELLED_MESSAGE,
+        ),
+        RENTAL_REQUEST_APPROVED: (
+            NotificationMessages.RENTAL_REQUEST_APPROVED_HEADER,
+            NotificationMessages.RENTAL_REQUEST_APPROVED_MESSAGE,
+        ),
+        RENTAL_PICKUP_REMINDER_RENTER: (
+            NotificationMessages.RENTAL_PICKUP_REMINDER_HEADER,
+            NotificationMessages.RENTAL_PICKUP_REMINDER_RENTER_MESSAGE,
+        ),
+        RENTAL_PICKUP_REMINDER_OWNER: (
+            NotificationMessages.RENTAL_PICKUP_REMINDER_HEADER,
+            NotificationMessages.RENTAL_PICKUP_REMINDER_OWNER_MESSAGE,
+        ),
+        RENTAL_CONFIRM_BOOK_PICKUP_RENTER: (
+            NotificationMessages.RENTAL_CONFIRM_BOOK_PICKUP_HEADER,
+            NotificationMessages.RENTAL_CONFIRM_BOOK_PICKUP_RENTER_MESSAGE,
+        ),
+        RENTAL_CONFIRM_BOOK_PICKUP_OWNER: (
+            NotificationMessages.RENTAL_CONFIRM_BOOK_PICKUP_HEADER,
+            NotificationMessages.RENTAL_CONFIRM_BOOK_PICKUP_OWNER_MESSAGE,
+        ),
+        RENTAL_STARTED: (
+            NotificationMessages.RENTAL_STARTED_HEADER,
+            NotificationMessages.RENTAL_STARTED_MESSAGE,
+        ),
+        RENTAL_RETURN_REMINDER_RENTER: (
+            NotificationMessages.RENTAL_RETURN_REMINDER_HEADER,
+            NotificationMessages.RENTAL_RETURN_REMINDER_RENTER_MESSAGE,
+        ),
+        RENTAL_RETURN_REMINDER_OWNER: (
+            NotificationMessages.RENTAL_RETURN_REMINDER_HEADER,
+            NotificationMessages.RENTAL_RETURN_REMINDER_OWNER_MESSAGE,
+        ),
+        RENTAL_RETURN_VERIFICATION_NEEDED_RENTER: (
+            NotificationMessages.RENTAL_RETURN_VERIFICATION_NEEDED_HEADER,
+            NotificationMessages.RENTAL_RETURN_VERIFICATION_NEEDED_RENTER_MESSAGE,
+        ),
+        RENTAL_RETURN_VERIFICATION_NEEDED_OWNER: (
+            NotificationMessages.RENTAL_RETURN_VERIFICATION_NEEDED_HEADER,
+            NotificationMessages.RENTAL_RETURN_VERIFICATION_NEEDED_OWNER_MESSAGE,
+        ),
+        RENTAL_COMPLETED_RENTER: (
+            NotificationMessages.RENTAL_COMPLETED_HEADER,
+            NotificationMessages.RETURN_COMPLETED_RENTER_MESSAGE,
+        ),
+        RENTAL_COMPLETED_OWNER: (
+            NotificationMessages.RENTAL_COMPLETED_HEADER,
+            NotificationMessages.RETURN_COMPLETED_OWNER_MESSAGE,
+        ),
+        PURCHASE_REQUEST: (
+            NotificationMessages.PURCHASE_REQUEST_HEADER,
+            NotificationMessages.PURCHASE_REQUEST_MESSAGE,
+        ),
+        PURCHASE_REQUEST_EXPIRED: (
+            NotificationMessages.PURCHASE_REQUEST_EXPIRED_HEADER,
+            NotificationMessages.PURCHASE_REQUEST_EXPIRED_MESSAGE,
+        ),
+        PURCHASE_REQUEST_REJECTED: (
+            NotificationMessages.PURCHASE_REQUEST_REJECTED_HEADER,
+            NotificationMessages.PURCHASE_REQUEST_REJECTED_MESSAGE,
+        ),
+        PURCHASE_REQUEST_CANCELLED: (
+            NotificationMessages.PURCHASE_REQUEST_CANCELLED_HEADER,
+            NotificationMessages.PURCHASE_REQUEST_CANCELLED_MESSAGE,
+        ),
+        PURCHASE_REQUEST_APPROVED: (
+            NotificationMessages.PURCHASE_REQUEST_APPROVED_HEADER,
+            NotificationMessages.PURCHASE_REQUEST_APPROVED_MESSAGE,
+        ),
+        PURCHASE_PICKUP_REMINDER_BUYER: (
+            NotificationMessages.PURCHASE_PICKUP_REMINDER_HEADER,
+            NotificationMessages.PURCHASE_PICKUP_REMINDER_BUYER_MESSAGE,
+        ),
+        PURCHASE_PICKUP_REMINDER_OWNER: (
+            NotificationMessages.PURCHASE_PICKUP_REMINDER_HEADER,
+            NotificationMessages.PURCHASE_PICKUP_REMINDER_OWNER_MESSAGE,
+        ),
+        PURCHASE_CONFIRM_BOOK_PICKUP_BUYER: (
+            NotificationMessages.PURCHASE_CONFIRM_BOOK_PICKUP_HEADER,
+            NotificationMessages.PURCHASE_CONFIRM_BOOK_PICKUP_BUYER_MESSAGE,
+        ),
+        PURCHASE_CONFIRM_BOOK_PICKUP_OWNER: (
+            NotificationMessages.PURCHASE_CONFIRM_BOOK_PICKUP_HEADER,
+            NotificationMessages.PURCHASE_CONFIRM_BOOK_PICKUP_OWNER_MESSAGE,
+        ),
+        PURCHASE_COMPLETED_BUYER: (
+            NotificationMessages.PURCHASE_COMPLETED_HEADER,
+            NotificationMessages.PURCHASE_COMPLETED_BUYER_MESSAGE,
+        ),
+        PURCHASE_COMPLETED_OWNER: (
+            NotificationMessages.PURCHASE_COMPLETED_HEADER,
+            NotificationMessages.PURCHASE_COMPLETED_OWNER_MESSAGE,
+        ),
+    }
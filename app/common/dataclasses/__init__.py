@@ -2,3 +2,4 @@ from .book import Book  # noqa: F401
 from .my_library_book import MyLibraryBook  # noqa: F401
 from .user import User  # noqa: F401
 from .notification import Notification  # noqa: F401
+from .queued_book_image import QueuedBookImage  # noqa: F401
@@ -20,3 +20,4 @@ class MyLibraryBook:
     renter_username: str | None
     renter_profile_image_url: str | None
     first_image_url: str
+    images_status: str
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class QueuedBookImage:
+    """A book image read out of the request so it can be uploaded after the response is sent."""
+
+    filename: str
+    content_type: str | None
+    data: bytes
@@ -13,6 +13,156 @@ class Config:
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
+    # Where uploaded files (book images) are stored: "supabase" or "local"
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")
+    # Made absolute here, so the storage backend and the route serving the files
+    # resolve a relative path against the same (working) directory
+    LOCAL_STORAGE_DIR = os.path.abspath(
+        os.getenv(
+            "LOCAL_STORAGE_DIR",
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "local_storage"),
+        )
+    )
+
+    # Number of background workers that upload book images after the request returns
+    BACKGROUND_QUEUE_WORKERS = int(os.getenv("BACKGROUND_QUEUE_WORKERS", 2))
+
+    # Maximum number of rows accepted by POST /api/books/bulk-import
+    BOOK_BULK_IMPORT_MAX_ROWS = int(os.getenv("BOOK_BULK_IMPORT_MAX_ROWS", 5000))
+
+    # Format of the thumbnail/card/full variants generated for book images ("webp" or "jpeg")
+    BOOK_IMAGE_VARIANT_FORMAT = os.getenv("BOOK_IMAGE_VARIANT_FORMAT", "webp")
+
+    # Image upload jobs are queued in memory and lost if their process dies. Books
+    # left 'pending' for longer than the timeout are marked 'failed' (checked when
+    # the scheduler starts, then every check interval) so owners can upload again.
+    BOOK_IMAGES_PENDING_TIMEOUT_SECONDS = float(
+        os.getenv("BOOK_IMAGES_PENDING_TIMEOUT_SECONDS", 1800)
+    )
+    BOOK_IMAGES_PENDING_CHECK_INTERVAL_SECONDS = float(
+        os.getenv("BOOK_IMAGES_PENDING_CHECK_INTERVAL_SECONDS", 300)
+    )
+
+    # The scheduler sleeps until the next task is due, but at least/at most this long
+    SCHEDULER_MIN_SLEEP_SECONDS = float(os.getenv("SCHEDULER_MIN_SLEEP_SECONDS", 5))
+    SCHEDULER_MAX_SLEEP_SECONDS = float(os.getenv("SCHEDULER_MAX_SLEEP_SECONDS", 300))
+
+    # The scheduler LISTENs for new due times, which needs a session connection. Set
+    # this if DATABASE_URL points at a transaction-mode pooler.
+    SCHEDULER_LISTEN_DATABASE_URL = os.getenv("SCHEDULER_LISTEN_DATABASE_URL")
+
+    # Due times loaded into the scheduler's in-memory heap at once
+    SCHEDULER_DUE_TIMES_LOAD_LIMIT = int(
+        os.getenv("SCHEDULER_DUE_TIMES_LOAD_LIMIT", 1000)
+    )
+
+    # Scheduler jobs run concurrently, at most this many at a time, and are cancelled
+    # after the timeout. Each holds a pooled database connection while it runs, so
+    # keep this below the pool size (3) to leave connections for requests.
+    SCHEDULER_JOB_CONCURRENCY = int(os.getenv("SCHEDULER_JOB_CONCURRENCY", 2))
+    SCHEDULER_JOB_TIMEOUT_SECONDS = float(
+        os.getenv("SCHEDULER_JOB_TIMEOUT_SECONDS", 120)
+    )
+
+    # Scheduler job run history (scheduler_job_runs) is kept this many days
+    SCHEDULER_JOB_RUNS_RETENTION_DAYS = int(
+        os.getenv("SCHEDULER_JOB_RUNS_RETENTION_DAYS", 30)
+    )
+
+    # Rows handled per statement (and transaction) by the scheduler tasks. When a
+    # backlog fills whole batches, they run at up to SCHEDULER_CATCH_UP_ROWS_PER_SECOND.
+    SCHEDULER_BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", 500))
+    SCHEDULER_CATCH_UP_ROWS_PER_SECOND = float(
+        os.getenv("SCHEDULER_CATCH_UP_ROWS_PER_SECOND", 1000)
+    )
+
+    # Outbox worker: events claimed per batch, and how long a claim lasts before
+    # another worker may take over the events of a worker that died
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 100))
+    OUTBOX_LOCK_SECONDS = int(os.getenv("OUTBOX_LOCK_SECONDS", 60))
+    OUTBOX_POLL_INTERVAL_SECONDS = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", 1))
+
+    # Failed events are retried with exponential backoff, then marked 'failed'
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+    OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", 5))
+    OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", 900))
+
+    # Delivered events are kept this long (in seconds) before being deleted
+    OUTBOX_RETENTION_SECONDS = int(os.getenv("OUTBOX_RETENTION_SECONDS", 7 * 24 * 3600))
+
+    # Socket.IO emits queued within this window are sent together; unread count
+    # updates to the same user within it are coalesced into the latest one
+    SOCKETIO_EMIT_WINDOW_SECONDS = float(os.getenv("SOCKETIO_EMIT_WINDOW_SECONDS", 0.1))
+    SOCKETIO_EMIT_BATCH_SIZE = int(os.getenv("SOCKETIO_EMIT_BATCH_SIZE", 100))
+
+    # Set to "postgres" to relay Socket.IO emits between app processes over
+    # LISTEN/NOTIFY, which is needed to run more than one process. Listening needs
+    # a session connection, like SCHEDULER_LISTEN_DATABASE_URL.
+    SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", "")
+    SOCKETIO_CHANNEL = os.getenv("SOCKETIO_CHANNEL", "socketio")
+    SOCKETIO_LISTEN_DATABASE_URL = (
+        os.getenv("SOCKETIO_LISTEN_DATABASE_URL") or SCHEDULER_LISTEN_DATABASE_URL
+    )
+
+    # Bulk notification inserts of at least this many rows use COPY
+    NOTIFICATIONS_COPY_THRESHOLD = int(os.getenv("NOTIFICATIONS_COPY_THRESHOLD", 1000))
+
+    # notifications is partitioned by month. Partitions are created this many months
+    # ahead, and the ones older than NOTIFICATIONS_RETENTION_MONTHS full months are
+    # dropped (after being copied to notifications_archive if NOTIFICATIONS_ARCHIVE).
+    # Inbox queries only look at the retained months.
+    NOTIFICATIONS_PARTITIONS_AHEAD_MONTHS = int(
+        os.getenv("NOTIFICATIONS_PARTITIONS_AHEAD_MONTHS", 2)
+    )
+    NOTIFICATIONS_RETENTION_MONTHS = int(
+        os.getenv("NOTIFICATIONS_RETENTION_MONTHS", 12)
+    )
+    NOTIFICATIONS_ARCHIVE = os.getenv("NOTIFICATIONS_ARCHIVE", "true").lower() == "true"
+    NOTIFICATIONS_PARTITION_MAINTENANCE_INTERVAL_SECONDS = float(
+        os.getenv("NOTIFICATIONS_PARTITION_MAINTENANCE_INTERVAL_SECONDS", 24 * 3600)
+    )
+
+    # How often (in seconds) the scheduler recounts unread notifications to fix any
+    # drift in the per-user counters kept by the notifications triggers
+    NOTIFICATION_COUNTS_REPAIR_INTERVAL_SECONDS = float(
+        os.getenv("NOTIFICATION_COUNTS_REPAIR_INTERVAL_SECONDS", 6 * 3600)
+    )
+
+    # GET /api/notifications/changes returns at most this many changes; clients
+    # further behind reload their inbox. Changes are kept for
+    # NOTIFICATION_CHANGES_RETENTION_HOURS, pruned every
+    # NOTIFICATION_CHANGES_PRUNE_INTERVAL_SECONDS.
+    NOTIFICATION_CHANGES_MAX_ROWS = int(os.getenv("NOTIFICATION_CHANGES_MAX_ROWS", 500))
+    NOTIFICATION_CHANGES_RETENTION_HOURS = float(
+        os.getenv("NOTIFICATION_CHANGES_RETENTION_HOURS", 72)
+    )
+    NOTIFICATION_CHANGES_PRUNE_INTERVAL_SECONDS = float(
+        os.getenv("NOTIFICATION_CHANGES_PRUNE_INTERVAL_SECONDS", 3600)
+    )
+
+    # Unread notifications are emailed as one digest per user every
+    # NOTIFICATION_DIGEST_INTERVAL_SECONDS. A digest lists up to
+    # NOTIFICATION_DIGEST_MAX_ITEMS of the notifications created since the user's
+    # last digest (at most NOTIFICATION_DIGEST_WINDOW_SECONDS ago), skipping the ones
+    # younger than NOTIFICATION_DIGEST_DELAY_SECONDS, which the user may still read.
+    # NOTIFICATION_DIGEST_BATCH_SIZE digests are sent per SMTP connection.
+    NOTIFICATION_DIGESTS_ENABLED = (
+        os.getenv("NOTIFICATION_DIGESTS_ENABLED", "false").lower() == "true"
+    )
+    NOTIFICATION_DIGEST_INTERVAL_SECONDS = float(
+        os.getenv("NOTIFICATION_DIGEST_INTERVAL_SECONDS", 3600)
+    )
+    NOTIFICATION_DIGEST_WINDOW_SECONDS = float(
+        os.getenv("NOTIFICATION_DIGEST_WINDOW_SECONDS", 24 * 3600)
+    )
+    NOTIFICATION_DIGEST_DELAY_SECONDS = float(
+        os.getenv("NOTIFICATION_DIGEST_DELAY_SECONDS", 15 * 60)
+    )
+    NOTIFICATION_DIGEST_MAX_ITEMS = int(os.getenv("NOTIFICATION_DIGEST_MAX_ITEMS", 10))
+    NOTIFICATION_DIGEST_BATCH_SIZE = int(
+        os.getenv("NOTIFICATION_DIGEST_BATCH_SIZE", 50)
+    )
+
     XENDIT_SECRET_KEY = os.getenv("XENDIT_SECRET_KEY")
     XENDIT_WEBHOOK_SECRET_KEY = os.getenv("XENDIT_WEBHOOK_SECRET_KEY")
 
@@ -1,13 +1,15 @@
 from flask import current_app
 
 import logging
+import threading
 
-from psycopg import OperationalError
+from psycopg import Connection, OperationalError, connect
 from psycopg_pool import ConnectionPool
-from psycopg.rows import dict_row, TupleRow
+from psycopg.rows import DictRow, dict_row, TupleRow
 from psycopg.abc import Query
 
-from typing import Any, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,15 @@ class Database:
 
     # type hint for mypy
     pool: Optional[ConnectionPool] = None
+    conninfo: Optional[str] = None
+
+    # Dedicated connection that holds session-level advisory locks, outside the pool
+    _lock_conn: Optional[Connection[DictRow]] = None
+    _lock_conn_mutex = threading.Lock()
+
+    # Callbacks to run once the transaction open on a connection commits, keyed by
+    # id() of the connection
+    _after_commit_callbacks: dict[int, list[Callable[[], None]]] = {}
 
     def __new__(cls) -> "Database":
         if cls._instance is None:
@@ -38,6 +49,8 @@ class Database:
         if not conninfo:
             raise RuntimeError("DATABASE_URL is not configured in Flask app.")
 
+        self.conninfo = conninfo
+
         self.pool = ConnectionPool(
             conninfo=conninfo,
             min_size=2,
@@ -137,8 +150,105 @@ class Database:
                     raise
         return None
 
+    @contextmanager
+    def transaction(self) -> Iterator[Connection]:
+        """
+        Run several statements on one pooled connection inside a single transaction.
+
+        Commits when the block exits normally and rolls back if it raises. Unlike the
+        helpers above, it is not retried on OperationalError, since a partially applied
+        block cannot be replayed safely.
+
+        Usage:
+            with db.transaction() as conn:
+                with conn.cursor() as cur:
+                    ...
+        """
+        callbacks: list[Callable[[], None]] = []
+
+        with self.get_conn() as conn:
+            self._after_commit_callbacks[id(conn)] = callbacks
+            try:
+                with conn.transaction():
+                    yield conn
+            finally:
+                del self._after_commit_callbacks[id(conn)]
+
+        for callback in callbacks:
+            callback()
+
+    def after_commit(self, conn: Connection, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` once the transaction() block that `conn` belongs to commits.
+
+        It is dropped if the block rolls back, and runs right away if `conn` is not
+        inside a transaction() block.
+        """
+        callbacks = self._after_commit_callbacks.get(id(conn))
+
+        if callbacks is None:
+            callback()
+        else:
+            callbacks.append(callback)
+
+    @contextmanager
+    def advisory_lock(self, name: str) -> Iterator[bool]:
+        """
+        Try to take a cluster-wide lease named `name` for the duration of the block.
+
+        Uses a non-blocking Postgres session advisory lock held on a dedicated
+        connection, so at most one process across every app instance is inside the
+        block at a time. If the holder dies, its connection closes and Postgres frees
+        the lock, so another process takes over on its next attempt.
+
+        Usage:
+            with db.advisory_lock("scheduler:cleanup_expired_rentals") as acquired:
+                if acquired:
+                    ...
+
+        Yields:
+            bool: True if the lock was acquired, False if another session holds it.
+        """
+        from app.db.queries import CommonQueries
+
+        acquired = self._run_on_lock_conn(CommonQueries.TRY_ADVISORY_LOCK, name)
+
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                self._run_on_lock_conn(CommonQueries.ADVISORY_UNLOCK, name)
+
+    def _run_on_lock_conn(self, query: Query, name: str) -> bool:
+        """Run an advisory lock function on the lock connection, reconnecting it once if needed."""
+        with self._lock_conn_mutex:
+            for attempt in range(2):
+                try:
+                    if self._lock_conn is None or self._lock_conn.closed:
+                        self._lock_conn = connect(
+                            self.conninfo or current_app.config["DATABASE_URL"],
+                            autocommit=True,
+                            row_factory=dict_row,
+                        )
+
+                    result = self._lock_conn.execute(query, (name,)).fetchone()
+                    return bool(result and result["result"])
+                except OperationalError:
+                    # A dropped connection has already lost its locks
+                    if self._lock_conn is not None:
+                        self._lock_conn.close()
+                    self._lock_conn = None
+
+                    if attempt == 1:
+                        raise
+        return False
+
     def close(self):
         """Close the pool gracefully."""
+        if self._lock_conn is not None and not self._lock_conn.closed:
+            self._lock_conn.close()
+            self._lock_conn = None
+
         if self.pool and not self.pool.closed:
             try:
                 self.pool.close(timeout=5)
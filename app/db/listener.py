@@ -0,0 +1,86 @@
+import logging
+import traceback
+
+from typing import Callable, Optional
+
+import eventlet
+from eventlet.hubs import trampoline
+from psycopg import connect, sql
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseListener:
+    """
+    Receives Postgres NOTIFY messages for one channel on a dedicated connection.
+
+    Runs in a greenthread and waits on the connection socket through the eventlet
+    hub, so it never blocks other greenthreads. If the connection drops, it
+    reconnects after `reconnect_delay` seconds and calls `on_connect` again, since
+    notifications sent while disconnected are lost.
+    """
+
+    # How long to wait for a notification before checking the connection is alive
+    _heartbeat_seconds = 60
+
+    def __init__(
+        self,
+        conninfo: str,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_connect: Optional[Callable[[], None]] = None,
+        reconnect_delay: float = 5,
+    ) -> None:
+        self.conninfo = conninfo
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_connect = on_connect
+        self.reconnect_delay = reconnect_delay
+
+        self._greenthread = None
+
+    def start(self):
+        """Start listening in a greenthread. Calling it again does nothing."""
+        if self._greenthread is None:
+            self._greenthread = eventlet.spawn(self._run)
+        return self._greenthread
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with connect(self.conninfo, autocommit=True) as conn:
+                    conn.execute(
+                        sql.SQL("LISTEN {}").format(sql.Identifier(self.channel))
+                    )
+                    logger.info(f"Listening for notifications on {self.channel}")
+
+                    if self.on_connect:
+                        self.on_connect()
+
+                    while True:
+                        try:
+                            trampoline(
+                                conn.fileno(),
+                                read=True,
+                                timeout=self._heartbeat_seconds,
+                                timeout_exc=TimeoutError,
+                            )
+                        except TimeoutError:
+                            # Raises if the server went away without closing the socket
+                            conn.execute("SELECT 1")
+                            continue
+
+                        for notify in conn.notifies(timeout=0):
+                            self._dispatch(notify.payload)
+
+            except Exception as e:
+                logger.error(f"Listener on {self.channel} failed: {str(e)}")
+                traceback.print_exc()
+                eventlet.sleep(self.reconnect_delay)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            self.on_notify(payload)
+        except Exception as e:
+            logger.error(f"Handling a notification on {self.channel} failed: {str(e)}")
+            traceback.print_exc()
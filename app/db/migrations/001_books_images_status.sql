@@ -0,0 +1,12 @@
+-- Track the background image upload state of each book so the add/edit
+-- endpoints can return before every photo reaches the storage bucket.
+
+ALTER TABLE books
+    ADD COLUMN IF NOT EXISTS images_status TEXT NOT NULL DEFAULT 'ready';
+
+ALTER TABLE books
+    DROP CONSTRAINT IF EXISTS books_images_status_check;
+
+ALTER TABLE books
+    ADD CONSTRAINT books_images_status_check
+    CHECK (images_status IN ('pending', 'ready', 'failed'));
@@ -0,0 +1,7 @@
+-- Downscaled variants generated for every uploaded book image. Rows uploaded
+-- before this migration keep NULL variants and fall back to image_url.
+
+ALTER TABLE book_images
+    ADD COLUMN IF NOT EXISTS thumbnail_url TEXT,
+    ADD COLUMN IF NOT EXISTS card_url TEXT,
+    ADD COLUMN IF NOT EXISTS full_url TEXT;
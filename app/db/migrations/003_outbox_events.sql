@@ -0,0 +1,27 @@
+-- Transactional outbox for side effects (notifications, emails, socket emits).
+-- Events are inserted in the same transaction as the change that causes them and
+-- delivered afterwards by the outbox worker of any app instance.
+
+CREATE TABLE IF NOT EXISTS outbox_events (
+    event_id BIGSERIAL PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_until TIMESTAMPTZ,
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    processed_at TIMESTAMPTZ,
+    CONSTRAINT outbox_events_status_check
+        CHECK (status IN ('pending', 'processing', 'done', 'failed'))
+);
+
+-- Only undelivered events are scanned by the worker
+CREATE INDEX IF NOT EXISTS outbox_events_pending_idx
+    ON outbox_events (available_at)
+    WHERE status = 'pending';
+
+CREATE INDEX IF NOT EXISTS outbox_events_processing_idx
+    ON outbox_events (locked_until)
+    WHERE status = 'processing';
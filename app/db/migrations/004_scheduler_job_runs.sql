@@ -0,0 +1,24 @@
+-- One row per scheduler job run, for the /api/metrics/scheduler-jobs endpoint.
+-- Runs skipped because another app instance held the job's lock are not recorded.
+
+CREATE TABLE IF NOT EXISTS scheduler_job_runs (
+    job_run_id BIGSERIAL PRIMARY KEY,
+    job_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TIMESTAMPTZ NOT NULL,
+    duration_ms DOUBLE PRECISION NOT NULL,
+    -- How long after its due time the job started; NULL when the run was not due
+    lag_ms DOUBLE PRECISION,
+    rows_affected INTEGER,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    worker TEXT,
+    CONSTRAINT scheduler_job_runs_status_check
+        CHECK (status IN ('succeeded', 'failed'))
+);
+
+CREATE INDEX IF NOT EXISTS scheduler_job_runs_job_name_started_at_idx
+    ON scheduler_job_runs (job_name, started_at DESC);
+
+CREATE INDEX IF NOT EXISTS scheduler_job_runs_started_at_idx
+    ON scheduler_job_runs (started_at);
@@ -0,0 +1,56 @@
+-- Notify the scheduler whenever a rental or purchase gets a new due time
+-- (reservation expiry, 1 hour before meetup, 1 hour before return), so it can keep
+-- its due times in memory instead of scanning both tables.
+--
+-- Payload: {"key": "<table>:<id>", "seconds_until_due": <float or null>}, where
+-- null means the row no longer has anything due. Due times use the same local
+-- clock as the task queries (UTC + 8 hours).
+
+CREATE OR REPLACE FUNCTION notify_scheduler_due_time() RETURNS trigger AS $$
+DECLARE
+    now_local TIMESTAMP := NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours';
+    row_key TEXT;
+    due_at TIMESTAMP;
+BEGIN
+    IF TG_TABLE_NAME = 'rented_books' THEN
+        row_key := 'rented_books:' || NEW.rental_id;
+        due_at := CASE NEW.rent_status::text
+            WHEN 'pending' THEN NEW.reservation_expires_at
+            WHEN 'approved' THEN (NEW.meetup_date + NEW.meetup_time::time) - INTERVAL '1 hour'
+            WHEN 'ongoing' THEN (NEW.rent_end_date + NEW.meetup_time::time) - INTERVAL '1 hour'
+        END;
+    ELSE
+        row_key := 'purchased_books:' || NEW.purchase_id;
+        due_at := CASE NEW.purchase_status::text
+            WHEN 'pending' THEN NEW.reservation_expires_at
+            WHEN 'approved' THEN (NEW.meetup_date + NEW.meetup_time::time) - INTERVAL '1 hour'
+        END;
+    END IF;
+
+    PERFORM pg_notify(
+        'scheduler_due_times',
+        json_build_object(
+            'key', row_key,
+            'seconds_until_due', EXTRACT(EPOCH FROM (due_at - now_local))
+        )::text
+    );
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS rented_books_notify_scheduler_due_time ON rented_books;
+
+CREATE TRIGGER rented_books_notify_scheduler_due_time
+    AFTER INSERT OR UPDATE OF rent_status, reservation_expires_at, meetup_date, meetup_time, rent_end_date
+    ON rented_books
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_scheduler_due_time();
+
+DROP TRIGGER IF EXISTS purchased_books_notify_scheduler_due_time ON purchased_books;
+
+CREATE TRIGGER purchased_books_notify_scheduler_due_time
+    AFTER INSERT OR UPDATE OF purchase_status, reservation_expires_at, meetup_date, meetup_time
+    ON purchased_books
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_scheduler_due_time();
@@ -0,0 +1,100 @@
+-- Per-user unread notification counts, so badge updates read one row instead of
+-- counting the receiver's notifications.
+--
+-- Statement-level triggers keep the counts in the same transaction as every insert,
+-- read-status change, and delete on notifications; a bulk insert or update changes
+-- each affected user's row once. The scheduler's repair job recounts periodically
+-- and fixes any drift (e.g. rows changed while the triggers were disabled).
+
+CREATE TABLE IF NOT EXISTS notification_unread_counts (
+    user_id UUID PRIMARY KEY REFERENCES users (user_id) ON DELETE CASCADE,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Adds each receiver's change in unread count. The changes are passed as parallel
+-- arrays because each trigger event has different transition tables. Rows are
+-- locked in user_id order, so concurrent bulk changes cannot deadlock.
+CREATE OR REPLACE FUNCTION add_notification_unread_counts(user_ids UUID[], deltas BIGINT[])
+RETURNS void AS $$
+    INSERT INTO notification_unread_counts AS counts (user_id, unread_count)
+    SELECT user_id, SUM(delta)
+    FROM unnest(user_ids, deltas) AS changes (user_id, delta)
+    WHERE user_id IS NOT NULL
+    GROUP BY user_id
+    HAVING SUM(delta) <> 0
+    ORDER BY user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET unread_count = GREATEST(counts.unread_count + EXCLUDED.unread_count, 0),
+        updated_at = NOW();
+$$ LANGUAGE sql;
+
+-- Each unread row arriving at a receiver counts +1, each one leaving counts -1.
+-- Each branch only reads the transition tables its trigger event has.
+CREATE OR REPLACE FUNCTION update_notification_unread_counts() RETURNS trigger AS $$
+DECLARE
+    user_ids UUID[];
+    deltas BIGINT[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(receiver_id), array_agg(1)
+        INTO user_ids, deltas
+        FROM new_rows
+        WHERE is_read = FALSE;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(receiver_id), array_agg(-1)
+        INTO user_ids, deltas
+        FROM old_rows
+        WHERE is_read = FALSE;
+
+    ELSE
+        SELECT array_agg(receiver_id), array_agg(delta)
+        INTO user_ids, deltas
+        FROM (
+            SELECT receiver_id, 1 AS delta FROM new_rows WHERE is_read = FALSE
+            UNION ALL
+            SELECT receiver_id, -1 FROM old_rows WHERE is_read = FALSE
+        ) AS changes;
+    END IF;
+
+    IF user_ids IS NOT NULL THEN
+        PERFORM add_notification_unread_counts(user_ids, deltas);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notifications_unread_counts_insert ON notifications;
+
+CREATE TRIGGER notifications_unread_counts_insert
+    AFTER INSERT ON notifications
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_notification_unread_counts();
+
+DROP TRIGGER IF EXISTS notifications_unread_counts_update ON notifications;
+
+CREATE TRIGGER notifications_unread_counts_update
+    AFTER UPDATE ON notifications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_notification_unread_counts();
+
+DROP TRIGGER IF EXISTS notifications_unread_counts_delete ON notifications;
+
+CREATE TRIGGER notifications_unread_counts_delete
+    AFTER DELETE ON notifications
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_notification_unread_counts();
+
+-- Backfill
+INSERT INTO notification_unread_counts (user_id, unread_count)
+SELECT receiver_id, COUNT(*)
+FROM notifications
+WHERE is_read = FALSE AND receiver_id IS NOT NULL
+GROUP BY receiver_id
+ON CONFLICT (user_id) DO UPDATE
+SET unread_count = EXCLUDED.unread_count, updated_at = NOW();
@@ -0,0 +1,197 @@
+-- Range-partition notifications by month of created_at, so inbox queries only touch
+-- recent partitions and old history is removed by dropping whole partitions instead
+-- of deleting (and vacuuming) rows.
+--
+-- Partitions are named notifications_pYYYY_MM. The scheduler's partition job creates
+-- them NOTIFICATIONS_PARTITIONS_AHEAD_MONTHS ahead, and retires the ones older than
+-- NOTIFICATIONS_RETENTION_MONTHS, copying them to notifications_archive first if
+-- NOTIFICATIONS_ARCHIVE is on.
+
+BEGIN;
+
+ALTER TABLE notifications RENAME TO notifications_unpartitioned;
+
+-- Rows without created_at cannot be routed to a partition
+UPDATE notifications_unpartitioned SET created_at = NOW() WHERE created_at IS NULL;
+
+CREATE TABLE notifications (
+    LIKE notifications_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE (created_at);
+
+ALTER TABLE notifications
+    ALTER COLUMN created_at SET DEFAULT NOW(),
+    ALTER COLUMN created_at SET NOT NULL;
+
+-- Unique constraints on a partitioned table must include the partition key
+ALTER TABLE notifications ADD PRIMARY KEY (notification_id, created_at);
+
+CREATE INDEX notifications_receiver_id_created_at_idx
+    ON notifications (receiver_id, created_at DESC);
+
+CREATE INDEX notifications_receiver_id_unread_idx
+    ON notifications (receiver_id)
+    WHERE is_read = FALSE;
+
+-- Move the foreign keys (e.g. to users) over to the new table
+DO $$
+DECLARE
+    foreign_key RECORD;
+BEGIN
+    FOR foreign_key IN
+        SELECT conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE conrelid = 'notifications_unpartitioned'::regclass AND contype = 'f'
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE notifications_unpartitioned DROP CONSTRAINT %I',
+            foreign_key.conname
+        );
+        EXECUTE format(
+            'ALTER TABLE notifications ADD CONSTRAINT %I %s',
+            foreign_key.conname,
+            foreign_key.definition
+        );
+    END LOOP;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS notifications_archive (
+    LIKE notifications INCLUDING DEFAULTS,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS notifications_archive_receiver_id_created_at_idx
+    ON notifications_archive (receiver_id, created_at DESC);
+
+-- Creates the missing monthly partitions from from_month through months_ahead
+-- months after the current one. Returns how many were created.
+CREATE OR REPLACE FUNCTION create_notification_partitions(
+    from_month DATE,
+    months_ahead INTEGER
+) RETURNS INTEGER AS $$
+DECLARE
+    partition_month DATE := date_trunc('month', from_month)::date;
+    last_month DATE := (date_trunc('month', NOW()) + make_interval(months => months_ahead))::date;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE partition_month <= last_month LOOP
+        partition_name := 'notifications_p' || to_char(partition_month, 'YYYY_MM');
+
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                partition_month,
+                (partition_month + INTERVAL '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+
+        partition_month := (partition_month + INTERVAL '1 month')::date;
+    END LOOP;
+
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Drops the partitions that end before the first of the month retention_months
+-- ago, archiving their rows first if archive is true. Returns how many were dropped.
+CREATE OR REPLACE FUNCTION retire_notification_partitions(
+    retention_months INTEGER,
+    archive BOOLEAN
+) RETURNS INTEGER AS $$
+DECLARE
+    cutoff DATE := (date_trunc('month', NOW()) - make_interval(months => retention_months))::date;
+    old_partition RECORD;
+    partition_month DATE;
+    retired INTEGER := 0;
+BEGIN
+    FOR old_partition IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = 'notifications'::regclass
+        AND child.relname ~ '^notifications_p[0-9]{4}_[0-9]{2}$'
+        ORDER BY child.relname
+    LOOP
+        partition_month := to_date(right(old_partition.relname, 7), 'YYYY_MM');
+
+        CONTINUE WHEN partition_month >= cutoff;
+
+        IF archive THEN
+            EXECUTE format(
+                'INSERT INTO notifications_archive SELECT * FROM %I',
+                old_partition.relname
+            );
+        END IF;
+
+        -- Through the parent table, so the unread counters see the unread rows go;
+        -- dropping the partition fires no triggers
+        DELETE FROM notifications
+        WHERE created_at >= partition_month
+        AND created_at < partition_month + INTERVAL '1 month'
+        AND is_read = FALSE;
+
+        EXECUTE format('DROP TABLE %I', old_partition.relname);
+
+        retired := retired + 1;
+    END LOOP;
+
+    RETURN retired;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_notification_partitions(
+    COALESCE((SELECT MIN(created_at) FROM notifications_unpartitioned)::date, CURRENT_DATE),
+    2
+);
+
+INSERT INTO notifications SELECT * FROM notifications_unpartitioned;
+
+-- Keep any serial column sequences, which would be dropped with the old table
+DO $$
+DECLARE
+    owned RECORD;
+BEGIN
+    FOR owned IN
+        SELECT seq.relname AS sequence_name, attr.attname AS column_name
+        FROM pg_depend dep
+        JOIN pg_class seq ON seq.oid = dep.objid AND seq.relkind = 'S'
+        JOIN pg_attribute attr
+            ON attr.attrelid = dep.refobjid AND attr.attnum = dep.refobjsubid
+        WHERE dep.refobjid = 'notifications_unpartitioned'::regclass
+        AND dep.deptype = 'a'
+    LOOP
+        EXECUTE format(
+            'ALTER SEQUENCE %I OWNED BY notifications.%I',
+            owned.sequence_name,
+            owned.column_name
+        );
+    END LOOP;
+END;
+$$;
+
+-- Also drops the unread counter triggers, which are recreated below on the new
+-- table. The counters already include the moved rows.
+DROP TABLE notifications_unpartitioned;
+
+CREATE TRIGGER notifications_unread_counts_insert
+    AFTER INSERT ON notifications
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_notification_unread_counts();
+
+CREATE TRIGGER notifications_unread_counts_update
+    AFTER UPDATE ON notifications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_notification_unread_counts();
+
+CREATE TRIGGER notifications_unread_counts_delete
+    AFTER DELETE ON notifications
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_notification_unread_counts();
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- Index for keyset pagination of the notification inbox: rows of one receiver in
+-- (created_at, notification_id) order, with is_read included so the read-status
+-- filter is checked from the index alone. Replaces the (receiver_id, created_at)
+-- index from migration 007.
+
+CREATE INDEX IF NOT EXISTS notifications_inbox_idx
+    ON notifications (receiver_id, created_at DESC, notification_id DESC)
+    INCLUDE (is_read);
+
+DROP INDEX IF EXISTS notifications_receiver_id_created_at_idx;
@@ -0,0 +1,12 @@
+-- Socket.IO messages relayed between app processes (see PostgresManager) that are
+-- too large for a NOTIFY payload. Only the message_id is sent with NOTIFY; rows are
+-- deleted a few minutes later, by the next large message.
+
+CREATE TABLE IF NOT EXISTS socketio_messages (
+    message_id BIGSERIAL PRIMARY KEY,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS socketio_messages_created_at_idx
+    ON socketio_messages (created_at);
@@ -0,0 +1,92 @@
+-- Log of notification changes (created, read, unread, deleted) per receiver, for
+-- GET /api/notifications/changes?since=<cursor>.
+--
+-- Each change records the ID of the transaction that made it. A cursor is the
+-- oldest transaction still running when the client last synced
+-- (pg_snapshot_xmin), so a sync returns the changes of every transaction between
+-- the previous cursor and the new one. All of those have finished, so none can
+-- commit later with a change the client would miss.
+
+CREATE TABLE IF NOT EXISTS notification_changes (
+    change_id BIGSERIAL PRIMARY KEY,
+    receiver_id UUID NOT NULL,
+    notification_id UUID NOT NULL,
+    notification_created_at TIMESTAMPTZ NOT NULL,
+    change_type TEXT NOT NULL,
+    xact_id BIGINT NOT NULL DEFAULT pg_current_xact_id()::text::bigint,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT notification_changes_change_type_check
+        CHECK (change_type IN ('created', 'read', 'unread', 'deleted'))
+);
+
+CREATE INDEX IF NOT EXISTS notification_changes_receiver_id_xact_id_idx
+    ON notification_changes (receiver_id, xact_id);
+
+CREATE INDEX IF NOT EXISTS notification_changes_created_at_idx
+    ON notification_changes (created_at);
+
+-- Newest transaction whose changes were pruned; older cursors must resync
+CREATE TABLE IF NOT EXISTS notification_changes_horizon (
+    singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    pruned_through BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO notification_changes_horizon DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+-- Each branch only reads the transition tables its trigger event has
+CREATE OR REPLACE FUNCTION log_notification_changes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO notification_changes
+            (receiver_id, notification_id, notification_created_at, change_type)
+        SELECT receiver_id, notification_id, created_at, 'created'
+        FROM new_rows
+        WHERE receiver_id IS NOT NULL;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO notification_changes
+            (receiver_id, notification_id, notification_created_at, change_type)
+        SELECT receiver_id, notification_id, created_at, 'deleted'
+        FROM old_rows
+        WHERE receiver_id IS NOT NULL;
+
+    ELSE
+        INSERT INTO notification_changes
+            (receiver_id, notification_id, notification_created_at, change_type)
+        SELECT new_rows.receiver_id, new_rows.notification_id, new_rows.created_at,
+            CASE WHEN new_rows.is_read THEN 'read' ELSE 'unread' END
+        FROM new_rows
+        JOIN old_rows
+            ON old_rows.notification_id = new_rows.notification_id
+            AND old_rows.created_at = new_rows.created_at
+        WHERE new_rows.receiver_id IS NOT NULL
+        AND new_rows.is_read IS DISTINCT FROM old_rows.is_read;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notifications_log_changes_insert ON notifications;
+
+CREATE TRIGGER notifications_log_changes_insert
+    AFTER INSERT ON notifications
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION log_notification_changes();
+
+DROP TRIGGER IF EXISTS notifications_log_changes_update ON notifications;
+
+CREATE TRIGGER notifications_log_changes_update
+    AFTER UPDATE ON notifications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION log_notification_changes();
+
+DROP TRIGGER IF EXISTS notifications_log_changes_delete ON notifications;
+
+CREATE TRIGGER notifications_log_changes_delete
+    AFTER DELETE ON notifications
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION log_notification_changes();
@@ -0,0 +1,78 @@
+-- Store notifications as a template ID plus parameters instead of rendered text.
+-- New rows set template_id (one of NotificationTemplates) and params, e.g.
+-- {"username": "...", "title": "..."}, and leave header and message NULL; the text
+-- is rendered when notifications are read. Older rows keep their header and
+-- message and are shown as they are.
+
+BEGIN;
+
+ALTER TABLE notifications
+    ADD COLUMN IF NOT EXISTS template_id TEXT,
+    ADD COLUMN IF NOT EXISTS params JSONB,
+    ALTER COLUMN header DROP NOT NULL,
+    ALTER COLUMN message DROP NOT NULL;
+
+ALTER TABLE notifications_archive
+    ADD COLUMN IF NOT EXISTS template_id TEXT,
+    ADD COLUMN IF NOT EXISTS params JSONB,
+    ALTER COLUMN header DROP NOT NULL,
+    ALTER COLUMN message DROP NOT NULL;
+
+-- Same as in migration 007, except that the rows are archived by column name:
+-- notifications_archive has archived_at before the columns added above
+CREATE OR REPLACE FUNCTION retire_notification_partitions(
+    retention_months INTEGER,
+    archive BOOLEAN
+) RETURNS INTEGER AS $$
+DECLARE
+    cutoff DATE := (date_trunc('month', NOW()) - make_interval(months => retention_months))::date;
+    old_partition RECORD;
+    partition_month DATE;
+    columns TEXT;
+    retired INTEGER := 0;
+BEGIN
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum)
+    INTO columns
+    FROM pg_attribute
+    WHERE attrelid = 'notifications'::regclass
+    AND attnum > 0
+    AND NOT attisdropped;
+
+    FOR old_partition IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = 'notifications'::regclass
+        AND child.relname ~ '^notifications_p[0-9]{4}_[0-9]{2}$'
+        ORDER BY child.relname
+    LOOP
+        partition_month := to_date(right(old_partition.relname, 7), 'YYYY_MM');
+
+        CONTINUE WHEN partition_month >= cutoff;
+
+        IF archive THEN
+            EXECUTE format(
+                'INSERT INTO notifications_archive (%s) SELECT %s FROM %I',
+                columns,
+                columns,
+                old_partition.relname
+            );
+        END IF;
+
+        -- Through the parent table, so the unread counters see the unread rows go;
+        -- dropping the partition fires no triggers
+        DELETE FROM notifications
+        WHERE created_at >= partition_month
+        AND created_at < partition_month + INTERVAL '1 month'
+        AND is_read = FALSE;
+
+        EXECUTE format('DROP TABLE %I', old_partition.relname);
+
+        retired := retired + 1;
+    END LOOP;
+
+    RETURN retired;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
@@ -0,0 +1,9 @@
+-- When each user was last sent a notification digest email. A digest covers the
+-- unread notifications created after last_sent_through, so each notification is
+-- emailed at most once.
+
+CREATE TABLE IF NOT EXISTS notification_digests (
+    user_id UUID PRIMARY KEY REFERENCES users (user_id) ON DELETE CASCADE,
+    last_sent_through TIMESTAMPTZ NOT NULL,
+    last_sent_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
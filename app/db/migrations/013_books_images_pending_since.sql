@@ -0,0 +1,26 @@
+-- Record when each book went 'pending', so the scheduler can fail the image uploads
+-- that were lost with the process running them (upload jobs are queued in memory)
+-- once they have been pending for longer than BOOK_IMAGES_PENDING_TIMEOUT_SECONDS.
+
+ALTER TABLE books
+    ADD COLUMN IF NOT EXISTS images_pending_since TIMESTAMPTZ;
+
+UPDATE books
+SET images_pending_since = NOW()
+WHERE images_status = 'pending' AND images_pending_since IS NULL;
+
+-- Every write that sets images_status (adding, editing, or importing a book, and
+-- the upload jobs) restarts or clears the timer
+CREATE OR REPLACE FUNCTION set_book_images_pending_since() RETURNS trigger AS $$
+BEGIN
+    NEW.images_pending_since := CASE WHEN NEW.images_status = 'pending' THEN NOW() END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS books_set_images_pending_since ON books;
+
+CREATE TRIGGER books_set_images_pending_since
+    BEFORE INSERT OR UPDATE OF images_status ON books
+    FOR EACH ROW
+    EXECUTE FUNCTION set_book_images_pending_since();
@@ -0,0 +1,66 @@
+-- Give notifications a DEFAULT partition, so inserts keep working if the partition
+-- job lapses past the months it created ahead, instead of failing (and leaving
+-- outbox deliveries to retry until they are marked 'failed').
+--
+-- create_notification_partitions now also starts from the oldest month with rows in
+-- the default partition, and moves those rows into their month's partition before
+-- attaching it; a range partition cannot be attached while the default partition
+-- holds rows in its range.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS notifications_default PARTITION OF notifications DEFAULT;
+
+CREATE OR REPLACE FUNCTION create_notification_partitions(
+    from_month DATE,
+    months_ahead INTEGER
+) RETURNS INTEGER AS $$
+DECLARE
+    partition_month DATE := LEAST(
+        date_trunc('month', from_month),
+        date_trunc('month', (SELECT MIN(created_at) FROM notifications_default))
+    )::date;
+    last_month DATE := (date_trunc('month', NOW()) + make_interval(months => months_ahead))::date;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE partition_month <= last_month LOOP
+        partition_name := 'notifications_p' || to_char(partition_month, 'YYYY_MM');
+
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE notifications INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name
+            );
+
+            -- Straight from the partition, so the statement triggers on notifications
+            -- (unread counters, change log) do not see the rows as deleted and new
+            EXECUTE format(
+                'WITH moved AS ('
+                '    DELETE FROM notifications_default'
+                '    WHERE created_at >= %L AND created_at < %L'
+                '    RETURNING *'
+                ') INSERT INTO %I SELECT * FROM moved',
+                partition_month,
+                (partition_month + INTERVAL '1 month')::date,
+                partition_name
+            );
+
+            EXECUTE format(
+                'ALTER TABLE notifications ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                partition_month,
+                (partition_month + INTERVAL '1 month')::date
+            );
+
+            created := created + 1;
+        END IF;
+
+        partition_month := (partition_month + INTERVAL '1 month')::date;
+    END LOOP;
+
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
@@ -1,8 +1,12 @@
 from .book import BookQueries  # noqa: F401
 from .common import CommonQueries  # noqa: F401
 from .dashboard import DashboardQueries  # noqa: F401
+from .notification_queries import NotificationQueries  # noqa: F401
+from .outbox_queries import OutboxQueries  # noqa: F401
 from .purchase_queries import PurchasesQueries  # noqa: F401
 from .rating_queries import RatingQueries  # noqa: F401
 from .rental_queries import RentalsQueries  # noqa: F401
+from .scheduler_queries import SchedulerQueries  # noqa: F401
+from .socketio_queries import SocketIOQueries  # noqa: F401
 from .user_queries import UserQueries  # noqa: F401
 from .wallet import WalletQueries  # noqa: F401
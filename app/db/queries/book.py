@@ -1,7 +1,7 @@
 class BookQueries:
     GET_BOOKS_FOR_BOOK_LIST = (
         "SELECT DISTINCT ON (b.book_id) "
-        "b.*, u.username AS owner_username, bi.image_url AS first_image_url "
+        "b.*, u.username AS owner_username, COALESCE(bi.card_url, bi.image_url) AS first_image_url "
         "FROM books AS b "
         "JOIN users AS u ON b.owner_id = u.user_id "
         "LEFT JOIN user_address AS ua ON u.user_id = ua.user_id "
@@ -41,7 +41,7 @@ class BookQueries:
 
     GET_BOOKS_FOR_BOOK_LIST_FROM_A_SPECIFIC_USER = (
         "SELECT DISTINCT ON (b.book_id) "
-        "b.*, u.username AS owner_username, bi.image_url AS first_image_url "
+        "b.*, u.username AS owner_username, COALESCE(bi.card_url, bi.image_url) AS first_image_url "
         "FROM books AS b "
         "JOIN users AS u ON b.owner_id = u.user_id "
         "LEFT JOIN user_address AS ua ON u.user_id = ua.user_id "
@@ -139,7 +139,7 @@ class BookQueries:
         "SELECT DISTINCT ON (b.book_id) "
         "b.*, rb.rent_status AS rent_status, rb.user_id AS renter_id, "
         "   ru.username AS renter_username, ru.profile_image_url AS renter_profile_image_url, "
-        "   bi.image_url AS first_image_url "
+        "   COALESCE(bi.card_url, bi.image_url) AS first_image_url "
         "FROM books AS b "
         "LEFT JOIN book_genre_links AS bgl ON b.book_id = bgl.book_id "
         "LEFT JOIN book_genres AS bg ON bgl.book_genre_id = bg.book_genre_id "
@@ -219,6 +219,7 @@ class BookQueries:
             b.security_deposit,
             b.purchase_price,
             b.rental_duration,
+            b.images_status,
             u.user_id as owner_user_id,
             u.username AS owner_username,
             u.profile_image_url AS owner_profile_picture,
@@ -273,6 +274,7 @@ class BookQueries:
             b.daily_rent_price,
             b.security_deposit,
             b.purchase_price,
+            b.images_status,
             u.user_id,
             u.username,
             u.profile_image_url,
@@ -280,7 +282,7 @@ class BookQueries:
     """
 
     GET_BOOK_IMAGES = """
-        SELECT image_url, order_num
+        SELECT image_url, thumbnail_url, card_url, full_url, order_num
         FROM book_images
         WHERE book_id = %s
         ORDER BY order_num
@@ -291,7 +293,7 @@ class BookQueries:
             b.book_id AS id,
             b.title,
             b.author,
-            bi.image_url AS image,
+            COALESCE(bi.card_url, bi.image_url) AS image,
             u.username AS "from",
             rb.rent_end_date AS return_date,
             rb.total_rent_cost AS cost
@@ -308,7 +310,7 @@ class BookQueries:
             b.book_id as id,
             b.title,
             b.author,
-            bi.image_url as image,
+            COALESCE(bi.card_url, bi.image_url) as image,
             u.username as "from",
             pb.total_buy_cost as cost
         FROM purchased_books pb
@@ -325,7 +327,7 @@ class BookQueries:
             b.book_id as id,
             b.title,
             b.author,
-            bi.image_url as image,
+            COALESCE(bi.card_url, bi.image_url) as image,
             u.username as "by",
             rb.rent_end_date as return_date,
             rb.total_rent_cost as cost
@@ -341,7 +343,7 @@ class BookQueries:
             b.book_id as id,
             b.title,
             b.author,
-            bi.image_url as image,
+            COALESCE(bi.card_url, bi.image_url) as image,
             u.username as "by",
             pb.total_buy_cost as cost
         FROM purchased_books pb
@@ -364,10 +366,11 @@ class BookQueries:
             security_deposit,
             purchase_price,
             rental_duration,
-            owner_id
+            owner_id,
+            images_status
         )
         VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
         ) RETURNING book_id
     """
 
@@ -386,30 +389,140 @@ class BookQueries:
         WHERE book_id = %s;
     """
 
-    INSERT_TO_BOOK_GENRE_LINKS = (
-        "INSERT INTO book_genre_links (book_id, book_genre_id) VALUES (%s, %s)"
-    )
+    INSERT_TO_BOOK_GENRE_LINKS = """
+        INSERT INTO book_genre_links (book_id, book_genre_id)
+        SELECT b.book_id, bg.book_genre_id
+        FROM books b
+        JOIN book_genres bg ON bg.book_genre_name = ANY(%s)
+        WHERE b.book_id = %s;
+    """
+
+    DELETE_FROM_BOOK_GENRE_LINKS = """
+        DELETE FROM book_genre_links
+        WHERE book_id = %s
+            AND book_genre_id IN (
+                SELECT book_genre_id FROM book_genres WHERE book_genre_name = ANY(%s)
+            );
+    """
+
+    INSERT_TO_BOOK_IMAGES = """
+        INSERT INTO book_images
+            (image_url, thumbnail_url, card_url, full_url, uploaded_at, order_num, book_id)
+        SELECT
+            new_images.image_url,
+            new_images.thumbnail_url,
+            new_images.card_url,
+            new_images.full_url,
+            new_images.uploaded_at,
+            new_images.order_num,
+            b.book_id
+        FROM books b
+        CROSS JOIN unnest(
+            %s::text[], %s::text[], %s::text[], %s::text[], %s::timestamp[], %s::int[]
+        ) AS new_images(image_url, thumbnail_url, card_url, full_url, uploaded_at, order_num)
+        WHERE b.book_id = %s;
+    """
+
+    REMOVE_FROM_BOOK_IMAGES = """
+        DELETE FROM book_images
+        WHERE book_id = %s
+            AND (image_url = ANY(%s) OR full_url = ANY(%s));
+    """
+
+    EDIT_BOOK_ORDER_IN_BOOK_IMAGES = """
+        UPDATE book_images AS bi
+        SET
+            order_num = new_order.order_num
+        FROM unnest(%s::text[], %s::int[]) AS new_order(image_url, order_num)
+        WHERE bi.book_id = %s
+            AND new_order.image_url IN (bi.image_url, bi.full_url);
+    """
 
-    DELETE_FROM_BOOK_GENRE_LINKS = (
-        "DELETE FROM book_genre_links WHERE book_id = %s AND book_genre_id = %s"
+    # Bulk import: rows are COPY'd into per-transaction staging tables, then merged
+    CREATE_BOOK_IMPORT_STAGING = (
+        "CREATE TEMP TABLE book_import_staging "
+        "(LIKE books INCLUDING DEFAULTS) ON COMMIT DROP"
     )
 
-    INSERT_TO_BOOK_IMAGES = (
-        "INSERT INTO book_images (image_url, uploaded_at, order_num, book_id) "
-        "VALUES (%s, %s, %s, %s)"
+    COPY_TO_BOOK_IMPORT_STAGING = """
+        COPY book_import_staging (
+            book_id,
+            title,
+            author,
+            condition,
+            description,
+            availability,
+            daily_rent_price,
+            security_deposit,
+            purchase_price,
+            rental_duration,
+            owner_id,
+            images_status
+        ) FROM STDIN
+    """
+
+    CREATE_BOOK_GENRE_LINK_IMPORT_STAGING = (
+        "CREATE TEMP TABLE book_genre_link_import_staging "
+        "(LIKE book_genre_links INCLUDING DEFAULTS) ON COMMIT DROP"
     )
 
-    REMOVE_FROM_BOOK_IMAGES = (
-        "DELETE FROM book_images WHERE book_id = %s AND image_url = %s"
+    COPY_TO_BOOK_GENRE_LINK_IMPORT_STAGING = (
+        "COPY book_genre_link_import_staging (book_id, book_genre_id) FROM STDIN"
     )
 
-    EDIT_BOOK_ORDER_IN_BOOK_IMAGES = """
-        UPDATE book_images
-        SET
-            order_num = %s
-        WHERE book_id = %s AND image_url = %s;
+    MERGE_BOOK_IMPORT_STAGING = """
+        INSERT INTO books (
+            book_id,
+            title,
+            author,
+            condition,
+            description,
+            availability,
+            daily_rent_price,
+            security_deposit,
+            purchase_price,
+            rental_duration,
+            owner_id,
+            images_status
+        )
+        SELECT
+            book_id,
+            title,
+            author,
+            condition,
+            description,
+            availability,
+            daily_rent_price,
+            security_deposit,
+            purchase_price,
+            rental_duration,
+            owner_id,
+            images_status
+        FROM book_import_staging;
+    """
+
+    MERGE_BOOK_GENRE_LINK_IMPORT_STAGING = """
+        INSERT INTO book_genre_links (book_id, book_genre_id)
+        SELECT book_id, book_genre_id
+        FROM book_genre_link_import_staging;
     """
 
+    UPDATE_BOOK_IMAGES_STATUS = "UPDATE books SET images_status = %s WHERE book_id = %s"
+
+    # images_pending_since is kept by a trigger (migration 013)
+    FAIL_STALE_PENDING_BOOK_IMAGES = """
+        UPDATE books
+        SET images_status = 'failed'
+        WHERE images_status = 'pending'
+        AND images_pending_since < NOW() - make_interval(secs => %s)
+        RETURNING book_id, owner_id
+    """
+
+    GET_BOOK_IMAGES_STATUS = (
+        "SELECT book_id, owner_id, images_status FROM books "
+        "WHERE book_id = %s AND is_soft_deleted != TRUE"
+    )
+
     CHECK_IF_BOOK_HAS_RENT_OR_PURCHASE_HISTORY = """
         SELECT 1 FROM purchased_books WHERE book_id = %s
         UNION
@@ -23,3 +23,5 @@ class CommonQueries:
     GET_COLUMN_BY_FIELD = "SELECT {column} FROM {table} WHERE {field} = %s"
     CHECK_IF_EXISTS = "SELECT EXISTS (SELECT 1 FROM {table} WHERE {column} = %s)"
     GET_IDS_BY_VALUES = "SELECT {column} FROM {table} WHERE {field} = ANY(%s)"
+    TRY_ADVISORY_LOCK = "SELECT pg_try_advisory_lock(hashtext(%s)) AS result"
+    ADVISORY_UNLOCK = "SELECT pg_advisory_unlock(hashtext(%s)) AS result"
@@ -0,0 +1,184 @@
+class NotificationQueries:
+    # Rows are passed as one JSON array; json_populate_recordset types each field
+    # like the matching notifications column
+    INSERT_NOTIFICATIONS_BULK = """
+        INSERT INTO notifications
+            (template_id, params, header, message, notification_type, sender_id, receiver_id)
+        SELECT template_id, params, header, message, notification_type, sender_id, receiver_id
+        FROM json_populate_recordset(NULL::notifications, %s);
+    """
+
+    # Same columns as INSERT_NOTIFICATIONS_BULK, streamed row by row
+    COPY_NOTIFICATIONS = """
+        COPY notifications
+            (template_id, params, header, message, notification_type, sender_id, receiver_id)
+        FROM STDIN
+    """
+
+    # Kept current by the triggers on notifications (migration 006)
+    GET_UNREAD_NOTIFICATIONS_COUNTS = """
+        SELECT user_id AS receiver_id, unread_count AS count
+        FROM notification_unread_counts
+        WHERE user_id = ANY(%s);
+    """
+
+    # Waits for open transactions that changed a count and blocks new ones until
+    # commit, so the recount below sees every change the counts include
+    LOCK_UNREAD_NOTIFICATION_COUNTS = """
+        LOCK TABLE notification_unread_counts IN SHARE ROW EXCLUSIVE MODE;
+    """
+
+    # Recounts every user's unread notifications and fixes the counts that drifted
+    REPAIR_UNREAD_NOTIFICATION_COUNTS = """
+        WITH actual AS (
+            SELECT receiver_id AS user_id, COUNT(*) AS unread_count
+            FROM notifications
+            WHERE is_read = FALSE AND receiver_id IS NOT NULL
+            GROUP BY receiver_id
+        ),
+        repaired AS (
+            SELECT user_id, COALESCE(actual.unread_count, 0) AS unread_count
+            FROM actual
+            FULL JOIN notification_unread_counts counts USING (user_id)
+            WHERE counts.unread_count IS DISTINCT FROM COALESCE(actual.unread_count, 0)
+        )
+        INSERT INTO notification_unread_counts AS counts (user_id, unread_count)
+        SELECT user_id, unread_count
+        FROM repaired
+        ON CONFLICT (user_id) DO UPDATE
+        SET unread_count = EXCLUDED.unread_count, updated_at = NOW()
+        RETURNING user_id, unread_count;
+    """
+
+    # Functions defined by migration 007 (create_notification_partitions is
+    # redefined by 014, retire_notification_partitions by 011)
+    CREATE_NOTIFICATION_PARTITIONS = """
+        SELECT create_notification_partitions(CURRENT_DATE, %s) AS created;
+    """
+
+    RETIRE_NOTIFICATION_PARTITIONS = """
+        SELECT retire_notification_partitions(%s, %s) AS retired;
+    """
+
+    # One inbox page in (created_at, notification_id) order, served by
+    # notifications_inbox_idx. {is_read_condition} is empty or filters on
+    # %(is_read)s; {cursor_condition} is empty on the first page, otherwise it
+    # compares with the last row of the previous page using < (DESC) or > (ASC).
+    GET_NOTIFICATIONS_PAGE = """
+        SELECT *
+        FROM notifications
+        WHERE receiver_id = %(user_id)s
+        AND created_at >= date_trunc('month', NOW()) - make_interval(months => %(inbox_months)s)
+        {is_read_condition}
+        {cursor_condition}
+        ORDER BY created_at {sort_order}, notification_id {sort_order}
+        LIMIT %(limit)s;
+    """
+
+    NOTIFICATIONS_PAGE_IS_READ_CONDITION = "AND is_read = %(is_read)s"
+
+    NOTIFICATIONS_PAGE_CURSOR_CONDITION = (
+        "AND (created_at, notification_id) {comparison} "
+        "(%(cursor_created_at)s, %(cursor_notification_id)s)"
+    )
+
+    # Inbox queries skip the partitions the retention job is about to retire, so
+    # they only scan the last %s months (plus the current one)
+    INBOX_WINDOW_CONDITION = (
+        "created_at >= date_trunc('month', NOW()) - make_interval(months => %s)"
+    )
+
+    # Cursors of GET /notifications/changes are transaction IDs (see migration 010).
+    # The new cursor is the oldest transaction still running: every change made
+    # before it is committed or rolled back, so none can appear behind it later.
+    GET_NOTIFICATION_CHANGES_CURSOR = """
+        SELECT
+            pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS cursor,
+            pruned_through
+        FROM notification_changes_horizon;
+    """
+
+    # The latest change of each notification between the two cursors, with the
+    # notification's current row unless it was deleted. A notification whose row
+    # is gone without a logged delete (e.g. its partition was retired) is reported
+    # as deleted.
+    GET_NOTIFICATION_CHANGES = """
+        WITH latest_changes AS (
+            SELECT DISTINCT ON (notification_id)
+                change_id, notification_id, notification_created_at, change_type
+            FROM notification_changes
+            WHERE receiver_id = %(user_id)s
+            AND xact_id >= %(since)s
+            AND xact_id < %(until)s
+            ORDER BY notification_id, change_id DESC
+        )
+        SELECT
+            CASE
+                WHEN n.notification_id IS NULL THEN 'deleted'
+                ELSE latest_changes.change_type
+            END AS change_type,
+            latest_changes.notification_id AS changed_notification_id,
+            n.*
+        FROM latest_changes
+        LEFT JOIN notifications n
+            ON latest_changes.change_type <> 'deleted'
+            AND n.notification_id = latest_changes.notification_id
+            AND n.created_at = latest_changes.notification_created_at
+        ORDER BY latest_changes.change_id
+        LIMIT %(limit)s;
+    """
+
+    # Changes older than %s hours are dropped; cursors from before the newest
+    # dropped transaction can no longer be served and must resync
+    PRUNE_NOTIFICATION_CHANGES = """
+        WITH pruned AS (
+            DELETE FROM notification_changes
+            WHERE created_at < NOW() - make_interval(hours => %s)
+            RETURNING xact_id
+        )
+        UPDATE notification_changes_horizon
+        SET pruned_through = GREATEST(
+            pruned_through, (SELECT MAX(xact_id) FROM pruned)
+        )
+        RETURNING (SELECT COUNT(*) FROM pruned) AS pruned;
+    """
+
+    # The unread notifications of each user with a verified email, created after
+    # their last digest and between %(window_seconds)s and %(delay_seconds)s ago,
+    # newest first. Only the first %(max_items)s per user are returned; every row
+    # carries the user's pending_count and the newest created_at (sent_through).
+    # The plain created_at bound lets the old partitions be skipped.
+    GET_NOTIFICATION_DIGESTS = """
+        WITH pending AS (
+            SELECT
+                n.*,
+                ROW_NUMBER() OVER receiver_notifications AS position,
+                COUNT(*) OVER (PARTITION BY n.receiver_id) AS pending_count,
+                MAX(n.created_at) OVER (PARTITION BY n.receiver_id) AS sent_through
+            FROM notifications n
+            LEFT JOIN notification_digests d ON d.user_id = n.receiver_id
+            WHERE n.is_read = FALSE
+            AND n.created_at > NOW() - make_interval(secs => %(window_seconds)s)
+            AND n.created_at <= NOW() - make_interval(secs => %(delay_seconds)s)
+            AND n.created_at > COALESCE(d.last_sent_through, '-infinity')
+            WINDOW receiver_notifications AS (
+                PARTITION BY n.receiver_id ORDER BY n.created_at DESC, n.notification_id
+            )
+        )
+        SELECT pending.*, u.username, u.email_address
+        FROM pending
+        JOIN users u ON u.user_id = pending.receiver_id
+        WHERE pending.position <= %(max_items)s
+        AND u.is_email_verified = TRUE
+        ORDER BY pending.receiver_id, pending.position;
+    """
+
+    MARK_NOTIFICATION_DIGESTS_SENT = """
+        INSERT INTO notification_digests AS digests (user_id, last_sent_through)
+        SELECT * FROM unnest(%s::uuid[], %s::timestamptz[])
+        ON CONFLICT (user_id) DO UPDATE
+        SET last_sent_through = GREATEST(
+                digests.last_sent_through, EXCLUDED.last_sent_through
+            ),
+            last_sent_at = NOW();
+    """
@@ -0,0 +1,58 @@
+class OutboxQueries:
+    INSERT_EVENTS = """
+        INSERT INTO outbox_events (event_type, payload)
+        SELECT event_type, payload
+        FROM unnest(%s::text[], %s::jsonb[]) AS e(event_type, payload);
+    """
+
+    # Claims due events, plus events whose worker died before finishing them.
+    # SKIP LOCKED lets the workers of every app instance claim disjoint batches.
+    CLAIM_EVENTS = """
+        WITH claimable AS (
+            SELECT event_id
+            FROM outbox_events
+            WHERE (status = 'pending' AND available_at <= NOW())
+            OR (status = 'processing' AND locked_until < NOW())
+            ORDER BY event_id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE outbox_events oe
+        SET status = 'processing',
+            attempts = oe.attempts + 1,
+            locked_until = NOW() + make_interval(secs => %s)
+        FROM claimable
+        WHERE oe.event_id = claimable.event_id
+        RETURNING oe.event_id, oe.event_type, oe.payload, oe.attempts;
+    """
+
+    # Extends the lease of an event this worker still holds. attempts identifies the
+    # claim: a worker that re-claimed the event after the lease expired bumped it.
+    # Params: lock seconds, event_id, attempts
+    RENEW_EVENT_LEASE = """
+        UPDATE outbox_events
+        SET locked_until = NOW() + make_interval(secs => %s)
+        WHERE event_id = %s AND attempts = %s AND status = 'processing'
+        RETURNING event_id;
+    """
+
+    MARK_EVENTS_DONE = """
+        UPDATE outbox_events
+        SET status = 'done', processed_at = NOW(), locked_until = NULL, last_error = NULL
+        WHERE event_id = ANY(%s);
+    """
+
+    # Params: max_attempts, retry delay in seconds, error, event_id
+    MARK_EVENT_FAILED = """
+        UPDATE outbox_events
+        SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+            available_at = NOW() + make_interval(secs => %s),
+            locked_until = NULL,
+            last_error = %s
+        WHERE event_id = %s;
+    """
+
+    DELETE_DONE_EVENTS = """
+        DELETE FROM outbox_events
+        WHERE status = 'done' AND processed_at < NOW() - make_interval(secs => %s);
+    """
@@ -50,7 +50,7 @@ class PurchasesQueries:
             b.book_id,
             b.title,
             b.author,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "from",
             pb.all_fees_captured,
             pb.reserved_at,
@@ -90,7 +90,7 @@ class PurchasesQueries:
             b.book_id,
             b.title,
             b.author,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "from",
             pb.all_fees_captured,
             pb.reserved_at,
@@ -129,7 +129,7 @@ class PurchasesQueries:
             b.book_id,
             b.title,
             b.author,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "from",
             pb.all_fees_captured,
             pb.reserved_at,
@@ -181,7 +181,7 @@ class PurchasesQueries:
             b.book_id,
             b.title,
             b.author,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "to",
             pb.all_fees_captured,
             pb.reserved_at,
@@ -220,7 +220,7 @@ class PurchasesQueries:
             b.book_id,
             b.title,
             b.author,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "to",
             pb.all_fees_captured,
             pb.reserved_at,
@@ -259,7 +259,7 @@ class PurchasesQueries:
             b.book_id,
             b.title,
             b.author,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "to",
             pb.all_fees_captured,
             pb.reserved_at,
@@ -336,22 +336,45 @@ class PurchasesQueries:
     """
 
     UPDATE_APPROVED_TO_PICKUP_CONFIRMATION = """
-        UPDATE purchased_books
-        SET
-            purchase_status = 'awaiting_pickup_confirmation',
-            pickup_confirmation_started_at = NOW()
-        WHERE purchase_status = 'approved'
-        AND meetup_date IS NOT NULL
-        AND meetup_time IS NOT NULL
-        AND (
-            (meetup_date + meetup_time::time) - INTERVAL '1 hour'
-            <= (NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours')
-        )
-        AND (
-            (meetup_date + meetup_time::time)
-            >= (NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours')
+        WITH due AS (
+            SELECT purchase_id
+            FROM purchased_books
+            WHERE purchase_status = 'approved'
+            AND meetup_date IS NOT NULL
+            AND meetup_time IS NOT NULL
+            AND (
+                (meetup_date + meetup_time::time) - INTERVAL '1 hour'
+                <= %(now_local)s
+            )
+            AND (
+                (meetup_date + meetup_time::time)
+                >= %(now_local)s
+            )
+            LIMIT %(batch_size)s
+            FOR UPDATE SKIP LOCKED
+        ),
+        updated AS (
+            UPDATE purchased_books pb
+            SET
+                purchase_status = 'awaiting_pickup_confirmation',
+                pickup_confirmation_started_at = %(now)s
+            FROM due
+            WHERE pb.purchase_id = due.purchase_id
+            RETURNING pb.purchase_id, pb.user_id, pb.book_id, pb.meetup_location
         )
-        RETURNING purchase_id, user_id, book_id, meetup_location;
+        SELECT
+            updated.purchase_id,
+            updated.user_id,
+            updated.book_id,
+            updated.meetup_location,
+            b.title,
+            b.owner_id,
+            ou.username AS owner_username,
+            bu.username AS buyer_username
+        FROM updated
+        LEFT JOIN books b ON updated.book_id = b.book_id
+        LEFT JOIN users ou ON b.owner_id = ou.user_id
+        LEFT JOIN users bu ON updated.user_id = bu.user_id;
     """
 
     GET_PURCHASE_BY_ID_FULL = """
@@ -486,3 +509,53 @@ class PurchasesQueries:
         WHERE book_id = (SELECT book_id FROM updated_purchase)
         RETURNING book_id, is_soft_deleted;
     """
+
+    # Deletes up to %s expired pending purchases (oldest first) and releases their
+    # reserved funds, grouped per user, in one statement. Rows locked by another
+    # worker are skipped. Returns each deleted purchase with what its notification needs.
+    CLEANUP_EXPIRED_PURCHASES_BATCH = """
+        WITH expired AS (
+            SELECT pb.purchase_id
+            FROM purchased_books pb
+            WHERE pb.purchase_status = 'pending'
+            AND pb.reservation_expires_at < %(now_local)s
+            ORDER BY pb.reservation_expires_at
+            LIMIT %(batch_size)s
+            FOR UPDATE SKIP LOCKED
+        ),
+        deleted AS (
+            DELETE FROM purchased_books pb
+            USING expired
+            WHERE pb.purchase_id = expired.purchase_id
+            AND pb.purchase_status = 'pending'
+            RETURNING pb.purchase_id, pb.user_id, pb.book_id, pb.total_buy_cost
+        ),
+        released AS (
+            UPDATE readits_wallets rw
+            SET
+                reserved_amount = rw.reserved_amount - totals.amount,
+                last_updated = %(now)s
+            FROM (
+                SELECT user_id, SUM(total_buy_cost) AS amount
+                FROM deleted
+                GROUP BY user_id
+            ) totals
+            WHERE rw.user_id = totals.user_id
+            AND rw.reserved_amount >= totals.amount
+            RETURNING rw.user_id
+        )
+        SELECT
+            d.purchase_id,
+            d.user_id,
+            d.book_id,
+            d.total_buy_cost,
+            b.title,
+            b.owner_id,
+            u.username AS owner_username,
+            EXISTS (
+                SELECT 1 FROM released r WHERE r.user_id = d.user_id
+            ) AS funds_released
+        FROM deleted d
+        LEFT JOIN books b ON d.book_id = b.book_id
+        LEFT JOIN users u ON b.owner_id = u.user_id;
+    """
@@ -58,7 +58,7 @@ class RentalsQueries:
             b.author,
             rb.actual_deposit,
             rb.actual_rate,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "from",
             rb.all_fees_captured,
             rb.reserved_at,
@@ -104,7 +104,7 @@ class RentalsQueries:
             b.author,
             rb.actual_deposit,
             rb.actual_rate,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "from",
             rb.all_fees_captured,
             rb.reserved_at,
@@ -149,7 +149,7 @@ class RentalsQueries:
             b.author,
             rb.actual_deposit,
             rb.actual_rate,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "from",
             rb.all_fees_captured,
             rb.reserved_at,
@@ -205,7 +205,7 @@ class RentalsQueries:
             b.author,
             rb.actual_deposit,
             rb.actual_rate,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "to",
             rb.all_fees_captured,
             rb.reserved_at,
@@ -251,7 +251,7 @@ class RentalsQueries:
             b.author,
             rb.actual_deposit,
             rb.actual_rate,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "to",
             rb.all_fees_captured,
             rb.reserved_at,
@@ -296,7 +296,7 @@ class RentalsQueries:
             b.author,
             rb.actual_deposit,
             rb.actual_rate,
-            bi.image_url AS image,
+            COALESCE(bi.thumbnail_url, bi.image_url) AS image,
             u.username AS "to",
             rb.all_fees_captured,
             rb.reserved_at,
@@ -376,45 +376,91 @@ class RentalsQueries:
     """
 
     UPDATE_APPROVED_TO_PICKUP_CONFIRMATION = """
-        UPDATE rented_books
-        SET
-            rent_status = 'awaiting_pickup_confirmation',
-            pickup_confirmation_started_at = NOW()
-        WHERE rent_status = 'approved'
-        AND meetup_date IS NOT NULL
-        AND meetup_time IS NOT NULL
-        AND (
-            -- Use same timezone as cleanup query
-            (meetup_date + meetup_time::time) - INTERVAL '1 hour'
-            <= (NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours')
+        WITH due AS (
+            SELECT rental_id
+            FROM rented_books
+            WHERE rent_status = 'approved'
+            AND meetup_date IS NOT NULL
+            AND meetup_time IS NOT NULL
+            AND (
+                -- Use same timezone as cleanup query
+                (meetup_date + meetup_time::time) - INTERVAL '1 hour'
+                <= %(now_local)s
+            )
+            AND (
+                -- Make sure we haven't passed the meetup time yet
+                (meetup_date + meetup_time::time)
+                >= %(now_local)s
+            )
+            LIMIT %(batch_size)s
+            FOR UPDATE SKIP LOCKED
+        ),
+        updated AS (
+            UPDATE rented_books rb
+            SET
+                rent_status = 'awaiting_pickup_confirmation',
+                pickup_confirmation_started_at = %(now)s
+            FROM due
+            WHERE rb.rental_id = due.rental_id
+            RETURNING rb.rental_id, rb.user_id, rb.book_id, rb.meetup_location
         )
-        AND (
-            -- Make sure we haven't passed the meetup time yet
-            (meetup_date + meetup_time::time)
-            >= (NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours')
-        )
-        RETURNING rental_id, user_id, book_id, meetup_location;
+        SELECT
+            updated.rental_id,
+            updated.user_id,
+            updated.book_id,
+            updated.meetup_location,
+            b.title,
+            b.owner_id,
+            ou.username AS owner_username,
+            ru.username AS renter_username
+        FROM updated
+        LEFT JOIN books b ON updated.book_id = b.book_id
+        LEFT JOIN users ou ON b.owner_id = ou.user_id
+        LEFT JOIN users ru ON updated.user_id = ru.user_id;
     """
 
     UPDATE_ONGOING_TO_RETURN_CONFIRMATION = """
-        UPDATE rented_books
-        SET
-            rent_status = 'awaiting_return_confirmation',
-            return_confirmation_started_at = NOW()
-        WHERE rent_status = 'ongoing'
-        AND rent_end_date IS NOT NULL
-        AND meetup_time IS NOT NULL
-        AND (
-            -- Use same timezone as cleanup query
-            (rent_end_date + meetup_time::time) - INTERVAL '1 hour'
-            <= (NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours')
+        WITH due AS (
+            SELECT rental_id
+            FROM rented_books
+            WHERE rent_status = 'ongoing'
+            AND rent_end_date IS NOT NULL
+            AND meetup_time IS NOT NULL
+            AND (
+                -- Use same timezone as cleanup query
+                (rent_end_date + meetup_time::time) - INTERVAL '1 hour'
+                <= %(now_local)s
+            )
+            AND (
+                -- Make sure we haven't passed the return time yet
+                (rent_end_date + meetup_time::time)
+                >= %(now_local)s
+            )
+            LIMIT %(batch_size)s
+            FOR UPDATE SKIP LOCKED
+        ),
+        updated AS (
+            UPDATE rented_books rb
+            SET
+                rent_status = 'awaiting_return_confirmation',
+                return_confirmation_started_at = %(now)s
+            FROM due
+            WHERE rb.rental_id = due.rental_id
+            RETURNING rb.rental_id, rb.user_id, rb.book_id, rb.meetup_location
         )
-        AND (
-            -- Make sure we haven't passed the return time yet
-            (rent_end_date + meetup_time::time)
-            >= (NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours')
-        )
-        RETURNING rental_id, user_id, book_id, meetup_location;
+        SELECT
+            updated.rental_id,
+            updated.user_id,
+            updated.book_id,
+            updated.meetup_location,
+            b.title,
+            b.owner_id,
+            ou.username AS owner_username,
+            ru.username AS renter_username
+        FROM updated
+        LEFT JOIN books b ON updated.book_id = b.book_id
+        LEFT JOIN users ou ON b.owner_id = ou.user_id
+        LEFT JOIN users ru ON updated.user_id = ru.user_id;
     """
 
     GET_RENTAL_BY_ID_FULL = """
@@ -534,3 +580,53 @@ class RentalsQueries:
         FROM rented_books
         WHERE rental_id = %s;
     """
+
+    # Deletes up to %s expired pending rentals (oldest first) and releases their
+    # reserved funds, grouped per user, in one statement. Rows locked by another
+    # worker are skipped. Returns each deleted rental with what its notification needs.
+    CLEANUP_EXPIRED_RENTALS_BATCH = """
+        WITH expired AS (
+            SELECT rb.rental_id
+            FROM rented_books rb
+            WHERE rb.rent_status = 'pending'
+            AND rb.reservation_expires_at < %(now_local)s
+            ORDER BY rb.reservation_expires_at
+            LIMIT %(batch_size)s
+            FOR UPDATE SKIP LOCKED
+        ),
+        deleted AS (
+            DELETE FROM rented_books rb
+            USING expired
+            WHERE rb.rental_id = expired.rental_id
+            AND rb.rent_status = 'pending'
+            RETURNING rb.rental_id, rb.user_id, rb.book_id, rb.total_rent_cost
+        ),
+        released AS (
+            UPDATE readits_wallets rw
+            SET
+                reserved_amount = rw.reserved_amount - totals.amount,
+                last_updated = %(now)s
+            FROM (
+                SELECT user_id, SUM(total_rent_cost) AS amount
+                FROM deleted
+                GROUP BY user_id
+            ) totals
+            WHERE rw.user_id = totals.user_id
+            AND rw.reserved_amount >= totals.amount
+            RETURNING rw.user_id
+        )
+        SELECT
+            d.rental_id,
+            d.user_id,
+            d.book_id,
+            d.total_rent_cost,
+            b.title,
+            b.owner_id,
+            u.username AS owner_username,
+            EXISTS (
+                SELECT 1 FROM released r WHERE r.user_id = d.user_id
+            ) AS funds_released
+        FROM deleted d
+        LEFT JOIN books b ON d.book_id = b.book_id
+        LEFT JOIN users u ON b.owner_id = u.user_id;
+    """
@@ -0,0 +1,132 @@
+class SchedulerQueries:
+    # Channel the notify_scheduler_due_time() trigger publishes new due times on
+    DUE_TIMES_CHANNEL = "scheduler_due_times"
+
+    # The earliest %(limit)s due times, keyed like the trigger payloads, in seconds
+    # from %(now_local)s, the local time (UTC + 8 hours) of the app clock.
+    GET_UPCOMING_DUE_TIMES = """
+        WITH now_local AS (
+            SELECT %(now_local)s::timestamp AS now
+        ),
+        due_times AS (
+            -- RentalCleanupTask: pending rental reservations expire
+            SELECT 'rented_books:' || rb.rental_id AS key, rb.reservation_expires_at AS due_at
+            FROM rented_books rb
+            WHERE rb.rent_status = 'pending'
+            AND rb.reservation_expires_at IS NOT NULL
+
+            UNION ALL
+
+            -- RentalStatusTask: 1 hour before meetup
+            SELECT 'rented_books:' || rb.rental_id,
+                (rb.meetup_date + rb.meetup_time::time) - INTERVAL '1 hour'
+            FROM rented_books rb, now_local
+            WHERE rb.rent_status = 'approved'
+            AND rb.meetup_date IS NOT NULL
+            AND rb.meetup_time IS NOT NULL
+            AND (rb.meetup_date + rb.meetup_time::time) >= now_local.now
+
+            UNION ALL
+
+            -- RentalStatusTask: 1 hour before return
+            SELECT 'rented_books:' || rb.rental_id,
+                (rb.rent_end_date + rb.meetup_time::time) - INTERVAL '1 hour'
+            FROM rented_books rb, now_local
+            WHERE rb.rent_status = 'ongoing'
+            AND rb.rent_end_date IS NOT NULL
+            AND rb.meetup_time IS NOT NULL
+            AND (rb.rent_end_date + rb.meetup_time::time) >= now_local.now
+
+            UNION ALL
+
+            -- PurchaseCleanupTask: pending purchase reservations expire
+            SELECT 'purchased_books:' || pb.purchase_id, pb.reservation_expires_at
+            FROM purchased_books pb
+            WHERE pb.purchase_status = 'pending'
+            AND pb.reservation_expires_at IS NOT NULL
+
+            UNION ALL
+
+            -- PurchaseStatusTask: 1 hour before meetup
+            SELECT 'purchased_books:' || pb.purchase_id,
+                (pb.meetup_date + pb.meetup_time::time) - INTERVAL '1 hour'
+            FROM purchased_books pb, now_local
+            WHERE pb.purchase_status = 'approved'
+            AND pb.meetup_date IS NOT NULL
+            AND pb.meetup_time IS NOT NULL
+            AND (pb.meetup_date + pb.meetup_time::time) >= now_local.now
+        )
+        SELECT due_times.key, EXTRACT(EPOCH FROM (due_times.due_at - now_local.now)) AS seconds_until_due
+        FROM due_times, now_local
+        ORDER BY due_times.due_at
+        LIMIT %(limit)s;
+    """
+
+    INSERT_JOB_RUN = """
+        INSERT INTO scheduler_job_runs (
+            job_name, status, started_at, duration_ms, lag_ms,
+            rows_affected, error_count, error, worker
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s);
+    """
+
+    DELETE_OLD_JOB_RUNS = """
+        DELETE FROM scheduler_job_runs
+        WHERE started_at < NOW() - make_interval(days => %s);
+    """
+
+    # Per job, over the runs started in the last %s hours. The failure streak counts
+    # the failed runs since the job last succeeded, whatever the window.
+    GET_JOB_RUN_METRICS = """
+        WITH recent_runs AS (
+            SELECT *
+            FROM scheduler_job_runs
+            WHERE started_at >= NOW() - make_interval(hours => %s)
+        ),
+        latest_runs AS (
+            SELECT DISTINCT ON (job_name)
+                job_name, started_at, status, duration_ms, rows_affected, error
+            FROM scheduler_job_runs
+            ORDER BY job_name, started_at DESC
+        ),
+        last_successes AS (
+            SELECT job_name, MAX(started_at) AS last_success_at
+            FROM scheduler_job_runs
+            WHERE status = 'succeeded'
+            GROUP BY job_name
+        ),
+        failure_streaks AS (
+            SELECT sjr.job_name, COUNT(*) AS failure_streak
+            FROM scheduler_job_runs sjr
+            LEFT JOIN last_successes ls ON sjr.job_name = ls.job_name
+            WHERE sjr.status = 'failed'
+            AND sjr.started_at > COALESCE(ls.last_success_at, '-infinity'::timestamptz)
+            GROUP BY sjr.job_name
+        )
+        SELECT
+            lr.job_name,
+            COUNT(rr.job_run_id) AS run_count,
+            COUNT(rr.job_run_id) FILTER (WHERE rr.status = 'failed') AS failure_count,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY rr.duration_ms) AS p50_duration_ms,
+            percentile_cont(0.95) WITHIN GROUP (ORDER BY rr.duration_ms) AS p95_duration_ms,
+            MAX(rr.duration_ms) AS max_duration_ms,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY rr.lag_ms) AS p50_lag_ms,
+            percentile_cont(0.95) WITHIN GROUP (ORDER BY rr.lag_ms) AS p95_lag_ms,
+            MAX(rr.lag_ms) AS max_lag_ms,
+            COALESCE(SUM(rr.rows_affected), 0) AS rows_affected,
+            COALESCE(fs.failure_streak, 0) AS failure_streak,
+            ls.last_success_at,
+            lr.started_at AS last_run_at,
+            lr.status AS last_run_status,
+            lr.duration_ms AS last_run_duration_ms,
+            lr.rows_affected AS last_run_rows_affected,
+            lr.error AS last_run_error
+        FROM latest_runs lr
+        LEFT JOIN recent_runs rr ON lr.job_name = rr.job_name
+        LEFT JOIN failure_streaks fs ON lr.job_name = fs.job_name
+        LEFT JOIN last_successes ls ON lr.job_name = ls.job_name
+        GROUP BY
+            lr.job_name, lr.started_at, lr.status, lr.duration_ms, lr.rows_affected,
+            lr.error, fs.failure_streak, ls.last_success_at
+        ORDER BY lr.job_name;
+    """
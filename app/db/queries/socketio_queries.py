@@ -0,0 +1,19 @@
+class SocketIOQueries:
+    NOTIFY = "SELECT pg_notify(%s, %s);"
+
+    # Messages too large for a NOTIFY payload; expired ones are deleted on the way
+    INSERT_MESSAGE = """
+        WITH expired AS (
+            DELETE FROM socketio_messages
+            WHERE created_at < NOW() - INTERVAL '5 minutes'
+        )
+        INSERT INTO socketio_messages (payload)
+        VALUES (%s::jsonb)
+        RETURNING message_id;
+    """
+
+    GET_MESSAGE = """
+        SELECT payload
+        FROM socketio_messages
+        WHERE message_id = %s;
+    """
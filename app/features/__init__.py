@@ -7,6 +7,7 @@ from .users import users_bp
 from .wallets import wallets_bp
 from .webhooks import webhooks_bp
 from .ratings import ratings_bp
+from .metrics import metrics_bp
 
 blueprints = {
     "dashboard": dashboard_bp,
@@ -18,4 +19,5 @@ blueprints = {
     "wallets": wallets_bp,
     "webhooks": webhooks_bp,
     "ratings": ratings_bp,
+    "metrics": metrics_bp,
 }
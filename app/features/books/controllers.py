@@ -1,5 +1,8 @@
-from flask import request, jsonify, Response
+from flask import request, jsonify, Response, current_app
 
+import csv
+import io
+import json
 import traceback
 
 from flask_jwt_extended import get_jwt_identity
@@ -523,6 +526,21 @@ class BookControllers:
             traceback.print_exc()
             return jsonify({"error": str(e)}), 500
 
+    @staticmethod
+    def get_book_images_status_controller(book_id: str) -> tuple[Response, int]:
+        """Retrieve the background image upload status of a book."""
+
+        try:
+            book_images_status = BookServices.get_book_images_status_service(book_id)
+
+            if not book_images_status:
+                return jsonify({"error": "Book not found"}), 404
+
+            return jsonify(dict_keys_to_camel(book_images_status)), 200
+        except Exception as e:
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 500
+
     @staticmethod
     def add_new_book_controller() -> tuple[Response, int]:
         """(add later)"""
@@ -548,16 +566,78 @@ class BookControllers:
             if not user_id:
                 return jsonify({"error": "Unauthorized"}), 401
 
-            BookServices.add_new_book_service(user_id, book_data, book_images)
+            new_book = BookServices.add_new_book_service(
+                user_id, book_data, book_images
+            )
 
             return (
-                jsonify({"message": f"'{book_data['title']}' added successfully."}),
+                jsonify(
+                    {
+                        "message": f"'{book_data['title']}' added successfully.",
+                        "bookId": new_book["book_id"],
+                        "imagesStatus": new_book["images_status"],
+                    }
+                ),
                 200,
             )
         except Exception as e:
             traceback.print_exc()
             return jsonify({"error": str(e)}), 500
 
+    @staticmethod
+    def bulk_import_books_controller() -> tuple[Response, int]:
+        """Import many books from an uploaded CSV/JSON file or a JSON array body."""
+
+        try:
+            user_id = get_jwt_identity()
+
+            if not user_id:
+                return jsonify({"error": "Unauthorized"}), 401
+
+            book_rows: Any
+
+            if "file" in request.files:
+                file = request.files["file"]
+                filename = (file.filename or "").lower()
+
+                if filename.endswith(".csv") or file.mimetype == "text/csv":
+                    # Read the upload line by line instead of decoding it all at once
+                    book_rows = csv.DictReader(
+                        io.TextIOWrapper(file.stream, encoding="utf-8-sig")
+                    )
+                elif filename.endswith(".json") or file.mimetype == "application/json":
+                    book_rows = json.load(file.stream)
+                else:
+                    raise InvalidParameterError("File must be a .csv or .json file.")
+
+            elif request.is_json:
+                book_rows = request.get_json()
+            else:
+                raise InvalidParameterError(
+                    "Upload a CSV/JSON file as 'file' or send a JSON array of books."
+                )
+
+            if isinstance(book_rows, dict):
+                book_rows = book_rows.get("books")
+
+            if not isinstance(book_rows, (list, csv.DictReader)):
+                raise InvalidParameterError("Books must be an array of objects.")
+
+            import_result = BookServices.bulk_import_books_service(
+                user_id,
+                book_rows,
+                current_app.config.get("BOOK_BULK_IMPORT_MAX_ROWS", 5000),
+            )
+
+            return jsonify(dict_keys_to_camel(import_result)), 200
+
+        except (InvalidParameterError, ValueError) as e:
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 500
+
     @staticmethod
     def edit_a_book_controller(book_id: str) -> tuple[Response, int]:
         """(add later)"""
@@ -586,11 +666,22 @@ class BookControllers:
 
             book_images = request.files
 
-            BookServices.edit_a_book_service(book_id, book_data, book_images)
+            user_id = get_jwt_identity()
+
+            if not user_id:
+                return jsonify({"error": "Unauthorized"}), 401
+
+            images_status = BookServices.edit_a_book_service(
+                user_id, book_id, book_data, book_images
+            )
 
             return (
                 jsonify(
-                    {"message": f"'{book_data['title']}' was edited successfully."}
+                    {
+                        "message": f"'{book_data['title']}' was edited successfully.",
+                        "bookId": book_id,
+                        "imagesStatus": images_status,
+                    }
                 ),
                 200,
             )
@@ -427,7 +427,10 @@ class BookRepository:
 
         Returns:
             List[Dict[str, Any]]: A list of dictionaries, each containing:
-                - image_url (str): The URL of the book image
+                - image_url (str): The URL of the original book image
+                - thumbnail_url (str | None): The URL of the thumbnail variant
+                - card_url (str | None): The URL of the card variant
+                - full_url (str | None): The URL of the full variant
                 - order_num (int): The display order of the image
         """
         db = current_app.extensions["db"]
@@ -556,6 +559,7 @@ class BookRepository:
             book_data["purchase_price"],
             book_data["rental_duration"],
             user_id,
+            book_data["images_status"],
         )
 
         return db.execute_query_returning(BookQueries.ADD_NEW_BOOK, params)
@@ -597,98 +601,244 @@ class BookRepository:
     @staticmethod
     def connect_book_to_genres(book_id, genres) -> None:
         """
-        to be written
+        Link a book to genres in a single statement.
+
+        Args:
+            book_id (str): The unique identifier of the book.
+            genres (list[str]): The names of the genres. Unknown names are ignored.
         """
 
-        db = current_app.extensions["db"]
+        if not genres:
+            return
 
-        genre_ids = BookRepository.get_genre_ids_from_genre_names(genres)
+        db = current_app.extensions["db"]
 
-        for genre_id in genre_ids:
-            db.execute_query(
-                BookQueries.INSERT_TO_BOOK_GENRE_LINKS,
-                (book_id, genre_id["book_genre_id"]),
-            )
+        db.execute_query(
+            BookQueries.INSERT_TO_BOOK_GENRE_LINKS, (list(genres), book_id)
+        )
 
     @staticmethod
     def remove_connection_of_book_to_genres(book_id, genres) -> None:
         """
-        to be written
+        Unlink a book from genres in a single statement.
+
+        Args:
+            book_id (str): The unique identifier of the book.
+            genres (list[str]): The names of the genres.
         """
 
-        db = current_app.extensions["db"]
+        if not genres:
+            return
 
-        genre_ids = BookRepository.get_genre_ids_from_genre_names(genres)
+        db = current_app.extensions["db"]
 
-        for genre_id in genre_ids:
-            db.execute_query(
-                BookQueries.DELETE_FROM_BOOK_GENRE_LINKS,
-                (book_id, genre_id["book_genre_id"]),
-            )
+        db.execute_query(
+            BookQueries.DELETE_FROM_BOOK_GENRE_LINKS, (book_id, list(genres))
+        )
 
     @staticmethod
     def add_book_images_to_database(
         book_id, uploaded_urls, add_type="add_book"
     ) -> None:
         """
-        to be written
-        """
+        Insert the uploaded images of a book in a single statement.
 
-        db = current_app.extensions["db"]
+        Args:
+            book_id (str): The unique identifier of the book.
+            uploaded_urls (list): For "add_book", a list of uploaded image dicts, numbered in order.
+                For "edit_book", a list of (order_num, uploaded image dict) tuples.
+            add_type (str): "add_book" or "edit_book".
+        """
 
         if add_type == "add_book":
-            for index, uploaded_url in enumerate(uploaded_urls):
-                db.execute_query(
-                    BookQueries.INSERT_TO_BOOK_IMAGES,
-                    (
-                        uploaded_url["image_url"],
-                        uploaded_url["uploaded_at"],
-                        index + 1,
-                        book_id,
-                    ),
-                )
-
+            uploaded_urls_with_order_num = list(enumerate(uploaded_urls, start=1))
         else:
-            for uploaded_url_with_order_num in uploaded_urls:
-                db.execute_query(
-                    BookQueries.INSERT_TO_BOOK_IMAGES,
-                    (
-                        uploaded_url_with_order_num[1]["image_url"],
-                        uploaded_url_with_order_num[1]["uploaded_at"],
-                        uploaded_url_with_order_num[0],
-                        book_id,
-                    ),
-                )
+            uploaded_urls_with_order_num = list(uploaded_urls)
+
+        if not uploaded_urls_with_order_num:
+            return
+
+        db = current_app.extensions["db"]
+
+        db.execute_query(
+            BookQueries.INSERT_TO_BOOK_IMAGES,
+            (
+                [url["image_url"] for _, url in uploaded_urls_with_order_num],
+                [url.get("thumbnail_url") for _, url in uploaded_urls_with_order_num],
+                [url.get("card_url") for _, url in uploaded_urls_with_order_num],
+                [url.get("full_url") for _, url in uploaded_urls_with_order_num],
+                [url["uploaded_at"] for _, url in uploaded_urls_with_order_num],
+                [order_num for order_num, _ in uploaded_urls_with_order_num],
+                book_id,
+            ),
+        )
 
     @staticmethod
     def remove_book_images_from_database(
         book_id, existing_book_image_urls_to_delete
     ) -> None:
         """
-        to be written
+        Delete images of a book in a single statement.
+
+        Args:
+            book_id (str): The unique identifier of the book.
+            existing_book_image_urls_to_delete (list[str]): The original or full variant URLs of the images.
         """
 
+        if not existing_book_image_urls_to_delete:
+            return
+
         db = current_app.extensions["db"]
 
-        for existing_book_image_url_to_delete in existing_book_image_urls_to_delete:
-            db.execute_query(
-                BookQueries.REMOVE_FROM_BOOK_IMAGES,
-                (book_id, existing_book_image_url_to_delete),
-            )
+        image_urls = list(existing_book_image_urls_to_delete)
+
+        db.execute_query(
+            BookQueries.REMOVE_FROM_BOOK_IMAGES, (book_id, image_urls, image_urls)
+        )
 
     @staticmethod
-    def edit_book_order_in_database(book_id, order_num, image_url) -> None:
+    def edit_book_order_in_database(book_id, image_urls_with_order_num) -> None:
         """
-        to be written
+        Reorder images of a book in a single statement.
+
+        Args:
+            book_id (str): The unique identifier of the book.
+            image_urls_with_order_num (list[tuple[int, str]]): (order_num, image URL) pairs.
+                The URL may be the original or the full variant.
         """
 
+        if not image_urls_with_order_num:
+            return
+
         db = current_app.extensions["db"]
 
         db.execute_query(
             BookQueries.EDIT_BOOK_ORDER_IN_BOOK_IMAGES,
-            (order_num, book_id, image_url),
+            (
+                [image_url for _, image_url in image_urls_with_order_num],
+                [order_num for order_num, _ in image_urls_with_order_num],
+                book_id,
+            ),
         )
 
+    @staticmethod
+    def get_book_genre_ids_by_name() -> dict[str, Any]:
+        """
+        Retrieve every genre, keyed by its lowercased name.
+
+        Returns:
+            dict[str, Any]: A mapping of lowercased genre name to book_genre_id.
+        """
+
+        db = current_app.extensions["db"]
+
+        genres = db.fetch_all(
+            CommonQueries.GET_COLUMNS_FROM_TABLE.format(
+                columns="book_genre_id, book_genre_name",
+                table="book_genres",
+                order_column="book_genre_name",
+            )
+        )
+
+        return {
+            genre["book_genre_name"].lower(): genre["book_genre_id"] for genre in genres
+        }
+
+    @staticmethod
+    def bulk_import_books(
+        book_rows: list[tuple[Any, ...]], book_genre_link_rows: list[tuple[Any, Any]]
+    ) -> int:
+        """
+        Insert many books and their genre links in one transaction.
+
+        The rows are streamed with COPY into temporary staging tables, which are then
+        merged into books and book_genre_links. Either every row is imported or none is.
+
+        Args:
+            book_rows (list[tuple]): Rows in the column order of COPY_TO_BOOK_IMPORT_STAGING.
+            book_genre_link_rows (list[tuple]): (book_id, book_genre_id) rows.
+
+        Returns:
+            int: The number of books inserted.
+        """
+
+        db = current_app.extensions["db"]
+
+        with db.transaction() as conn:
+            with conn.cursor() as cur:
+                cur.execute(BookQueries.CREATE_BOOK_IMPORT_STAGING)
+                cur.execute(BookQueries.CREATE_BOOK_GENRE_LINK_IMPORT_STAGING)
+
+                with cur.copy(BookQueries.COPY_TO_BOOK_IMPORT_STAGING) as copy:
+                    for book_row in book_rows:
+                        copy.write_row(book_row)
+
+                with cur.copy(
+                    BookQueries.COPY_TO_BOOK_GENRE_LINK_IMPORT_STAGING
+                ) as copy:
+                    for book_genre_link_row in book_genre_link_rows:
+                        copy.write_row(book_genre_link_row)
+
+                cur.execute(BookQueries.MERGE_BOOK_IMPORT_STAGING)
+                inserted_count = cur.rowcount
+
+                cur.execute(BookQueries.MERGE_BOOK_GENRE_LINK_IMPORT_STAGING)
+
+        return inserted_count
+
+    @staticmethod
+    def update_book_images_status(book_id, images_status: str) -> None:
+        """
+        Set the background image upload status of a book.
+
+        Args:
+            book_id (str): The unique identifier of the book.
+            images_status (str): One of 'pending', 'ready', or 'failed'.
+        """
+
+        db = current_app.extensions["db"]
+
+        db.execute_query(
+            BookQueries.UPDATE_BOOK_IMAGES_STATUS,
+            (images_status, book_id),
+        )
+
+    @staticmethod
+    def fail_stale_pending_book_images(timeout_seconds: float) -> list[dict[str, Any]]:
+        """
+        Mark as 'failed' the books whose images have been 'pending' for longer than the timeout.
+
+        Args:
+            timeout_seconds (float): How long a book may stay 'pending'.
+
+        Returns:
+            list[Dict[str, Any]]: The book_id and owner_id of each book marked 'failed'.
+        """
+
+        db = current_app.extensions["db"]
+
+        return (
+            db.fetch_all(BookQueries.FAIL_STALE_PENDING_BOOK_IMAGES, (timeout_seconds,))
+            or []
+        )
+
+    @staticmethod
+    def get_book_images_status(book_id) -> Optional[dict[str, Any]]:
+        """
+        Retrieve the background image upload status of a book.
+
+        Args:
+            book_id (str): The unique identifier of the book.
+
+        Returns:
+            Optional[Dict[str, Any]]: A dictionary containing book_id, owner_id, and images_status,
+                or None if the book does not exist.
+        """
+
+        db = current_app.extensions["db"]
+
+        return db.fetch_one(BookQueries.GET_BOOK_IMAGES_STATUS, (book_id,))
+
     @staticmethod
     def delete_all_book_genre_links_from_book(book_id) -> None:
         """
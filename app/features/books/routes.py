@@ -372,6 +372,32 @@ def get_book_details(book_id: str) -> tuple[Response, int]:
     return BookControllers.get_book_details_controller(book_id)
 
 
+@books_bp.route("/<string:book_id>/images-status", methods=["GET"])
+@jwt_required()
+def get_book_images_status(book_id: str) -> tuple[Response, int]:
+    """
+    Retrieve the background image upload status of a book.
+
+    Images of a newly added or edited book are uploaded after the request returns.
+    Clients can poll this endpoint, or listen for the 'book_images_status' Socket.IO
+    event in the owner's room, to know when the images are available.
+
+    Path parameters:
+        book_id (string): The UUID of the book
+
+    Response JSON:
+        {
+            "bookId": "uuid",
+            "imagesStatus": "pending" | "ready" | "failed"
+        }
+
+    Possible errors:
+        404 if the book is not found
+        500 if an unexpected error occurs
+    """
+    return BookControllers.get_book_images_status_controller(book_id)
+
+
 @books_bp.route("/", methods=["POST"])
 @jwt_required()
 def add_new_book() -> tuple[Response, int]:
@@ -381,6 +407,39 @@ def add_new_book() -> tuple[Response, int]:
     return BookControllers.add_new_book_controller()
 
 
+@books_bp.route("/bulk-import", methods=["POST"])
+@jwt_required()
+def bulk_import_books() -> tuple[Response, int]:
+    """
+    Import many books owned by the current user at once.
+
+    Accepts either a multipart upload of a .csv or .json file in the 'file' field, or a
+    JSON body that is an array of books (or {"books": [...]}). Each book has the fields of
+    the add book form: title, author, condition, genres, description, availability,
+    dailyRentPrice, securityDeposit, purchasePrice, rentalDuration. In a CSV, genres are
+    separated by ';' or '|'.
+
+    Valid rows are inserted in one transaction; invalid rows are skipped and reported.
+    Imported books have no images.
+
+    Response JSON:
+        {
+            "importedCount": 120,
+            "failedCount": 2,
+            "errors": [
+                {"row": 7, "errors": ["title is required."]},
+                {"row": 31, "errors": ["Unknown genres: Cookbook."]}
+            ]
+        }
+
+    Possible errors:
+        400 if the payload is not a CSV/JSON list of books or has more rows than allowed
+        401 if the user is not authenticated
+        500 if an unexpected error occurs
+    """
+    return BookControllers.bulk_import_books_controller()
+
+
 @books_bp.route("/<string:book_id>", methods=["PATCH"])
 @jwt_required()
 def edit_a_book(book_id) -> tuple[Response, int]:
@@ -1,10 +1,18 @@
 from .repository import BookRepository
 
-from app.common.dataclasses import Book, MyLibraryBook
+from app.common.constants import (
+    BookAvailabilityEnum,
+    BookConditionEnum,
+    BookImagesStatusEnum,
+)
+
+from app.common.dataclasses import Book, MyLibraryBook, QueuedBookImage
 
 from app.utils.converters import convert_book_dict, convert_my_library_book_dict
 
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
+
+from uuid import uuid4
 
 from app.utils import (
     DateUtils,
@@ -12,10 +20,21 @@ from app.utils import (
     upload_images_to_bucket_from_edit_book_service,
 )
 
-from supabase import create_client, Client
+from app.services.background_queue import BackgroundQueue
+
+from app.exceptions.custom_exceptions import InvalidParameterError
 
 from flask import current_app
 
+from app import socketio
+
+import logging
+import traceback
+
+logger = logging.getLogger(__name__)
+
+BOOK_IMAGES_BUCKET = "book_images"
+
 
 class BookServices:
 
@@ -281,12 +300,30 @@ class BookServices:
             "times_rented": int(book["times_rented"]),
             "is_rented": book["is_rented"],
             "is_purchased": book["is_purchased"],
-            "images": [img["image_url"] for img in images],
+            "images_status": book["images_status"],
+            "images": [img["full_url"] or img["image_url"] for img in images],
+            "image_thumbnails": [
+                img["thumbnail_url"] or img["image_url"] for img in images
+            ],
         }
 
     @staticmethod
-    def add_new_book_service(user_id, book_data, book_images) -> None:
-        """Add a new book (improve later)"""
+    def add_new_book_service(user_id, book_data, book_images) -> dict[str, str]:
+        """
+        Add a new book and queue its images for upload.
+
+        The book row and its genre links are committed right away. The images are read
+        into memory and uploaded to storage by a background worker, so the response time
+        does not depend on the number or size of the photos.
+
+        Args:
+            user_id (str): The ID of the book owner.
+            book_data (dict): The details of the book.
+            book_images (MultiDict): The uploaded files of the request.
+
+        Returns:
+            dict: The new book_id and its images_status ('pending' or 'ready').
+        """
 
         # Add book details to book
 
@@ -299,6 +336,16 @@ class BookServices:
         else:
             book_data["availability"] = book_data["availability"].lower()
 
+        parsed_book_images = BookServices._read_book_images(
+            book_images.getlist("bookImages")
+        )
+
+        book_data["images_status"] = (
+            BookImagesStatusEnum.pending.value
+            if parsed_book_images
+            else BookImagesStatusEnum.ready.value
+        )
+
         book_id_dict = BookRepository.add_new_book(user_id, book_data)
 
         book_id = book_id_dict["book_id"]
@@ -307,26 +354,214 @@ class BookServices:
 
         BookRepository.connect_book_to_genres(book_id, book_data["genres"])
 
-        # Upload images to Supabase
+        # Upload images to storage in the background
+
+        if parsed_book_images:
+            BackgroundQueue.enqueue(
+                BookServices.upload_added_book_images_job,
+                user_id,
+                book_id,
+                parsed_book_images,
+            )
+
+        return {"book_id": str(book_id), "images_status": book_data["images_status"]}
+
+    @staticmethod
+    def bulk_import_books_service(
+        user_id, book_rows: Iterable[Any], max_rows: int
+    ) -> dict[str, Any]:
+        """
+        Validate and import many books at once, e.g. a bookstore's or library's catalog.
+
+        Rows are validated one at a time as they are read, so a CSV upload is never held
+        in memory as a whole. Valid rows are then inserted together in one transaction;
+        invalid rows are skipped and reported.
+
+        Args:
+            user_id (str): The ID of the owner of the imported books.
+            book_rows (Iterable): The rows to import, each a dict with the same fields as the
+                add book form (title, author, condition, genres, description, availability,
+                dailyRentPrice, securityDeposit, purchasePrice, rentalDuration).
+            max_rows (int): The maximum number of rows accepted in one import.
+
+        Returns:
+            dict: A dictionary containing:
+                - imported_count (int): The number of books inserted
+                - failed_count (int): The number of rows skipped
+                - errors (list[dict]): The 1-based row number and error messages of each skipped row
+        """
+
+        genre_ids_by_name = BookRepository.get_book_genre_ids_by_name()
+
+        books_to_import: list[tuple[Any, ...]] = []
+        book_genre_links_to_import: list[tuple[Any, Any]] = []
+        errors: list[dict[str, Any]] = []
+
+        for row_number, book_row in enumerate(book_rows, start=1):
+            if row_number > max_rows:
+                raise InvalidParameterError(
+                    f"A bulk import is limited to {max_rows} rows."
+                )
+
+            book_data, row_errors = BookServices._validate_bulk_import_row(
+                book_row, genre_ids_by_name
+            )
+
+            if row_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+                continue
+
+            book_id = uuid4()
+
+            books_to_import.append(
+                (
+                    book_id,
+                    book_data["title"],
+                    book_data["author"],
+                    book_data["condition"],
+                    book_data["description"],
+                    book_data["availability"],
+                    book_data["daily_rent_price"],
+                    book_data["security_deposit"],
+                    book_data["purchase_price"],
+                    book_data["rental_duration"],
+                    user_id,
+                    BookImagesStatusEnum.ready.value,
+                )
+            )
+
+            book_genre_links_to_import.extend(
+                (book_id, genre_id) for genre_id in book_data["genre_ids"]
+            )
+
+        imported_count = 0
+
+        if books_to_import:
+            imported_count = BookRepository.bulk_import_books(
+                books_to_import, book_genre_links_to_import
+            )
 
-        parsed_book_images = book_images.getlist("bookImages")
+        return {
+            "imported_count": imported_count,
+            "failed_count": len(errors),
+            "errors": errors,
+        }
 
-        supabase: Client = create_client(
-            current_app.config.get("SUPABASE_URL", ""),
-            current_app.config.get("SUPABASE_SERVICE_KEY", ""),
+    @staticmethod
+    def _validate_bulk_import_row(
+        book_row: Any, genre_ids_by_name: dict[str, Any]
+    ) -> tuple[dict[str, Any], list[str]]:
+        """Normalize one bulk import row and collect everything wrong with it."""
+
+        if not isinstance(book_row, dict):
+            return {}, ["Row must be an object."]
+
+        errors: list[str] = []
+
+        def get_text(field: str) -> str:
+            value = book_row.get(field)
+            return str(value).strip() if value is not None else ""
+
+        def get_int(field: str) -> int:
+            value = get_text(field)
+
+            if not value:
+                return 0
+
+            try:
+                number = int(value)
+            except ValueError:
+                errors.append(f"{field} must be a whole number.")
+                return 0
+
+            if number < 0:
+                errors.append(f"{field} must be non-negative.")
+
+            return number
+
+        book_data: dict[str, Any] = {
+            "title": get_text("title"),
+            "author": get_text("author"),
+            "condition": get_text("condition").lower(),
+            "description": get_text("description"),
+            "availability": get_text("availability").lower(),
+            "daily_rent_price": get_int("dailyRentPrice"),
+            "security_deposit": get_int("securityDeposit"),
+            "purchase_price": get_int("purchasePrice"),
+            "rental_duration": get_int("rentalDuration"),
+        }
+
+        for field in ("title", "author"):
+            if not book_data[field]:
+                errors.append(f"{field} is required.")
+
+        conditions = [condition.value for condition in BookConditionEnum]
+
+        if book_data["condition"] not in conditions:
+            errors.append(f"condition must be one of: {', '.join(conditions)}.")
+
+        book_data["availability"] = {"for rent": "rent", "for sale": "purchase"}.get(
+            book_data["availability"], book_data["availability"]
         )
 
-        bucket_name = "book_images"
+        availabilities = [availability.value for availability in BookAvailabilityEnum]
+
+        if book_data["availability"] not in availabilities:
+            errors.append(f"availability must be one of: {', '.join(availabilities)}.")
+
+        if book_data["availability"] in ("rent", "both"):
+            if book_data["daily_rent_price"] <= 0:
+                errors.append("dailyRentPrice is required for books for rent.")
+            if book_data["rental_duration"] <= 0:
+                errors.append("rentalDuration is required for books for rent.")
+
+        if (
+            book_data["availability"] in ("purchase", "both")
+            and book_data["purchase_price"] <= 0
+        ):
+            errors.append("purchasePrice is required for books for sale.")
 
-        uploaded_urls = upload_images_to_bucket_from_add_book_service(
-            supabase, parsed_book_images, book_id, bucket_name
+        # JSON rows give a list; CSV rows give names separated by ";" or "|"
+        genres = book_row.get("genres") or []
+
+        if isinstance(genres, str):
+            genres = genres.replace("|", ";").split(";")
+
+        genre_names = {str(genre).strip() for genre in genres if str(genre).strip()}
+
+        unknown_genres = sorted(
+            genre for genre in genre_names if genre.lower() not in genre_ids_by_name
         )
 
-        BookRepository.add_book_images_to_database(book_id, uploaded_urls)
+        if unknown_genres:
+            errors.append(f"Unknown genres: {', '.join(unknown_genres)}.")
+
+        book_data["genre_ids"] = {
+            genre_ids_by_name[genre.lower()]
+            for genre in genre_names
+            if genre.lower() in genre_ids_by_name
+        }
+
+        return book_data, errors
 
     @staticmethod
-    def edit_a_book_service(book_id, book_data, book_images) -> None:
-        """Add a new book (improve later)"""
+    def edit_a_book_service(user_id, book_id, book_data, book_images) -> str:
+        """
+        Edit a book and queue its image changes for upload.
+
+        Book details, genre links, removed image rows, and the new image order are saved
+        right away. New images are uploaded and removed images are deleted from the bucket
+        by a background worker.
+
+        Args:
+            user_id (str): The ID of the book owner.
+            book_id (str): The ID of the book to edit.
+            book_data (dict): The new details of the book.
+            book_images (MultiDict): The uploaded files of the request.
+
+        Returns:
+            str: The images_status of the book after the edit ('pending' or 'ready').
+        """
 
         # Update details of the book
         book_data["condition"] = book_data["condition"].lower()
@@ -352,26 +587,26 @@ class BookServices:
         if len(book_data["genres_to_add"]) > 0:
             BookRepository.connect_book_to_genres(book_id, book_data["genres_to_add"])
 
-        # Remove old images from Supabase book_images bucket
-
-        SUPABASE_BUCKET_URL = f"{current_app.config.get("SUPABASE_URL")}/storage/v1/object/public/book_images/"
-        bucket_name = "book_images"
-
-        supabase: Client = create_client(
-            current_app.config.get("SUPABASE_URL", ""),
-            current_app.config.get("SUPABASE_SERVICE_KEY", ""),
-        )
+        BOOK_IMAGES_BUCKET_URL = current_app.extensions[
+            "storage"
+        ].get_public_url_prefix(BOOK_IMAGES_BUCKET)
 
         has_deleted_an_image = False
 
+        image_urls_to_remove_from_bucket: list[str] = []
+
         if len(book_data["existing_book_image_urls_to_delete"]) > 0:
 
-            supabase.storage.from_(bucket_name).remove(
+            # Collect the original and every variant of the old images before their rows are gone
+
+            image_urls_to_remove_from_bucket = BookServices._get_all_book_image_urls(
                 [
-                    existing_book_image_url_to_delete.split("/").pop()
-                    for existing_book_image_url_to_delete in book_data[
-                        "existing_book_image_urls_to_delete"
-                    ]
+                    book_image
+                    for book_image in BookRepository.get_book_images(book_id)
+                    if book_image["image_url"]
+                    in book_data["existing_book_image_urls_to_delete"]
+                    or book_image["full_url"]
+                    in book_data["existing_book_image_urls_to_delete"]
                 ]
             )
 
@@ -383,42 +618,184 @@ class BookServices:
 
             has_deleted_an_image = True
 
+        image_order = []
+
         if len(book_data["all_book_order"]) > 0:
             # If there's a new book order (by dragging image names)
-
-            for index, file_or_url in enumerate(book_data["all_book_order"], start=1):
-                if not file_or_url.startswith(SUPABASE_BUCKET_URL):
-                    continue
-
-                BookRepository.edit_book_order_in_database(book_id, index, file_or_url)
+            image_order = book_data["all_book_order"]
 
         elif len(book_data["all_book_order"]) == 0 and has_deleted_an_image:
             # If an uploaded book has been deleted (no dragging of image names)
-            for index, file_or_url in enumerate(
-                book_data["existing_book_image_urls"], start=1
-            ):
-                if not file_or_url.startswith(SUPABASE_BUCKET_URL):
-                    continue
+            image_order = book_data["existing_book_image_urls"]
 
-                BookRepository.edit_book_order_in_database(book_id, index, file_or_url)
+        # New files in the order are numbered later by the upload job
+        BookRepository.edit_book_order_in_database(
+            book_id,
+            [
+                (index, file_or_url)
+                for index, file_or_url in enumerate(image_order, start=1)
+                if file_or_url.startswith(BOOK_IMAGES_BUCKET_URL)
+            ],
+        )
 
-        parsed_book_images = book_images.getlist("bookImages")
+        parsed_book_images = BookServices._read_book_images(
+            book_images.getlist("bookImages")
+        )
 
-        uploaded_urls_with_order_num = upload_images_to_bucket_from_edit_book_service(
-            supabase,
-            parsed_book_images,
-            book_id,
-            bucket_name,
-            book_data["existing_book_image_urls"],
-            book_data["all_book_order"],
+        images_status = BookImagesStatusEnum.ready.value
+
+        if parsed_book_images:
+            images_status = BookImagesStatusEnum.pending.value
+            BookRepository.update_book_images_status(book_id, images_status)
+
+        # Upload new images and remove old images from storage in the background
+
+        if parsed_book_images or has_deleted_an_image:
+            BackgroundQueue.enqueue(
+                BookServices.upload_edited_book_images_job,
+                user_id,
+                book_id,
+                parsed_book_images,
+                book_data["existing_book_image_urls"],
+                book_data["all_book_order"],
+                image_urls_to_remove_from_bucket,
+            )
+
+        return images_status
+
+    @staticmethod
+    def get_book_images_status_service(book_id: str) -> Optional[dict[str, str]]:
+        """
+        Get the background image upload status of a book.
+
+        Args:
+            book_id (str): The ID of the book.
+
+        Returns:
+            Optional[dict]: The book_id and its images_status, or None if the book does not exist.
+        """
+
+        book = BookRepository.get_book_images_status(book_id)
+
+        if not book:
+            return None
+
+        return {"book_id": str(book["book_id"]), "images_status": book["images_status"]}
+
+    @staticmethod
+    def upload_added_book_images_job(
+        owner_id, book_id, book_images: list[QueuedBookImage]
+    ) -> None:
+        """Background job: upload the images of a newly added book and link them to it."""
+
+        images_status = BookImagesStatusEnum.ready.value
+
+        try:
+            storage = current_app.extensions["storage"]
+
+            uploaded_urls = upload_images_to_bucket_from_add_book_service(
+                storage,
+                book_images,
+                book_id,
+                BOOK_IMAGES_BUCKET,
+                current_app.config.get("BOOK_IMAGE_VARIANT_FORMAT", "webp"),
+            )
+
+            BookRepository.add_book_images_to_database(book_id, uploaded_urls)
+
+        except Exception as e:
+            logger.error(f"Uploading images of book {book_id} failed: {str(e)}")
+            traceback.print_exc()
+            images_status = BookImagesStatusEnum.failed.value
+
+        BookServices._finish_book_images_job(owner_id, book_id, images_status)
+
+    @staticmethod
+    def upload_edited_book_images_job(
+        owner_id,
+        book_id,
+        book_images: list[QueuedBookImage],
+        existing_book_image_urls: list[str],
+        all_book_order: list[str],
+        image_urls_to_remove_from_bucket: list[str],
+    ) -> None:
+        """Background job: remove deleted images from the bucket and upload the new images of an edited book."""
+
+        images_status = BookImagesStatusEnum.ready.value
+
+        try:
+            storage = current_app.extensions["storage"]
+
+            # Remove old images from the book_images bucket
+
+            if len(image_urls_to_remove_from_bucket) > 0:
+                storage.remove_by_public_urls(
+                    BOOK_IMAGES_BUCKET, image_urls_to_remove_from_bucket
+                )
+
+            uploaded_urls_with_order_num = (
+                upload_images_to_bucket_from_edit_book_service(
+                    storage,
+                    book_images,
+                    book_id,
+                    BOOK_IMAGES_BUCKET,
+                    existing_book_image_urls,
+                    all_book_order,
+                    current_app.config.get("BOOK_IMAGE_VARIANT_FORMAT", "webp"),
+                )
+            )
+
+            # Link to new images to book_images table
+
+            if len(uploaded_urls_with_order_num) > 0:
+                BookRepository.add_book_images_to_database(
+                    book_id, uploaded_urls_with_order_num, add_type="edit_book"
+                )
+
+        except Exception as e:
+            logger.error(f"Updating images of book {book_id} failed: {str(e)}")
+            traceback.print_exc()
+            images_status = BookImagesStatusEnum.failed.value
+
+        # Only image uploads put the book in 'pending', so a removal-only job leaves the status alone
+        if book_images:
+            BookServices._finish_book_images_job(owner_id, book_id, images_status)
+
+    @staticmethod
+    def _finish_book_images_job(owner_id, book_id, images_status: str) -> None:
+        """Save the final images_status of a book and notify its owner through Socket.IO."""
+
+        BookRepository.update_book_images_status(book_id, images_status)
+
+        socketio.emit(
+            "book_images_status",
+            {"bookId": str(book_id), "imagesStatus": images_status},
+            room=str(owner_id),
         )
 
-        # Link to new images to book_images table
+    @staticmethod
+    def _get_all_book_image_urls(book_images: list[dict[str, Any]]) -> list[str]:
+        """Get the URLs of the originals and all stored variants of book_images rows."""
+
+        return [
+            book_image[column]
+            for book_image in book_images
+            for column in ("image_url", "thumbnail_url", "card_url", "full_url")
+            if book_image[column]
+        ]
 
-        if len(uploaded_urls_with_order_num) > 0:
-            BookRepository.add_book_images_to_database(
-                book_id, uploaded_urls_with_order_num, add_type="edit_book"
+    @staticmethod
+    def _read_book_images(book_images) -> list[QueuedBookImage]:
+        """Read uploaded files into memory so they outlive the request."""
+
+        return [
+            QueuedBookImage(
+                filename=book_image.filename,
+                content_type=book_image.content_type,
+                data=book_image.read(),
             )
+            for book_image in book_images
+        ]
 
     @staticmethod
     def delete_a_book_service(book_id) -> None:
@@ -432,18 +809,12 @@ class BookServices:
             image_url_dict["image_url"] for image_url_dict in image_urls_dict
         ]
 
-        supabase: Client = create_client(
-            current_app.config.get("SUPABASE_URL", ""),
-            current_app.config.get("SUPABASE_SERVICE_KEY", ""),
+        image_urls_to_remove_from_bucket = BookServices._get_all_book_image_urls(
+            image_urls_dict
         )
 
-        bucket_name = "book_images"
-
-        supabase.storage.from_(bucket_name).remove(
-            [
-                image_url_to_delete.split("/").pop()
-                for image_url_to_delete in image_urls_to_delete
-            ]
+        current_app.extensions["storage"].remove_by_public_urls(
+            BOOK_IMAGES_BUCKET, image_urls_to_remove_from_bucket
         )
 
         BookRepository.remove_book_images_from_database(book_id, image_urls_to_delete)
@@ -0,0 +1 @@
+from .routes import metrics_bp  # noqa: F401
@@ -0,0 +1,35 @@
+from flask import jsonify, request
+from .services import MetricsServices
+from app.exceptions.custom_exceptions import InvalidParameterError
+from app.utils import to_int
+import traceback
+
+
+class MetricsController:
+
+    @staticmethod
+    def get_scheduler_job_metrics_controller() -> tuple[dict, int]:
+        try:
+            hours = to_int(request.args.get("hours"), 168)
+
+            if hours <= 0:
+                raise InvalidParameterError("hours must be a positive integer.")
+
+            jobs = MetricsServices.get_scheduler_job_metrics_service(hours)
+            return jsonify({"jobs": jobs}), 200
+
+        except InvalidParameterError as e:
+            return jsonify({"error": str(e)}), 400
+
+        except Exception as e:
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    def get_presence_metrics_controller() -> tuple[dict, int]:
+        try:
+            return jsonify(MetricsServices.get_presence_metrics_service()), 200
+
+        except Exception as e:
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 500
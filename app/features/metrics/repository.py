@@ -0,0 +1,20 @@
+from flask import current_app
+from app.db.queries import SchedulerQueries
+
+
+class MetricsRepository:
+
+    @staticmethod
+    def get_scheduler_job_metrics(hours: int) -> list[dict]:
+        """
+        Retrieve run statistics for each scheduler job that has run at least once.
+
+        Args:
+            hours (int): Only runs started in the last `hours` hours are aggregated.
+
+        Returns:
+            list[dict]: One row per job, see SchedulerQueries.GET_JOB_RUN_METRICS.
+        """
+        db = current_app.extensions["db"]
+
+        return db.fetch_all(SchedulerQueries.GET_JOB_RUN_METRICS, (hours,)) or []
@@ -0,0 +1,48 @@
+from flask import Blueprint, Response
+from .controllers import MetricsController
+from flask_jwt_extended import jwt_required
+
+metrics_bp = Blueprint("metrics_bp", __name__, url_prefix="/metrics")
+
+
+@metrics_bp.route("/scheduler-jobs", methods=["GET"])
+@jwt_required()
+def get_scheduler_job_metrics() -> tuple[Response, int]:
+    """
+    Retrieve run statistics for each scheduler job.
+
+    Query params:
+        hours (int, optional): Window of runs the statistics cover. Defaults to 168 (7 days).
+
+    Response JSON:
+        jobs: list of objects with
+            job_name, run_count, failure_count,
+            p50_duration_ms, p95_duration_ms, max_duration_ms,
+            p50_lag_ms, p95_lag_ms, max_lag_ms, rows_affected,
+            failure_streak, last_success_at,
+            last_run (started_at, status, duration_ms, rows_affected, error)
+
+    Possible errors:
+        400 if hours is not a positive integer.
+        401 if the user is not authenticated.
+        500 if an unexpected error occurs.
+    """
+    return MetricsController.get_scheduler_job_metrics_controller()
+
+
+@metrics_bp.route("/presence", methods=["GET"])
+@jwt_required()
+def get_presence_metrics() -> tuple[Response, int]:
+    """
+    Retrieve the Socket.IO presence counts of the app process serving the request.
+
+    Response JSON:
+        connected_users: users with at least one open connection
+        connections: open connections that joined a user room
+        scope: "process"; each app process only counts its own connections
+
+    Possible errors:
+        401 if the user is not authenticated.
+        500 if an unexpected error occurs.
+    """
+    return MetricsController.get_presence_metrics_controller()
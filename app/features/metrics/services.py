@@ -0,0 +1,66 @@
+from .repository import MetricsRepository
+from app.services.presence import PresenceRegistry
+from typing import Any
+
+
+class MetricsServices:
+
+    @staticmethod
+    def get_presence_metrics_service() -> dict[str, Any]:
+        """
+        Count the users and connections of this process's presence registry.
+
+        Returns:
+            dict: connected_users, connections, and scope.
+        """
+
+        return {
+            "connected_users": PresenceRegistry.connected_user_count(),
+            "connections": PresenceRegistry.connection_count(),
+            "scope": "process",
+        }
+
+    @staticmethod
+    def get_scheduler_job_metrics_service(hours: int) -> list[dict[str, Any]]:
+        """
+        Fetch per-job duration percentiles, lag, and failure streaks of the scheduler.
+
+        Args:
+            hours (int): Window of runs the statistics cover.
+
+        Returns:
+            list[dict]: One entry per scheduler job.
+        """
+
+        return [
+            {
+                "job_name": row["job_name"],
+                "run_count": row["run_count"],
+                "failure_count": row["failure_count"],
+                "p50_duration_ms": MetricsServices._round(row["p50_duration_ms"]),
+                "p95_duration_ms": MetricsServices._round(row["p95_duration_ms"]),
+                "max_duration_ms": MetricsServices._round(row["max_duration_ms"]),
+                "p50_lag_ms": MetricsServices._round(row["p50_lag_ms"]),
+                "p95_lag_ms": MetricsServices._round(row["p95_lag_ms"]),
+                "max_lag_ms": MetricsServices._round(row["max_lag_ms"]),
+                "rows_affected": row["rows_affected"],
+                "failure_streak": row["failure_streak"],
+                "last_success_at": (
+                    row["last_success_at"].isoformat()
+                    if row["last_success_at"]
+                    else None
+                ),
+                "last_run": {
+                    "started_at": row["last_run_at"].isoformat(),
+                    "status": row["last_run_status"],
+                    "duration_ms": MetricsServices._round(row["last_run_duration_ms"]),
+                    "rows_affected": row["last_run_rows_affected"],
+                    "error": row["last_run_error"],
+                },
+            }
+            for row in MetricsRepository.get_scheduler_job_metrics(hours)
+        ]
+
+    @staticmethod
+    def _round(value: float | None) -> float | None:
+        return round(value, 1) if value is not None else None
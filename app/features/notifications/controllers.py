@@ -1,4 +1,4 @@
-from flask import request, jsonify, Response
+from flask import current_app, request, jsonify, Response
 
 import traceback
 
@@ -12,8 +12,6 @@ from app.utils import dict_keys_to_camel, asdict_enum_safe, to_int
 
 from typing import Any, cast
 
-from app import socketio
-
 
 class NotificationControllers:
 
@@ -31,6 +29,11 @@ class NotificationControllers:
             if not user_id:
                 return jsonify({"message": "Not authenticated."}), 401
 
+            # Keyset pagination for infinite scroll; the offset pages below stay for
+            # clients that still send pageNumber
+            if "cursor" in request.args:
+                return NotificationControllers._get_notifications_page(user_id)
+
             params = {
                 "rows_per_page": to_int(request.args.get("rowsPerPage", 0)),
                 "page_number": to_int(request.args.get("pageNumber", 0)),
@@ -91,6 +94,145 @@ class NotificationControllers:
                 400,
             )
 
+    @staticmethod
+    def _get_notifications_page(user_id) -> tuple[Response, int]:
+        """
+        Respond with one inbox page after the given cursor, the cursor of the next
+        page, and the unread count from the maintained counter. No total count is
+        computed.
+        """
+
+        ALLOWED_READ_STATUS_ITEMS = {"show all", "show only read", "show only unread"}
+        ALLOWED_ORDER_ITEMS = {"show newest first", "show oldest first"}
+
+        params = {
+            "limit": to_int(request.args.get("rowsPerPage", 20)),
+            "cursor": request.args.get("cursor", ""),
+            "read_status": (request.args.get("readStatus") or "show all")
+            .strip()
+            .lower(),
+            "order": (request.args.get("order") or "show newest first").strip().lower(),
+        }
+
+        if not 0 < int(params["limit"]) <= 100:
+            raise InvalidParameterError(
+                f"Invalid 'rowsPerPage' value: '{params['limit']}'. Must be between 1 and 100."
+            )
+
+        if params["read_status"] not in ALLOWED_READ_STATUS_ITEMS:
+            raise InvalidParameterError(
+                f"""Invalid 'readStatus' value: '{params['read_status']}'.
+                Must be one of: ['show all', 'show only read', 'show only unread']."""
+            )
+
+        if params["order"] not in ALLOWED_ORDER_ITEMS:
+            raise InvalidParameterError(
+                f"""Invalid 'order' value: '{params['order']}'.
+                Must be one of: ['show newest first', 'show oldest first']."""
+            )
+
+        # Read before the first page, so the client can sync changes from here on
+        changes_cursor = (
+            None
+            if params["cursor"]
+            else NotificationServices.get_notification_changes_cursor_service()
+        )
+
+        notifications, next_cursor = (
+            NotificationServices.get_notifications_page_service(user_id, params)
+        )
+
+        return (
+            jsonify(
+                {
+                    "notifications": [
+                        dict_keys_to_camel(
+                            cast(dict[str, Any], asdict_enum_safe(notification))
+                        )
+                        for notification in notifications
+                    ],
+                    "nextCursor": next_cursor,
+                    "changesCursor": changes_cursor,
+                    "unreadCount": NotificationServices.get_unread_notifications_count_service(
+                        user_id
+                    ),
+                }
+            ),
+            200,
+        )
+
+    @staticmethod
+    def get_notification_changes_controller() -> tuple[Response, int]:
+        """
+        Respond with the notifications created, read, unread, or deleted since the
+        `since` cursor, the cursor to pass next time, and the unread count. When
+        `resync` is true the client must reload its inbox instead; that is always
+        the case without a `since` cursor.
+        """
+
+        try:
+
+            user_id = get_jwt_identity()
+
+            if not user_id:
+                return jsonify({"message": "Not authenticated."}), 401
+
+            since = (request.args.get("since") or "").strip()
+
+            if since:
+                changes, next_cursor, resync = (
+                    NotificationServices.get_notification_changes_service(
+                        user_id,
+                        since,
+                        current_app.config.get("NOTIFICATION_CHANGES_MAX_ROWS", 500),
+                    )
+                )
+            else:
+                changes, resync = [], True
+                next_cursor = (
+                    NotificationServices.get_notification_changes_cursor_service()
+                )
+
+            return (
+                jsonify(
+                    {
+                        "changes": [
+                            {
+                                # A change without its notification can only
+                                # be applied as a delete
+                                "changeType": (
+                                    change["change_type"]
+                                    if change["notification"] is not None
+                                    else "deleted"
+                                ),
+                                "notificationId": change["notification_id"],
+                                "notification": (
+                                    dict_keys_to_camel(
+                                        cast(
+                                            dict[str, Any],
+                                            asdict_enum_safe(change["notification"]),
+                                        )
+                                    )
+                                    if change["notification"] is not None
+                                    else None
+                                ),
+                            }
+                            for change in changes
+                        ],
+                        "nextCursor": next_cursor,
+                        "resync": resync,
+                        "unreadCount": NotificationServices.get_unread_notifications_count_service(
+                            user_id
+                        ),
+                    }
+                ),
+                200,
+            )
+
+        except InvalidParameterError as e:
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 400
+
     @staticmethod
     def get_notifications_total_count_controller() -> tuple[Response, int]:
         """add later"""
@@ -155,10 +297,8 @@ class NotificationControllers:
                 + str(user_id)
             )
 
-            socketio.emit(
-                "update_unread_notifications_count",
-                {"unreadNotificationsCount": unread_notifications_count},
-                room=user_id,
+            NotificationServices.emit_unread_notifications_counts_service(
+                {user_id: unread_notifications_count}
             )
 
             return (
@@ -196,10 +336,8 @@ class NotificationControllers:
                 )
             )
 
-            socketio.emit(
-                "update_unread_notifications_count",
-                {"unreadNotificationsCount": unread_notifications_count},
-                room=user_id,
+            NotificationServices.emit_unread_notifications_counts_service(
+                {user_id: unread_notifications_count}
             )
 
             return (
@@ -237,10 +375,8 @@ class NotificationControllers:
                 )
             )
 
-            socketio.emit(
-                "update_unread_notifications_count",
-                {"unreadNotificationsCount": unread_notifications_count},
-                room=user_id,
+            NotificationServices.emit_unread_notifications_counts_service(
+                {user_id: unread_notifications_count}
             )
 
             return (
@@ -1,13 +1,19 @@
-from app.db.queries import CommonQueries
+from app.db.queries import CommonQueries, NotificationQueries
+
+from datetime import datetime
 
 from flask import current_app
 
+from typing import Any
+
+from psycopg.types.json import Json, Jsonb
+
 
 class NotificationRepository:
 
     @staticmethod
     def add_notification(
-        sender_user_id, receiver_user_id, notification_type, header, message
+        sender_user_id, receiver_user_id, notification_type, template_id, params
     ) -> None:
         """
         add later
@@ -18,12 +24,142 @@ class NotificationRepository:
         db.execute_query(
             CommonQueries.INSERT.format(
                 table="notifications",
-                columns="header, message, notification_type, sender_id, receiver_id",
+                columns="template_id, params, notification_type, sender_id, receiver_id",
                 placeholders="%s, %s, %s, %s, %s",
             ),
-            (header, message, notification_type, sender_user_id, receiver_user_id),
+            (
+                template_id,
+                Jsonb(params),
+                notification_type,
+                sender_user_id,
+                receiver_user_id,
+            ),
         )
 
+    @staticmethod
+    def add_notifications_bulk(notifications: list[dict[str, Any]]) -> None:
+        """
+        Insert many notifications in a single statement.
+
+        Batches of NOTIFICATIONS_COPY_THRESHOLD or more rows are streamed with COPY,
+        which skips building one large JSON parameter.
+
+        Args:
+            notifications (list[dict]): Each containing template_id, params,
+                notification_type, sender_id, and receiver_id, or header and message
+                instead of template_id and params.
+        """
+
+        if not notifications:
+            return
+
+        db = current_app.extensions["db"]
+
+        if len(notifications) < current_app.config.get(
+            "NOTIFICATIONS_COPY_THRESHOLD", 1000
+        ):
+            db.execute_query(
+                NotificationQueries.INSERT_NOTIFICATIONS_BULK, (Json(notifications),)
+            )
+            return
+
+        with db.transaction() as conn:
+            with conn.cursor() as cur:
+                with cur.copy(NotificationQueries.COPY_NOTIFICATIONS) as copy:
+                    for notification in notifications:
+                        copy.write_row(
+                            (
+                                notification.get("template_id"),
+                                (
+                                    Jsonb(notification["params"])
+                                    if notification.get("params") is not None
+                                    else None
+                                ),
+                                notification.get("header"),
+                                notification.get("message"),
+                                notification["notification_type"],
+                                notification["sender_id"],
+                                notification["receiver_id"],
+                            )
+                        )
+
+    @staticmethod
+    def get_unread_notifications_counts(receiver_user_ids: list[str]) -> dict[str, int]:
+        """
+        Read the unread notification counts of several users in a single query.
+
+        Args:
+            receiver_user_ids (list[str]): The IDs of the users.
+
+        Returns:
+            dict[str, int]: The unread count keyed by user ID. Users with none are omitted.
+        """
+
+        db = current_app.extensions["db"]
+
+        counts = db.fetch_all(
+            NotificationQueries.GET_UNREAD_NOTIFICATIONS_COUNTS, (receiver_user_ids,)
+        )
+
+        return {str(count["receiver_id"]): count["count"] for count in counts}
+
+    @staticmethod
+    def repair_unread_notifications_counts() -> dict[str, int]:
+        """
+        Recount every user's unread notifications and fix the stored counts that differ.
+
+        Returns:
+            dict[str, int]: The corrected unread counts keyed by user ID.
+        """
+
+        db = current_app.extensions["db"]
+
+        with db.transaction() as conn:
+            conn.execute(NotificationQueries.LOCK_UNREAD_NOTIFICATION_COUNTS)
+
+            counts = conn.execute(
+                NotificationQueries.REPAIR_UNREAD_NOTIFICATION_COUNTS
+            ).fetchall()
+
+        return {str(count["user_id"]): count["unread_count"] for count in counts}
+
+    @staticmethod
+    def create_notification_partitions(months_ahead: int) -> int:
+        """
+        Create the missing monthly notifications partitions up to `months_ahead`
+        months after the current one, moving in any rows that landed in the
+        notifications_default partition because their month had none.
+
+        Returns:
+            int: The number of partitions created.
+        """
+
+        db = current_app.extensions["db"]
+
+        return db.fetch_one(
+            NotificationQueries.CREATE_NOTIFICATION_PARTITIONS, (months_ahead,)
+        )["created"]
+
+    @staticmethod
+    def retire_notification_partitions(retention_months: int, archive: bool) -> int:
+        """
+        Drop the monthly notifications partitions older than `retention_months`.
+
+        Args:
+            retention_months (int): Full months kept before the current one.
+            archive (bool): Copy the rows to notifications_archive before dropping.
+
+        Returns:
+            int: The number of partitions dropped.
+        """
+
+        db = current_app.extensions["db"]
+
+        return db.fetch_one(
+            NotificationQueries.RETIRE_NOTIFICATION_PARTITIONS,
+            (retention_months, archive),
+        )["retired"]
+
     @staticmethod
     def get_notifications(user_id, params) -> list[dict[str, str]]:
         """
@@ -31,6 +167,7 @@ class NotificationRepository:
         """
 
         db = current_app.extensions["db"]
+        inbox_months = current_app.config.get("NOTIFICATIONS_RETENTION_MONTHS", 12)
 
         offset = (
             0
@@ -42,11 +179,12 @@ class NotificationRepository:
             return db.fetch_all(
                 CommonQueries.GET_MANY.format(
                     table="notifications",
-                    conditions="receiver_id = %s",
+                    conditions="receiver_id = %s AND "
+                    + NotificationQueries.INBOX_WINDOW_CONDITION,
                     sort_field="created_at",
                     sort_order=params["order"],
                 ),
-                (user_id, params["rows_per_page"], offset),
+                (user_id, inbox_months, params["rows_per_page"], offset),
             )
 
         else:
@@ -58,13 +196,175 @@ class NotificationRepository:
             return db.fetch_all(
                 CommonQueries.GET_MANY.format(
                     table="notifications",
-                    conditions="receiver_id = %s AND is_read = %s",
+                    conditions="receiver_id = %s AND is_read = %s AND "
+                    + NotificationQueries.INBOX_WINDOW_CONDITION,
                     sort_field="created_at",
                     sort_order=params["order"],
                 ),
-                (user_id, read_status_bool, params["rows_per_page"], offset),
+                (
+                    user_id,
+                    read_status_bool,
+                    inbox_months,
+                    params["rows_per_page"],
+                    offset,
+                ),
             )
 
+    @staticmethod
+    def get_notifications_page(
+        user_id, params, cursor: tuple[datetime, str] | None
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieve one inbox page with keyset pagination.
+
+        Args:
+            params (dict): limit, read_status, and order ('DESC' or 'ASC').
+            cursor (tuple | None): (created_at, notification_id) of the last row of
+                the previous page, or None for the first page.
+        """
+
+        db = current_app.extensions["db"]
+
+        query_params: dict[str, Any] = {
+            "user_id": user_id,
+            "inbox_months": current_app.config.get(
+                "NOTIFICATIONS_RETENTION_MONTHS", 12
+            ),
+            "limit": params["limit"],
+        }
+
+        is_read_condition = ""
+        if params["read_status"] != "show all":
+            is_read_condition = NotificationQueries.NOTIFICATIONS_PAGE_IS_READ_CONDITION
+            query_params["is_read"] = params["read_status"] == "show only read"
+
+        cursor_condition = ""
+        if cursor is not None:
+            cursor_condition = (
+                NotificationQueries.NOTIFICATIONS_PAGE_CURSOR_CONDITION.format(
+                    comparison="<" if params["order"] == "DESC" else ">"
+                )
+            )
+            (
+                query_params["cursor_created_at"],
+                query_params["cursor_notification_id"],
+            ) = cursor
+
+        return (
+            db.fetch_all(
+                NotificationQueries.GET_NOTIFICATIONS_PAGE.format(
+                    is_read_condition=is_read_condition,
+                    cursor_condition=cursor_condition,
+                    sort_order=params["order"],
+                ),
+                query_params,
+            )
+            or []
+        )
+
+    @staticmethod
+    def get_notification_changes_cursor() -> dict[str, int]:
+        """
+        Read the cursor that a changes sync made now would return.
+
+        Returns:
+            dict: cursor, and pruned_through (cursors up to it are too old to sync).
+        """
+
+        db = current_app.extensions["db"]
+
+        return db.fetch_one(NotificationQueries.GET_NOTIFICATION_CHANGES_CURSOR)
+
+    @staticmethod
+    def get_notification_changes(
+        user_id, since: int, until: int, limit: int
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieve the latest change of each of a user's notifications made by the
+        transactions from cursor `since` up to, but excluding, cursor `until`.
+
+        Returns:
+            list[dict]: change_type, changed_notification_id, and the notification's
+                columns (None if it was deleted), oldest change first.
+        """
+
+        db = current_app.extensions["db"]
+
+        return (
+            db.fetch_all(
+                NotificationQueries.GET_NOTIFICATION_CHANGES,
+                {"user_id": user_id, "since": since, "until": until, "limit": limit},
+            )
+            or []
+        )
+
+    @staticmethod
+    def prune_notification_changes(retention_hours: float) -> int:
+        """
+        Delete the logged notification changes older than `retention_hours`.
+
+        Returns:
+            int: The number of changes deleted.
+        """
+
+        db = current_app.extensions["db"]
+
+        return db.execute_query_returning(
+            NotificationQueries.PRUNE_NOTIFICATION_CHANGES, (retention_hours,)
+        )["pruned"]
+
+    @staticmethod
+    def get_notification_digests(
+        window_seconds: float, delay_seconds: float, max_items: int
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieve the unread notifications due in a digest email, grouped by user.
+
+        Args:
+            window_seconds (float): How far back a first digest looks.
+            delay_seconds (float): How long a notification stays out of digests,
+                so the ones read soon after arriving are not emailed.
+            max_items (int): The most notifications returned per user.
+
+        Returns:
+            list[dict]: The notifications, ordered by receiver_id and newest first,
+                each with the receiver's username, email_address, pending_count,
+                and sent_through.
+        """
+
+        db = current_app.extensions["db"]
+
+        return (
+            db.fetch_all(
+                NotificationQueries.GET_NOTIFICATION_DIGESTS,
+                {
+                    "window_seconds": window_seconds,
+                    "delay_seconds": delay_seconds,
+                    "max_items": max_items,
+                },
+            )
+            or []
+        )
+
+    @staticmethod
+    def mark_notification_digests_sent(
+        sent_through_by_user: dict[str, datetime]
+    ) -> None:
+        """
+        Record that the users were sent a digest of their notifications up to the
+        given creation times.
+        """
+
+        if not sent_through_by_user:
+            return
+
+        db = current_app.extensions["db"]
+
+        db.execute_query(
+            NotificationQueries.MARK_NOTIFICATION_DIGESTS_SENT,
+            (list(sent_through_by_user.keys()), list(sent_through_by_user.values())),
+        )
+
     @staticmethod
     def get_notifications_total_count(user_id, params) -> dict[str, int]:
         """
@@ -72,13 +372,16 @@ class NotificationRepository:
         """
 
         db = current_app.extensions["db"]
+        inbox_months = current_app.config.get("NOTIFICATIONS_RETENTION_MONTHS", 12)
 
         if params["read_status"] == "show all":
             return db.fetch_one(
                 CommonQueries.GET_TOTAL_COUNT_WITH_CONDITIONS.format(
-                    table="notifications", conditions="receiver_id = %s"
+                    table="notifications",
+                    conditions="receiver_id = %s AND "
+                    + NotificationQueries.INBOX_WINDOW_CONDITION,
                 ),
-                (user_id,),
+                (user_id, inbox_months),
             )
 
         else:
@@ -90,9 +393,10 @@ class NotificationRepository:
             return db.fetch_one(
                 CommonQueries.GET_TOTAL_COUNT_WITH_CONDITIONS.format(
                     table="notifications",
-                    conditions="receiver_id = %s AND is_read = %s",
+                    conditions="receiver_id = %s AND is_read = %s AND "
+                    + NotificationQueries.INBOX_WINDOW_CONDITION,
                 ),
-                (user_id, read_status_bool),
+                (user_id, read_status_bool, inbox_months),
             )
 
     @staticmethod
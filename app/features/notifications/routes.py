@@ -26,6 +26,17 @@ def get_notifications_total_count() -> tuple[Response, int]:
     return NotificationControllers.get_notifications_total_count_controller()
 
 
+@notifications_bp.route("/changes", methods=["GET"])
+@jwt_required()
+def get_notification_changes() -> tuple[Response, int]:
+    """
+    Changes to the user's notifications since the `since` cursor, for clients
+    resyncing after a reconnect.
+    """
+
+    return NotificationControllers.get_notification_changes_controller()
+
+
 @notifications_bp.route("/<string:notification_id>/mark-as-read", methods=["PATCH"])
 @jwt_required()
 def mark_notification_as_read(notification_id: str) -> tuple[Response, int]:
@@ -1,46 +1,280 @@
 from .repository import NotificationRepository
 
+import base64
+import binascii
+import json
+import uuid
+
+from datetime import datetime
+
+from typing import Any
+
 from app.common.dataclasses import Notification
 
 from app.utils import convert_notification_dict
 
-from app import socketio
+from app.common.constants import OutboxEventTypeEnum
+
+from app.exceptions.custom_exceptions import InvalidParameterError
+
+from app.services.email_service import EmailService
+from app.services.emit_aggregator import EmitAggregator
+from app.services.outbox import OutboxServices
+from app.services.presence import PresenceRegistry
+
+from psycopg import Connection
 
 
 class NotificationServices:
 
     @staticmethod
     def add_notification_service(
-        sender_user_id, receiver_user_id, notification_type, header, message
+        sender_user_id,
+        receiver_user_id,
+        notification_type,
+        template_id: str,
+        params: dict[str, Any],
+        conn: Connection | None = None,
     ) -> None:
         """
-        add later
+        Queue a notification in the outbox; the outbox worker delivers it.
+
+        Args:
+            template_id (str): One of NotificationTemplates.
+            params (dict): The values of the template's fields, e.g. username and title.
+            conn (Connection | None): Connection of the transaction that causes the
+                notification, so it is only sent if that transaction commits.
         """
 
-        NotificationRepository.add_notification(
-            sender_user_id, receiver_user_id, notification_type, header, message
+        OutboxServices.enqueue(
+            OutboxEventTypeEnum.notification,
+            {
+                "sender_user_id": sender_user_id,
+                "receiver_user_id": receiver_user_id,
+                "notification_type": notification_type,
+                "template_id": template_id,
+                "params": params,
+            },
+            conn,
         )
 
-        unread_notifications_count = (
-            NotificationServices.get_notifications_total_count_service(
-                receiver_user_id, {"read_status": "show only unread"}
-            )
+    @staticmethod
+    def add_notifications_bulk_service(
+        notifications: list[dict[str, Any]], conn: Connection | None = None
+    ) -> None:
+        """
+        Queue many notifications in the outbox as a single event.
+
+        Args:
+            notifications (list[dict]): Each containing the arguments of add_notification_service:
+                sender_user_id, receiver_user_id, notification_type, template_id, and params.
+            conn (Connection | None): Connection of the transaction that causes the notifications.
+        """
+
+        if not notifications:
+            return
+
+        OutboxServices.enqueue(
+            OutboxEventTypeEnum.notifications, {"notifications": notifications}, conn
         )
 
-        socketio.start_background_task(
-            NotificationServices._emit_notification,
-            receiver_user_id,
-            unread_notifications_count,
+    @staticmethod
+    def deliver_notification_service(
+        sender_user_id,
+        receiver_user_id,
+        notification_type,
+        template_id: str | None = None,
+        params: dict[str, Any] | None = None,
+        header: str | None = None,
+        message: str | None = None,
+    ) -> None:
+        """
+        Save a notification and push the new unread count to its receiver.
+        Called by the outbox worker. Events queued before notifications were stored
+        as templates carry header and message instead.
+        """
+
+        NotificationServices.deliver_notifications_bulk_service(
+            [
+                {
+                    "sender_user_id": sender_user_id,
+                    "receiver_user_id": receiver_user_id,
+                    "notification_type": notification_type,
+                    "template_id": template_id,
+                    "params": params,
+                    "header": header,
+                    "message": message,
+                }
+            ]
         )
 
     @staticmethod
-    def _emit_notification(receiver_user_id, count):
-        socketio.emit(
-            "update_unread_notifications_count",
-            {"unreadNotificationsCount": count},
-            room=str(receiver_user_id),
+    def deliver_notifications_bulk_service(notifications: list[dict[str, Any]]) -> None:
+        """
+        Save many notifications at once and push the new unread counts to their receivers.
+        Called by the outbox worker.
+
+        Uses one insert and one lookup of the unread counts, however many notifications
+        there are, and emits one socket event per receiver that is online.
+
+        Args:
+            notifications (list[dict]): Each containing the arguments of add_notification_service:
+                sender_user_id, receiver_user_id, notification_type, template_id, and
+                params (or header and message, in events queued before templates).
+        """
+
+        if not notifications:
+            return
+
+        NotificationRepository.add_notifications_bulk(
+            [
+                {
+                    "template_id": notification.get("template_id"),
+                    "params": notification.get("params"),
+                    "header": notification.get("header"),
+                    "message": notification.get("message"),
+                    "notification_type": notification["notification_type"],
+                    "sender_id": notification["sender_user_id"],
+                    "receiver_id": notification["receiver_user_id"],
+                }
+                for notification in notifications
+            ]
+        )
+
+        # Only receivers with an open connection get a badge update
+        receiver_user_ids = [
+            receiver_user_id
+            for receiver_user_id in {
+                str(notification["receiver_user_id"]) for notification in notifications
+            }
+            if PresenceRegistry.is_online(receiver_user_id)
+        ]
+
+        if not receiver_user_ids:
+            return
+
+        unread_notifications_counts = (
+            NotificationRepository.get_unread_notifications_counts(receiver_user_ids)
+        )
+
+        NotificationServices.emit_unread_notifications_counts_service(
+            {
+                receiver_user_id: unread_notifications_counts.get(receiver_user_id, 0)
+                for receiver_user_id in receiver_user_ids
+            }
         )
 
+    @staticmethod
+    def repair_unread_notifications_counts_service() -> int:
+        """
+        Fix the stored unread counts that drifted from the notifications, and push
+        the corrected counts to their users.
+
+        Returns:
+            int: The number of corrected counts.
+        """
+
+        repaired_counts = NotificationRepository.repair_unread_notifications_counts()
+
+        if repaired_counts:
+            NotificationServices.emit_unread_notifications_counts_service(
+                repaired_counts
+            )
+
+        return len(repaired_counts)
+
+    @staticmethod
+    def send_notification_digests_service(
+        window_seconds: float, delay_seconds: float, max_items: int, batch_size: int
+    ) -> int:
+        """
+        Email each user with new unread notifications one digest of them, instead of
+        one email per notification.
+
+        The digests are sent batch_size at a time, each batch over one SMTP
+        connection. A user's notifications are only marked as digested once their
+        email was sent, so a failed email is retried on the next run.
+
+        Args:
+            window_seconds (float): How far back a first digest looks.
+            delay_seconds (float): How old a notification must be to be included.
+            max_items (int): The most notifications listed per email.
+            batch_size (int): The most emails sent per SMTP connection.
+
+        Returns:
+            int: The number of digests sent.
+        """
+
+        notifications_by_user: dict[str, list[dict]] = {}
+
+        for notification in NotificationRepository.get_notification_digests(
+            window_seconds, delay_seconds, max_items
+        ):
+            notifications_by_user.setdefault(
+                str(notification["receiver_id"]), []
+            ).append(notification)
+
+        user_ids = list(notifications_by_user)
+        sent_count = 0
+
+        for start in range(0, len(user_ids), batch_size):
+            batch_user_ids = user_ids[start : start + batch_size]
+
+            messages = []
+            for user_id in batch_user_ids:
+                notifications = notifications_by_user[user_id]
+
+                messages.append(
+                    EmailService.build_notification_digest_email(
+                        notifications[0]["email_address"],
+                        notifications[0]["username"],
+                        [
+                            convert_notification_dict(notification)
+                            for notification in notifications
+                        ],
+                        notifications[0]["pending_count"],
+                    )
+                )
+
+            sent = EmailService.send_emails(messages)
+
+            NotificationRepository.mark_notification_digests_sent(
+                {
+                    user_id: notifications_by_user[user_id][0]["sent_through"]
+                    for user_id, was_sent in zip(batch_user_ids, sent)
+                    if was_sent
+                }
+            )
+
+            sent_count += sum(sent)
+
+            # Could not connect; leave the rest for the next run
+            if not any(sent):
+                break
+
+        return sent_count
+
+    @staticmethod
+    def emit_unread_notifications_counts_service(
+        counts_by_receiver: dict[str, int],
+    ) -> None:
+        """
+        Push unread notification counts to their users' rooms.
+
+        The emits go through the EmitAggregator, so a burst of updates to one user
+        sends only the latest count.
+
+        Args:
+            counts_by_receiver (dict[str, int]): Unread count keyed by user ID.
+        """
+
+        for receiver_user_id, count in counts_by_receiver.items():
+            EmitAggregator.emit(
+                "update_unread_notifications_count",
+                {"unreadNotificationsCount": count},
+                room=str(receiver_user_id),
+            )
+
     @staticmethod
     def get_notifications_service(user_id, params) -> list[Notification]:
         """
@@ -65,12 +299,152 @@ class NotificationServices:
 
         return notification_dataclasses
 
+    @staticmethod
+    def get_notifications_page_service(
+        user_id, params
+    ) -> tuple[list[Notification], str | None]:
+        """
+        Retrieve one inbox page with keyset pagination, for infinite scroll.
+
+        Args:
+            params (dict): limit, read_status, order, and cursor (the nextCursor of
+                the previous page, or an empty string for the first page).
+
+        Returns:
+            tuple: The notifications, and the cursor of the next page (None on the
+                last page).
+        """
+
+        params["order"] = "ASC" if params["order"] == "show oldest first" else "DESC"
+
+        cursor = (
+            NotificationServices._decode_cursor(params["cursor"])
+            if params["cursor"]
+            else None
+        )
+
+        # One extra row tells whether there is a next page
+        notifications = NotificationRepository.get_notifications_page(
+            user_id, {**params, "limit": params["limit"] + 1}, cursor
+        )
+
+        next_cursor = None
+        if len(notifications) > params["limit"]:
+            notifications = notifications[: params["limit"]]
+            next_cursor = NotificationServices._encode_cursor(notifications[-1])
+
+        return [
+            convert_notification_dict(notification) for notification in notifications
+        ], next_cursor
+
+    @staticmethod
+    def _encode_cursor(notification) -> str:
+        return base64.urlsafe_b64encode(
+            json.dumps(
+                [
+                    notification["created_at"].isoformat(),
+                    str(notification["notification_id"]),
+                ]
+            ).encode()
+        ).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+        try:
+            created_at, notification_id = json.loads(base64.urlsafe_b64decode(cursor))
+            uuid.UUID(notification_id)
+            return datetime.fromisoformat(created_at), notification_id
+        except (binascii.Error, AttributeError, TypeError, ValueError):
+            raise InvalidParameterError(f"Invalid 'cursor' value: '{cursor}'.")
+
+    @staticmethod
+    def get_notification_changes_cursor_service() -> str:
+        """
+        Return the cursor to sync notification changes from, for clients that are
+        about to load their inbox. Read it before the inbox, so no change falls
+        between the two.
+        """
+
+        return str(NotificationRepository.get_notification_changes_cursor()["cursor"])
+
+    @staticmethod
+    def get_notification_changes_service(
+        user_id, since: str, limit: int
+    ) -> tuple[list[dict], str, bool]:
+        """
+        Retrieve the notifications of a user created, read, unread, or deleted since
+        the given cursor, so a reconnecting client can catch up without refetching
+        its inbox.
+
+        Args:
+            since (str): The cursor returned by the previous sync.
+            limit (int): The most changes to return.
+
+        Returns:
+            tuple: The changes (change_type, notification_id, and the notification,
+                or None if deleted), the cursor to sync from next, and whether the
+                client must refetch its inbox instead: the changes since the cursor
+                were pruned, or there are more than `limit` of them.
+        """
+
+        if not since.isdigit():
+            raise InvalidParameterError(f"Invalid 'since' value: '{since}'.")
+
+        since_xact_id = int(since)
+
+        horizon = NotificationRepository.get_notification_changes_cursor()
+        next_cursor = max(since_xact_id, horizon["cursor"])
+
+        if since_xact_id <= horizon["pruned_through"]:
+            return [], str(next_cursor), True
+
+        if since_xact_id >= horizon["cursor"]:
+            return [], str(next_cursor), False
+
+        # One extra row tells whether there are too many changes
+        changes = NotificationRepository.get_notification_changes(
+            user_id, since_xact_id, horizon["cursor"], limit + 1
+        )
+
+        if len(changes) > limit:
+            return [], str(next_cursor), True
+
+        return (
+            [
+                {
+                    "change_type": change["change_type"],
+                    "notification_id": str(change["changed_notification_id"]),
+                    "notification": (
+                        convert_notification_dict(change)
+                        if change["notification_id"] is not None
+                        else None
+                    ),
+                }
+                for change in changes
+            ],
+            str(next_cursor),
+            False,
+        )
+
+    @staticmethod
+    def get_unread_notifications_count_service(user_id) -> int:
+        """
+        Read a user's unread notification count from the maintained counter.
+        """
+
+        return NotificationRepository.get_unread_notifications_counts(
+            [str(user_id)]
+        ).get(str(user_id), 0)
+
     @staticmethod
     def get_notifications_total_count_service(user_id, params) -> int:
         """
         add later
         """
 
+        if params["read_status"] == "show only unread":
+            return NotificationServices.get_unread_notifications_count_service(user_id)
+
         return NotificationRepository.get_notifications_total_count(user_id, params)[
             "count"
         ]
@@ -1,5 +1,6 @@
 from app.db.queries.purchase_queries import PurchasesQueries
 from flask import current_app
+from psycopg import Connection
 from typing import Any
 import logging
 
@@ -9,7 +10,9 @@ logger = logging.getLogger(__name__)
 class PurchasesRepository:
 
     @staticmethod
-    def insert_purchase(purchase_data: dict) -> dict | None:
+    def insert_purchase(
+        purchase_data: dict, conn: Connection | None = None
+    ) -> dict | None:
         """
         Insert a new purchase record into the database with proper defaults.
 
@@ -25,6 +28,7 @@ class PurchasesRepository:
                 - latitude
                 - longitude
                 - meetup_date
+            conn (Connection | None): Connection of the current transaction, if any.
 
         Returns:
             dict: The inserted purchase record with purchase_id if successful, None otherwise.
@@ -45,7 +49,10 @@ class PurchasesRepository:
             purchase_data["meetup_date"],
         )
 
-        result = db.fetch_one(PurchasesQueries.INSERT_PURCHASE, params)
+        if conn is not None:
+            result = conn.execute(PurchasesQueries.INSERT_PURCHASE, params).fetchone()
+        else:
+            result = db.fetch_one(PurchasesQueries.INSERT_PURCHASE, params)
 
         if result:
             purchase_data["purchase_id"] = result["purchase_id"]
@@ -270,13 +277,16 @@ class PurchasesRepository:
         return result
 
     @staticmethod
-    def approve_purchase(purchase_id: str, meetup_time: str) -> dict[str, Any] | None:
+    def approve_purchase(
+        purchase_id: str, meetup_time: str, conn: Connection | None = None
+    ) -> dict[str, Any] | None:
         """
         Approve a purchase and set meetup time.
 
         Args:
             purchase_id (str): The purchase ID to approve.
             meetup_time (str): The meetup time (HH:MM format).
+            conn (Connection | None): Connection of the current transaction, if any.
 
         Returns:
             dict[str, Any] | None: Updated purchase details or None if update failed.
@@ -284,17 +294,23 @@ class PurchasesRepository:
         db = current_app.extensions["db"]
         params = (meetup_time, purchase_id)
 
+        if conn is not None:
+            return conn.execute(PurchasesQueries.APPROVE_PURCHASE, params).fetchone()
+
         result = db.fetch_one(PurchasesQueries.APPROVE_PURCHASE, params)
 
         return result
 
     @staticmethod
-    def delete_purchase(purchase_id: str) -> dict[str, Any] | None:
+    def delete_purchase(
+        purchase_id: str, conn: Connection | None = None
+    ) -> dict[str, Any] | None:
         """
         Delete a purchase entry from purchased_books.
 
         Args:
             purchase_id (str): The purchase ID to delete.
+            conn (Connection | None): Connection of the current transaction, if any.
 
         Returns:
             dict[str, Any] | None: Deleted purchase ID or None if deletion failed.
@@ -302,6 +318,9 @@ class PurchasesRepository:
         db = current_app.extensions["db"]
         params = (purchase_id,)
 
+        if conn is not None:
+            return conn.execute(PurchasesQueries.DELETE_PURCHASE, params).fetchone()
+
         result = db.fetch_one(PurchasesQueries.DELETE_PURCHASE, params)
 
         return result
@@ -318,7 +337,7 @@ class PurchasesRepository:
 
     @staticmethod
     def confirm_pickup(
-        purchase_id: str, is_owner: bool, is_buyer: bool
+        purchase_id: str, is_owner: bool, is_buyer: bool, conn: Connection | None = None
     ) -> dict[str, Any] | None:
         """
         Confirm pickup by owner or buyer.
@@ -336,6 +355,9 @@ class PurchasesRepository:
             purchase_id,
         )
 
+        if conn is not None:
+            return conn.execute(PurchasesQueries.CONFIRM_PICKUP, params).fetchone()
+
         result = db.fetch_one(PurchasesQueries.CONFIRM_PICKUP, params)
         return result
 
@@ -1,7 +1,13 @@
 from .repository import PurchasesRepository
+from app.features.books.services import BookServices
+from app.features.notifications.services import NotificationServices
+from app.features.users.services import UserServices
 from app.features.wallets.repository import WalletRepository
+from app.common.constants import NotificationTemplates
+from flask import current_app
 from typing import Any
 from app.utils import DateUtils
+from app.scheduler import wake_scheduler
 from datetime import datetime
 import logging
 import traceback
@@ -29,13 +35,38 @@ class PurchasesServices:
                 - longitude
                 - meetup_date
 
+        The owner's notification is queued in the outbox in the same transaction as
+        the purchase.
+
         Returns:
             dict: The inserted purchase record if successful, None otherwise.
         """
         try:
-            purchase = PurchasesRepository.insert_purchase(purchase_data)
-            if not purchase:
-                return None
+            book_details = BookServices.get_book_details_service(
+                purchase_data["book_id"]
+            )
+            owner_id = str(book_details["owner_user_id"]) if book_details else None
+            buyer_username = UserServices.get_username_service(purchase_data["user_id"])
+
+            with current_app.extensions["db"].transaction() as conn:
+                purchase = PurchasesRepository.insert_purchase(purchase_data, conn)
+
+                if not purchase:
+                    return None
+
+                NotificationServices.add_notification_service(
+                    purchase_data["user_id"],
+                    owner_id,
+                    "purchase",
+                    NotificationTemplates.PURCHASE_REQUEST,
+                    {
+                        "username": buyer_username,
+                        "title": f"{book_details['title'] if book_details else None}",
+                    },
+                    conn=conn,
+                )
+
+            wake_scheduler()
             return purchase
         except Exception:
             traceback.print_exc()
@@ -461,6 +492,7 @@ class PurchasesServices:
         3. Deduct amount from reserved_amount and balance (buyer)
         4. Add purchase fee to owner's wallet
         5. Create transaction logs for both users
+        6. Approve the purchase and queue the buyer's notification in one transaction
         """
         try:
             if not meetup_time:
@@ -580,13 +612,29 @@ class PurchasesServices:
                     f"Failed to create owner transaction log for purchase {purchase_id}"
                 )
 
-            # Approve the purchase with 12-hour format time
-            result = PurchasesRepository.approve_purchase(
-                purchase_id, meetup_time_12hour
-            )
+            owner_username = UserServices.get_username_service(owner_user_id_str)
 
-            if not result:
-                return None, "Failed to update purchase status", None, None
+            # Approve the purchase with 12-hour format time. The notification is
+            # queued in the outbox in the same transaction.
+            with current_app.extensions["db"].transaction() as conn:
+                result = PurchasesRepository.approve_purchase(
+                    purchase_id, meetup_time_12hour, conn
+                )
+
+                if not result:
+                    return None, "Failed to update purchase status", None, None
+
+                NotificationServices.add_notification_service(
+                    owner_user_id_str,
+                    buyer_user_id_str,
+                    "purchase",
+                    NotificationTemplates.PURCHASE_REQUEST_APPROVED,
+                    {"title": purchase.get("title"), "username": owner_username},
+                    conn=conn,
+                )
+
+            # The meetup may be sooner than anything the scheduler is waiting for
+            wake_scheduler()
 
             logger.info(
                 f"Purchase {purchase_id} approved. "
@@ -610,8 +658,9 @@ class PurchasesServices:
         """
         Reject a purchase request.
         This will:
-        1. Delete the purchase entry from purchased_books
-        2. Deduct the total_cost from the buyer's reserved_amount
+        1. Deduct the total_cost from the buyer's reserved_amount
+        2. Delete the purchase entry from purchased_books and queue the buyer's
+           notification, in one transaction
         """
         try:
             purchase = PurchasesRepository.get_purchase_by_id(purchase_id)
@@ -653,6 +702,24 @@ class PurchasesServices:
                     f"User: {buyer_user_id_str}, Amount: {total_cost}"
                 )
 
+            owner_username = UserServices.get_username_service(rejecter_user_id)
+
+            with current_app.extensions["db"].transaction() as conn:
+                PurchasesRepository.delete_purchase(purchase_id, conn)
+
+                NotificationServices.add_notification_service(
+                    rejecter_user_id,
+                    buyer_user_id_str,
+                    "purchase",
+                    NotificationTemplates.PURCHASE_REQUEST_REJECTED,
+                    {
+                        "title": purchase.get("title"),
+                        "username": owner_username,
+                        "reason": reason,
+                    },
+                    conn=conn,
+                )
+
             logger.info(
                 f"Purchase {purchase_id} rejected by owner {rejecter_user_id}. "
                 f"Reason: {reason}. "
@@ -681,8 +748,9 @@ class PurchasesServices:
         """
         Cancel a purchase request by the buyer.
         This will:
-        1. Delete the purchase entry from purchased_books
-        2. Deduct the total_cost from the buyer's reserved_amount
+        1. Deduct the total_cost from the buyer's reserved_amount
+        2. Delete the purchase entry from purchased_books and queue the owner's
+           notification, in one transaction
         """
         try:
             purchase = PurchasesRepository.get_purchase_by_id(purchase_id)
@@ -718,6 +786,21 @@ class PurchasesServices:
                     f"User: {buyer_user_id_str}, Amount: {total_cost}"
                 )
 
+            owner_id = purchase.get("current_owner_id")
+            buyer_username = UserServices.get_username_service(buyer_user_id_str)
+
+            with current_app.extensions["db"].transaction() as conn:
+                PurchasesRepository.delete_purchase(purchase_id, conn)
+
+                NotificationServices.add_notification_service(
+                    buyer_user_id_str,
+                    str(owner_id) if owner_id else None,
+                    "rent",
+                    NotificationTemplates.PURCHASE_REQUEST_CANCELLED,
+                    {"title": purchase.get("title"), "username": buyer_username},
+                    conn=conn,
+                )
+
             logger.info(
                 f"Purchase {purchase_id} cancelled by buyer {canceller_user_id}. "
                 f"Released {total_cost} from reserved_amount for user {buyer_user_id_str}. "
@@ -740,6 +823,7 @@ class PurchasesServices:
         """
         Confirm book pickup by either the buyer or owner.
         When both confirm, move to 'completed' status.
+        The notifications are queued in the same transaction as the confirmation.
         """
         try:
             purchase = PurchasesRepository.get_purchase_by_id_full(purchase_id)
@@ -780,11 +864,72 @@ class PurchasesServices:
             if is_buyer and user_confirmed:
                 return None, "You have already confirmed pickup", None, None
 
+            owner_id_str = str(original_owner_id)
+            buyer_id_str = str(buyer_user_id)
+            owner_username = UserServices.get_username_service(owner_id_str)
+            buyer_username = UserServices.get_username_service(buyer_id_str)
+
             # Confirm pickup
-            result = PurchasesRepository.confirm_pickup(purchase_id, is_owner, is_buyer)
+            with current_app.extensions["db"].transaction() as conn:
+                result = PurchasesRepository.confirm_pickup(
+                    purchase_id, is_owner, is_buyer, conn
+                )
 
-            if not result:
-                return None, "Failed to confirm pickup", None, None
+                if not result:
+                    return None, "Failed to confirm pickup", None, None
+
+                # Until both have confirmed, ask the other party to confirm; then
+                # tell both that the purchase is completed
+                if (
+                    result["owner_confirmed_pickup"]
+                    and not result["user_confirmed_pickup"]
+                ):
+                    NotificationServices.add_notification_service(
+                        owner_id_str,
+                        buyer_id_str,
+                        "rent",
+                        NotificationTemplates.PURCHASE_CONFIRM_BOOK_PICKUP_BUYER,
+                        {"username": owner_username, "title": purchase.get("title")},
+                        conn=conn,
+                    )
+                elif (
+                    not result["owner_confirmed_pickup"]
+                    and result["user_confirmed_pickup"]
+                ):
+                    NotificationServices.add_notification_service(
+                        buyer_id_str,
+                        owner_id_str,
+                        "rent",
+                        NotificationTemplates.PURCHASE_CONFIRM_BOOK_PICKUP_OWNER,
+                        {"username": buyer_username, "title": purchase.get("title")},
+                        conn=conn,
+                    )
+                else:
+                    NotificationServices.add_notifications_bulk_service(
+                        [
+                            {
+                                "sender_user_id": owner_id_str,
+                                "receiver_user_id": buyer_id_str,
+                                "notification_type": "rent",
+                                "template_id": NotificationTemplates.PURCHASE_COMPLETED_BUYER,
+                                "params": {
+                                    "title": purchase.get("title"),
+                                    "username": owner_username,
+                                },
+                            },
+                            {
+                                "sender_user_id": buyer_id_str,
+                                "receiver_user_id": owner_id_str,
+                                "notification_type": "rent",
+                                "template_id": NotificationTemplates.PURCHASE_COMPLETED_OWNER,
+                                "params": {
+                                    "title": purchase.get("title"),
+                                    "username": buyer_username,
+                                },
+                            },
+                        ],
+                        conn=conn,
+                    )
 
             logger.info(
                 f"Pickup confirmed for purchase {purchase_id} by "
@@ -5,16 +5,6 @@ import datetime
 
 from .services import RentalsServices
 
-from .repository import RentalsRepository
-
-from ..notifications.services import NotificationServices
-
-from ..books.services import BookServices
-
-from ..users.services import UserServices
-
-from app.common.constants import NotificationMessages
-
 from app.exceptions.custom_exceptions import EntityNotFoundError
 
 
@@ -126,26 +116,6 @@ class RentalsController:
                 }
             )
 
-            book_details = BookServices.get_book_details_service(rental_data["book_id"])
-
-            owner_id = str(book_details["owner_user_id"]) if book_details else None
-
-            renter_username = UserServices.get_username_service(current_user_id)
-
-            notification_header = NotificationMessages.RENTAL_REQUEST_HEADER
-            notification_message = NotificationMessages.RENTAL_REQUEST_MESSAGE.format(
-                username=renter_username,
-                title=f"{book_details['title'] if book_details else None}",
-            )
-
-            NotificationServices.add_notification_service(
-                current_user_id,
-                owner_id,
-                "rent",
-                notification_header,
-                notification_message,
-            )
-
             return resp, 201
 
         except Exception as e:
@@ -357,26 +327,6 @@ class RentalsController:
             if not book_id:
                 raise EntityNotFoundError(f"Book {book_id} does not exist.")
 
-            book_details = BookServices.get_book_details_service(book_id)
-
-            owner_username = UserServices.get_username_service(user_id)
-
-            notification_header = NotificationMessages.RENTAL_REQUEST_APPROVED_HEADER
-            notification_message = (
-                NotificationMessages.RENTAL_REQUEST_APPROVED_MESSAGE.format(
-                    title=f"{book_details['title'] if book_details else None}",
-                    username=owner_username,
-                )
-            )
-
-            NotificationServices.add_notification_service(
-                user_id,
-                renter_id,
-                "rent",
-                notification_header,
-                notification_message,
-            )
-
             return (
                 jsonify(
                     {
@@ -417,35 +367,6 @@ class RentalsController:
             if error:
                 return jsonify({"error": error}), 400
 
-            book_id = RentalsRepository.get_book_id_from_rental(rental_id)
-
-            if not book_id:
-                raise EntityNotFoundError(f"Book {book_id} does not exist.")
-
-            book_details = BookServices.get_book_details_service(book_id)
-
-            owner_username = UserServices.get_username_service(user_id)
-
-            notification_header = NotificationMessages.RENTAL_REQUEST_REJECTED_HEADER
-            notification_message = (
-                NotificationMessages.RENTAL_REQUEST_REJECTED_MESSAGE.format(
-                    title=f"{book_details['title'] if book_details else None}",
-                    username=owner_username,
-                    reason=reason,
-                )
-            )
-
-            # Delete the rental entry before sending the notification
-            RentalsRepository.delete_rental(rental_id)
-
-            NotificationServices.add_notification_service(
-                user_id,
-                renter_id,
-                "rent",
-                notification_header,
-                notification_message,
-            )
-
             return (
                 jsonify(
                     {
@@ -475,36 +396,6 @@ class RentalsController:
             if error:
                 return jsonify({"error": error}), 400
 
-            book_id = RentalsRepository.get_book_id_from_rental(rental_id)
-
-            if not book_id:
-                raise EntityNotFoundError(f"Book {book_id} does not exist.")
-
-            book_details = BookServices.get_book_details_service(book_id)
-
-            owner_id = str(book_details["owner_user_id"]) if book_details else None
-
-            renter_username = UserServices.get_username_service(user_id)
-
-            notification_header = NotificationMessages.RENTAL_REQUEST_CANCELLED_HEADER
-            notification_message = (
-                NotificationMessages.RENTAL_REQUEST_CANCELLED_MESSAGE.format(
-                    title=f"{book_details['title'] if book_details else None}",
-                    username=renter_username,
-                )
-            )
-
-            # Delete the rental entry before sending the notification
-            RentalsRepository.delete_rental(rental_id)
-
-            NotificationServices.add_notification_service(
-                user_id,
-                owner_id,
-                "rent",
-                notification_header,
-                notification_message,
-            )
-
             return (
                 jsonify(
                     {
@@ -540,71 +431,6 @@ class RentalsController:
             if error:
                 return jsonify({"error": error}), 400
 
-            book_id = RentalsRepository.get_book_id_from_rental(rental_id)
-
-            if not book_id:
-                raise EntityNotFoundError(f"Book {book_id} does not exist.")
-
-            book_details = BookServices.get_book_details_service(book_id)
-
-            owner_username = UserServices.get_username_service(owner_id)
-            renter_username = UserServices.get_username_service(renter_id)
-
-            # If both result["owner_confirmed_pickup"] and result["user_confirmed_pickup"] are both True,
-            # emit RENTAL_STARTED notification,
-            # otherwise emit CONFIRM_BOOK_PICKUP notification
-
-            if result["owner_confirmed_pickup"] and not result["user_confirmed_pickup"]:
-                notification_header = (
-                    NotificationMessages.RENTAL_CONFIRM_BOOK_PICKUP_HEADER
-                )
-                notification_message = NotificationMessages.RENTAL_CONFIRM_BOOK_PICKUP_RENTER_MESSAGE.format(
-                    username=owner_username,
-                    title=f"{book_details['title'] if book_details else None}",
-                )
-
-                NotificationServices.add_notification_service(
-                    owner_id,
-                    renter_id,
-                    "rent",
-                    notification_header,
-                    notification_message,
-                )
-            elif (
-                not result["owner_confirmed_pickup"] and result["user_confirmed_pickup"]
-            ):
-                notification_header = (
-                    NotificationMessages.RENTAL_CONFIRM_BOOK_PICKUP_HEADER
-                )
-                notification_message = NotificationMessages.RENTAL_CONFIRM_BOOK_PICKUP_OWNER_MESSAGE.format(
-                    username=renter_username,
-                    title=f"{book_details['title'] if book_details else None}",
-                )
-
-                NotificationServices.add_notification_service(
-                    renter_id,
-                    owner_id,
-                    "rent",
-                    notification_header,
-                    notification_message,
-                )
-            else:
-                notification_header = NotificationMessages.RENTAL_STARTED_HEADER
-                notification_message = (
-                    NotificationMessages.RENTAL_STARTED_MESSAGE.format(
-                        username=owner_username,
-                        title=f"{book_details['title'] if book_details else None}",
-                    )
-                )
-
-                NotificationServices.add_notification_service(
-                    owner_id,
-                    renter_id,
-                    "rent",
-                    notification_header,
-                    notification_message,
-                )
-
             return (
                 jsonify(
                     {
@@ -641,86 +467,6 @@ class RentalsController:
             if error:
                 return jsonify({"error": error}), 400
 
-            book_id = RentalsRepository.get_book_id_from_rental(rental_id)
-
-            if not book_id:
-                raise EntityNotFoundError(f"Book {book_id} does not exist.")
-
-            book_details = BookServices.get_book_details_service(book_id)
-
-            owner_username = UserServices.get_username_service(owner_id)
-            renter_username = UserServices.get_username_service(renter_id)
-
-            # If both result["owner_confirmed_return"] and result["user_confirmed_return"] are both True,
-            # emit RENTAL_COMPLETED notification,
-            # otherwise emit CONFIRM_BOOK_RETURN notification
-
-            if result["owner_confirmed_return"] and not result["user_confirmed_return"]:
-                notification_header = (
-                    NotificationMessages.RENTAL_RETURN_VERIFICATION_NEEDED_HEADER
-                )
-                notification_message = NotificationMessages.RENTAL_RETURN_VERIFICATION_NEEDED_RENTER_MESSAGE.format(
-                    username=owner_username,
-                    title=f"{book_details['title'] if book_details else None}",
-                )
-
-                NotificationServices.add_notification_service(
-                    owner_id,
-                    renter_id,
-                    "rent",
-                    notification_header,
-                    notification_message,
-                )
-            elif (
-                not result["owner_confirmed_return"] and result["user_confirmed_return"]
-            ):
-                notification_header = (
-                    NotificationMessages.RENTAL_RETURN_VERIFICATION_NEEDED_HEADER
-                )
-                notification_message = NotificationMessages.RENTAL_RETURN_VERIFICATION_NEEDED_OWNER_MESSAGE.format(
-                    username=renter_username,
-                    title=f"{book_details['title'] if book_details else None}",
-                )
-
-                NotificationServices.add_notification_service(
-                    renter_id,
-                    owner_id,
-                    "rent",
-                    notification_header,
-                    notification_message,
-                )
-            else:
-                notification_header = NotificationMessages.RENTAL_COMPLETED_HEADER
-                notification_message_renter = (
-                    NotificationMessages.RETURN_COMPLETED_RENTER_MESSAGE.format(
-                        title=f"{book_details['title'] if book_details else None}",
-                        username=owner_username,
-                    )
-                )
-
-                notification_message_owner = (
-                    NotificationMessages.RETURN_COMPLETED_OWNER_MESSAGE.format(
-                        title=f"{book_details['title'] if book_details else None}",
-                        username=renter_username,
-                    )
-                )
-
-                NotificationServices.add_notification_service(
-                    owner_id,
-                    renter_id,
-                    "rent",
-                    notification_header,
-                    notification_message_renter,
-                )
-
-                NotificationServices.add_notification_service(
-                    renter_id,
-                    owner_id,
-                    "rent",
-                    notification_header,
-                    notification_message_owner,
-                )
-
             return (
                 jsonify(
                     {
@@ -1,5 +1,6 @@
 from app.db.queries.rental_queries import RentalsQueries
 from flask import current_app
+from psycopg import Connection
 from typing import Any
 import logging
 
@@ -212,13 +213,16 @@ class RentalsRepository:
         return result
 
     @staticmethod
-    def approve_rental(rental_id: str, meetup_time: str) -> dict[str, Any] | None:
+    def approve_rental(
+        rental_id: str, meetup_time: str, conn: Connection | None = None
+    ) -> dict[str, Any] | None:
         """
         Approve a rental and set meetup time.
 
         Args:
             rental_id (str): The rental ID to approve.
             meetup_time (str): The meetup time (HH:MM format).
+            conn (Connection | None): Connection of the current transaction, if any.
 
         Returns:
             dict[str, Any] | None: Updated rental details or None if update failed.
@@ -226,17 +230,23 @@ class RentalsRepository:
         db = current_app.extensions["db"]
         params = (meetup_time, rental_id)
 
+        if conn is not None:
+            return conn.execute(RentalsQueries.APPROVE_RENTAL, params).fetchone()
+
         result = db.fetch_one(RentalsQueries.APPROVE_RENTAL, params)
 
         return result
 
     @staticmethod
-    def delete_rental(rental_id: str) -> dict[str, Any] | None:
+    def delete_rental(
+        rental_id: str, conn: Connection | None = None
+    ) -> dict[str, Any] | None:
         """
         Delete a rental entry from rented_books.
 
         Args:
             rental_id (str): The rental ID to delete.
+            conn (Connection | None): Connection of the current transaction, if any.
 
         Returns:
             dict[str, Any] | None: Deleted rental ID or None if deletion failed.
@@ -244,12 +254,15 @@ class RentalsRepository:
         db = current_app.extensions["db"]
         params = (rental_id,)
 
+        if conn is not None:
+            return conn.execute(RentalsQueries.DELETE_RENTAL, params).fetchone()
+
         result = db.fetch_one(RentalsQueries.DELETE_RENTAL, params)
 
         return result
 
     @staticmethod
-    def insert_rental(rental_data: dict) -> dict | None:
+    def insert_rental(rental_data: dict, conn: Connection | None = None) -> dict | None:
         """
         Insert a new rental record into the database with proper defaults.
 
@@ -269,16 +282,22 @@ class RentalsRepository:
                 - meetup_date
                 - actual_rate
                 - actual_deposit
+            conn (Connection | None): Connection of the current transaction, if any.
 
         Returns:
             str: The rental_id of the inserted rental, or None if insertion failed.
         """
         db = current_app.extensions["db"]
 
-        book_duration = db.fetch_one(
-            "SELECT rental_duration FROM books WHERE book_id = %s",
-            (rental_data["book_id"],),
-        )
+        book_duration_query = "SELECT rental_duration FROM books WHERE book_id = %s"
+        book_duration_params = (rental_data["book_id"],)
+
+        if conn is not None:
+            book_duration = conn.execute(
+                book_duration_query, book_duration_params
+            ).fetchone()
+        else:
+            book_duration = db.fetch_one(book_duration_query, book_duration_params)
 
         if not book_duration:
             return None
@@ -302,7 +321,10 @@ class RentalsRepository:
             rental_data["actual_deposit"],
         )
 
-        result = db.fetch_one(RentalsQueries.INSERT_RENTAL, params)
+        if conn is not None:
+            result = conn.execute(RentalsQueries.INSERT_RENTAL, params).fetchone()
+        else:
+            result = db.fetch_one(RentalsQueries.INSERT_RENTAL, params)
 
         if result:
             rental_data["rental_id"] = result["rental_id"]
@@ -335,7 +357,11 @@ class RentalsRepository:
 
     @staticmethod
     def confirm_pickup(
-        rental_id: str, is_owner: bool, is_renter: bool, rental_duration: int
+        rental_id: str,
+        is_owner: bool,
+        is_renter: bool,
+        rental_duration: int,
+        conn: Connection | None = None,
     ) -> dict[str, Any] | None:
         """
         Confirm pickup by owner or renter.
@@ -356,6 +382,9 @@ class RentalsRepository:
             rental_id,
         )
 
+        if conn is not None:
+            return conn.execute(RentalsQueries.CONFIRM_PICKUP, params).fetchone()
+
         result = db.fetch_one(RentalsQueries.CONFIRM_PICKUP, params)
         return result
 
@@ -371,7 +400,7 @@ class RentalsRepository:
 
     @staticmethod
     def confirm_return(
-        rental_id: str, is_owner: bool, is_renter: bool
+        rental_id: str, is_owner: bool, is_renter: bool, conn: Connection | None = None
     ) -> dict[str, Any] | None:
         """
         Confirm return by owner or renter.
@@ -387,6 +416,9 @@ class RentalsRepository:
             rental_id,
         )
 
+        if conn is not None:
+            return conn.execute(RentalsQueries.CONFIRM_RETURN, params).fetchone()
+
         result = db.fetch_one(RentalsQueries.CONFIRM_RETURN, params)
         return result
 
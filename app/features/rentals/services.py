@@ -1,7 +1,13 @@
 from .repository import RentalsRepository
+from app.features.books.services import BookServices
+from app.features.notifications.services import NotificationServices
+from app.features.users.services import UserServices
 from app.features.wallets.repository import WalletRepository
+from app.common.constants import NotificationTemplates
+from flask import current_app
 from typing import Any
 from app.utils import DateUtils
+from app.scheduler import wake_scheduler
 from datetime import datetime
 import logging
 import traceback
@@ -503,6 +509,7 @@ class RentalsServices:
         3. Deduct amount from reserved_amount and balance (renter)
         4. Add rental fee to owner's wallet
         5. Create transaction logs for both users
+        6. Approve the rental and queue the renter's notification in one transaction
         """
         try:
             if not meetup_time:
@@ -621,11 +628,29 @@ class RentalsServices:
                     f"Failed to create owner transaction log for rental {rental_id}"
                 )
 
-            # Approve the rental with 12-hour format time
-            result = RentalsRepository.approve_rental(rental_id, meetup_time_12hour)
+            owner_username = UserServices.get_username_service(owner_user_id_str)
 
-            if not result:
-                return None, "Failed to update rental status", None, None
+            # Approve the rental with 12-hour format time. The notification is queued
+            # in the outbox in the same transaction.
+            with current_app.extensions["db"].transaction() as conn:
+                result = RentalsRepository.approve_rental(
+                    rental_id, meetup_time_12hour, conn
+                )
+
+                if not result:
+                    return None, "Failed to update rental status", None, None
+
+                NotificationServices.add_notification_service(
+                    owner_user_id_str,
+                    renter_user_id_str,
+                    "rent",
+                    NotificationTemplates.RENTAL_REQUEST_APPROVED,
+                    {"title": rental.get("title"), "username": owner_username},
+                    conn=conn,
+                )
+
+            # The meetup may be sooner than anything the scheduler is waiting for
+            wake_scheduler()
 
             logger.info(
                 f"Rental {rental_id} approved. "
@@ -649,8 +674,9 @@ class RentalsServices:
         """
         Reject a rental request.
         This will:
-        1. Delete the rental entry from rented_books
-        2. Deduct the total_cost from the renter's reserved_amount
+        1. Deduct the total_cost from the renter's reserved_amount
+        2. Delete the rental entry from rented_books and queue the renter's
+           notification, in one transaction
         """
         try:
             rental = RentalsRepository.get_rental_by_id(rental_id)
@@ -693,6 +719,24 @@ class RentalsServices:
                 )
                 # Continue with deletion even if wallet update fails
 
+            owner_username = UserServices.get_username_service(rejecter_user_id)
+
+            with current_app.extensions["db"].transaction() as conn:
+                RentalsRepository.delete_rental(rental_id, conn)
+
+                NotificationServices.add_notification_service(
+                    rejecter_user_id,
+                    renter_user_id_str,
+                    "rent",
+                    NotificationTemplates.RENTAL_REQUEST_REJECTED,
+                    {
+                        "title": rental.get("title"),
+                        "username": owner_username,
+                        "reason": reason,
+                    },
+                    conn=conn,
+                )
+
             logger.info(
                 f"Rental {rental_id} rejected by owner {rejecter_user_id}. "
                 f"Reason: {reason}. "
@@ -721,8 +765,9 @@ class RentalsServices:
         """
         Cancel a rental request by the renter.
         This will:
-        1. Delete the rental entry from rented_books
-        2. Deduct the total_cost from the renter's reserved_amount
+        1. Deduct the total_cost from the renter's reserved_amount
+        2. Delete the rental entry from rented_books and queue the owner's
+           notification, in one transaction
         """
         try:
             rental = RentalsRepository.get_rental_by_id(rental_id)
@@ -759,6 +804,21 @@ class RentalsServices:
                 )
                 # Continue with deletion even if wallet update fails
 
+            owner_id = rental.get("owner_id")
+            renter_username = UserServices.get_username_service(renter_user_id_str)
+
+            with current_app.extensions["db"].transaction() as conn:
+                RentalsRepository.delete_rental(rental_id, conn)
+
+                NotificationServices.add_notification_service(
+                    renter_user_id_str,
+                    str(owner_id) if owner_id else None,
+                    "rent",
+                    NotificationTemplates.RENTAL_REQUEST_CANCELLED,
+                    {"title": rental.get("title"), "username": renter_username},
+                    conn=conn,
+                )
+
             logger.info(
                 f"Rental {rental_id} cancelled by renter {canceller_user_id}. "
                 f"Released {total_cost} from reserved_amount for user {renter_user_id_str}. "
@@ -794,13 +854,36 @@ class RentalsServices:
             - meetup_date
             - original_user_id
 
+        The owner's notification is queued in the outbox in the same transaction as
+        the rental.
+
         Returns:
             dict: The inserted rental record if successful, None otherwise.
         """
         try:
-            rental = RentalsRepository.insert_rental(rental_data)
-            if not rental:
-                return None
+            book_details = BookServices.get_book_details_service(rental_data["book_id"])
+            owner_id = str(book_details["owner_user_id"]) if book_details else None
+            renter_username = UserServices.get_username_service(rental_data["user_id"])
+
+            with current_app.extensions["db"].transaction() as conn:
+                rental = RentalsRepository.insert_rental(rental_data, conn)
+
+                if not rental:
+                    return None
+
+                NotificationServices.add_notification_service(
+                    rental_data["user_id"],
+                    owner_id,
+                    "rent",
+                    NotificationTemplates.RENTAL_REQUEST,
+                    {
+                        "username": renter_username,
+                        "title": f"{book_details['title'] if book_details else None}",
+                    },
+                    conn=conn,
+                )
+
+            wake_scheduler()
             return rental
         except Exception:
             traceback.print_exc()
@@ -827,6 +910,7 @@ class RentalsServices:
         """
         Confirm book pickup by either the renter or owner.
         When both confirm, move to 'ongoing' status and set rent_start_date.
+        The other party's notification is queued in the same transaction.
         """
         try:
             rental = RentalsRepository.get_rental_by_id_full(rental_id)
@@ -868,13 +952,58 @@ class RentalsServices:
             if is_renter and user_confirmed:
                 return None, "You have already confirmed pickup", None, None
 
+            owner_id_str = str(owner_id)
+            renter_id_str = str(renter_user_id)
+            owner_username = UserServices.get_username_service(owner_id_str)
+            renter_username = UserServices.get_username_service(renter_id_str)
+
             # Confirm pickup
-            result = RentalsRepository.confirm_pickup(
-                rental_id, is_owner, is_renter, rental_duration
-            )
+            with current_app.extensions["db"].transaction() as conn:
+                result = RentalsRepository.confirm_pickup(
+                    rental_id, is_owner, is_renter, rental_duration, conn
+                )
 
-            if not result:
-                return None, "Failed to confirm pickup", None, None
+                if not result:
+                    return None, "Failed to confirm pickup", None, None
+
+                # Until both have confirmed, ask the other party to confirm;
+                # then tell the renter the rental started
+                if (
+                    result["owner_confirmed_pickup"]
+                    and not result["user_confirmed_pickup"]
+                ):
+                    NotificationServices.add_notification_service(
+                        owner_id_str,
+                        renter_id_str,
+                        "rent",
+                        NotificationTemplates.RENTAL_CONFIRM_BOOK_PICKUP_RENTER,
+                        {"username": owner_username, "title": rental.get("title")},
+                        conn=conn,
+                    )
+                elif (
+                    not result["owner_confirmed_pickup"]
+                    and result["user_confirmed_pickup"]
+                ):
+                    NotificationServices.add_notification_service(
+                        renter_id_str,
+                        owner_id_str,
+                        "rent",
+                        NotificationTemplates.RENTAL_CONFIRM_BOOK_PICKUP_OWNER,
+                        {"username": renter_username, "title": rental.get("title")},
+                        conn=conn,
+                    )
+                else:
+                    NotificationServices.add_notification_service(
+                        owner_id_str,
+                        renter_id_str,
+                        "rent",
+                        NotificationTemplates.RENTAL_STARTED,
+                        {"username": owner_username, "title": rental.get("title")},
+                        conn=conn,
+                    )
+
+            # Once both sides confirm, the rental is ongoing and its return becomes due
+            wake_scheduler()
 
             logger.info(
                 f"Pickup confirmed for rental {rental_id} by "
@@ -894,6 +1023,7 @@ class RentalsServices:
         """
         Confirm book return by either the renter or owner.
         When both confirm, move to 'completed' status and return security deposit.
+        The notifications are queued in the same transaction as the confirmation.
         """
         try:
             rental = RentalsRepository.get_rental_by_id_full_return(rental_id)
@@ -934,11 +1064,72 @@ class RentalsServices:
             if is_renter and user_confirmed:
                 return None, "You have already confirmed return", None, None
 
+            owner_id_str = str(owner_id)
+            renter_id_str = str(renter_user_id)
+            owner_username = UserServices.get_username_service(owner_id_str)
+            renter_username = UserServices.get_username_service(renter_id_str)
+
             # Confirm return
-            result = RentalsRepository.confirm_return(rental_id, is_owner, is_renter)
+            with current_app.extensions["db"].transaction() as conn:
+                result = RentalsRepository.confirm_return(
+                    rental_id, is_owner, is_renter, conn
+                )
 
-            if not result:
-                return None, "Failed to confirm return", None, None
+                if not result:
+                    return None, "Failed to confirm return", None, None
+
+                # Until both have confirmed, ask the other party to verify the
+                # return; then tell both that the rental is completed
+                if (
+                    result["owner_confirmed_return"]
+                    and not result["user_confirmed_return"]
+                ):
+                    NotificationServices.add_notification_service(
+                        owner_id_str,
+                        renter_id_str,
+                        "rent",
+                        NotificationTemplates.RENTAL_RETURN_VERIFICATION_NEEDED_RENTER,
+                        {"username": owner_username, "title": rental.get("title")},
+                        conn=conn,
+                    )
+                elif (
+                    not result["owner_confirmed_return"]
+                    and result["user_confirmed_return"]
+                ):
+                    NotificationServices.add_notification_service(
+                        renter_id_str,
+                        owner_id_str,
+                        "rent",
+                        NotificationTemplates.RENTAL_RETURN_VERIFICATION_NEEDED_OWNER,
+                        {"username": renter_username, "title": rental.get("title")},
+                        conn=conn,
+                    )
+                else:
+                    NotificationServices.add_notifications_bulk_service(
+                        [
+                            {
+                                "sender_user_id": owner_id_str,
+                                "receiver_user_id": renter_id_str,
+                                "notification_type": "rent",
+                                "template_id": NotificationTemplates.RENTAL_COMPLETED_RENTER,
+                                "params": {
+                                    "title": rental.get("title"),
+                                    "username": owner_username,
+                                },
+                            },
+                            {
+                                "sender_user_id": renter_id_str,
+                                "receiver_user_id": owner_id_str,
+                                "notification_type": "rent",
+                                "template_id": NotificationTemplates.RENTAL_COMPLETED_OWNER,
+                                "params": {
+                                    "title": rental.get("title"),
+                                    "username": renter_username,
+                                },
+                            },
+                        ],
+                        conn=conn,
+                    )
 
             # Check if both users have now confirmed (status changed to 'rate_user')
             new_status = result.get("rent_status")
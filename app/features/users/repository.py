@@ -1,5 +1,7 @@
 from app.db.queries.common import CommonQueries
 from app.db.queries.user_queries import UserQueries
+from app.common.constants import OutboxEventTypeEnum
+from app.services.outbox import OutboxServices
 from flask import current_app
 from werkzeug.security import generate_password_hash
 from datetime import datetime
@@ -113,21 +115,35 @@ class UserRepository:
         )
 
     @staticmethod
-    def create_verification_code(user_id: str, code: str, expires_at: datetime) -> bool:
-        """Store email verification code in database."""
+    def create_verification_code(
+        user_id: str, code: str, expires_at: datetime, email_address: str, username: str
+    ) -> bool:
+        """Store email verification code and queue its email, in one transaction."""
         db = current_app.extensions["db"]
         try:
-            # Delete old codes for this user first
-            db.execute_query(
-                "DELETE FROM email_verifications WHERE user_id = %s",
-                (user_id,),
-            )
-            # Insert new code
-            db.execute_query(
-                "INSERT INTO email_verifications "
-                "(user_id, code, expires_at) VALUES (%s, %s, %s)",
-                (user_id, code, expires_at),
-            )
+            with db.transaction() as conn:
+                # Delete old codes for this user first
+                conn.execute(
+                    "DELETE FROM email_verifications WHERE user_id = %s",
+                    (user_id,),
+                )
+                # Insert new code
+                conn.execute(
+                    "INSERT INTO email_verifications "
+                    "(user_id, code, expires_at) VALUES (%s, %s, %s)",
+                    (user_id, code, expires_at),
+                )
+                # Sent by the outbox worker once the code is committed
+                OutboxServices.enqueue(
+                    OutboxEventTypeEnum.email,
+                    {
+                        "template": "verification",
+                        "to_email": email_address,
+                        "code": code,
+                        "username": username,
+                    },
+                    conn,
+                )
             return True
 
         except Exception:
@@ -342,29 +358,43 @@ class UserRepository:
 
     @staticmethod
     def create_password_reset_code(
-        user_id: str, code: str, expires_at: datetime
+        user_id: str, code: str, expires_at: datetime, email_address: str, username: str
     ) -> bool:
-        """Store password reset code in database."""
+        """Store password reset code and queue its email, in one transaction."""
         db = current_app.extensions["db"]
         try:
-            print(f"[REPOSITORY] Deleting old password reset codes for user: {user_id}")
-            # Delete old codes for this user first
-            db.execute_query(
-                "DELETE FROM password_reset_codes WHERE user_id = %s",
-                (user_id,),
-            )
-            print("[REPOSITORY] Old codes deleted")
+            with db.transaction() as conn:
+                print(
+                    f"[REPOSITORY] Deleting old password reset codes for user: {user_id}"
+                )
+                # Delete old codes for this user first
+                conn.execute(
+                    "DELETE FROM password_reset_codes WHERE user_id = %s",
+                    (user_id,),
+                )
+                print("[REPOSITORY] Old codes deleted")
 
-            print(
-                f"[REPOSITORY] Inserting new password reset code: {code}, "
-                f"expires at: {expires_at}"
-            )
-            # Insert new code
-            db.execute_query(
-                "INSERT INTO password_reset_codes "
-                "(user_id, code, expires_at) VALUES (%s, %s, %s)",
-                (user_id, code, expires_at),
-            )
+                print(
+                    f"[REPOSITORY] Inserting new password reset code: {code}, "
+                    f"expires at: {expires_at}"
+                )
+                # Insert new code
+                conn.execute(
+                    "INSERT INTO password_reset_codes "
+                    "(user_id, code, expires_at) VALUES (%s, %s, %s)",
+                    (user_id, code, expires_at),
+                )
+                # Sent by the outbox worker once the code is committed
+                OutboxServices.enqueue(
+                    OutboxEventTypeEnum.email,
+                    {
+                        "template": "password_reset",
+                        "to_email": email_address,
+                        "code": code,
+                        "username": username,
+                    },
+                    conn,
+                )
             print("[REPOSITORY] New password reset code inserted successfully")
             return True
 
@@ -4,7 +4,6 @@ from app.common.dataclasses import User
 from app.utils import convert_user_dict
 import random
 from datetime import datetime, timedelta, timezone
-from app.services.email_service import EmailService
 from app.utils.password_validator import PasswordValidator
 from app.exceptions.custom_exceptions import (
     EmailInUseByGoogleError,
@@ -98,22 +97,21 @@ class UserServices:
             expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
 
             # Store code in database (old codes are deleted automatically)
-            success = UserRepository.create_verification_code(user_id, code, expires_at)
+            # The email is queued in the outbox in the same transaction as the code
+            success = UserRepository.create_verification_code(
+                user_id,
+                code,
+                expires_at,
+                user_data["email_address"],
+                user_data["username"],
+            )
 
             if not success:
                 return {"error": "Failed to create verification code."}
 
-            email_sent = EmailService.send_verification_email(
-                user_data["email_address"], code, user_data["username"]
-            )
-
-            if not email_sent:
-
-                return {"error": "Failed to send verification email."}
-
             return {
                 "success": True,
-                "message": "Verification email sent successfully.",
+                "message": "Verification email queued. It will arrive shortly.",
             }
 
         except Exception:
@@ -346,25 +344,16 @@ class UserServices:
             expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
             print(f"[PASSWORD RESET SERVICE] Code expires at: {expires_at}")
 
-            # Store code in database
+            # Store code in database; the email is queued in the same transaction
             success = UserRepository.create_password_reset_code(
-                user_id, code, expires_at
+                user_id, code, expires_at, email_address, username
             )
 
             if not success:
                 print("[PASSWORD RESET SERVICE] Failed to store reset code in database")
                 return {"error": "Failed to create password reset code."}
 
-            # Send email with reset code
-            email_sent = EmailService.send_password_reset_email(
-                email_address, code, username
-            )
-
-            if not email_sent:
-                print("[PASSWORD RESET SERVICE] Failed to send email")
-                return {"error": "Failed to send password reset email."}
-
-            print("[PASSWORD RESET SERVICE] Password reset email sent successfully")
+            print("[PASSWORD RESET SERVICE] Password reset email queued")
             return {
                 "success": True,
                 "user_id": user_id,
@@ -478,20 +467,12 @@ class UserServices:
 
             # Store new code (old one is automatically deleted)
             success = UserRepository.create_password_reset_code(
-                user_id, code, expires_at
+                user_id, code, expires_at, email_address, username
             )
 
             if not success:
                 return {"error": "Failed to create reset code."}
 
-            # Send email
-            email_sent = EmailService.send_password_reset_email(
-                email_address, code, username
-            )
-
-            if not email_sent:
-                return {"error": "Failed to send email."}
-
             print("[RESEND RESET CODE SERVICE] Code resent successfully")
             return {
                 "success": True,
@@ -541,21 +522,13 @@ class UserServices:
 
             # Store code in password_reset_codes table (reusing the same table)
             success = UserRepository.create_password_reset_code(
-                user_id, code, expires_at
+                user_id, code, expires_at, email_address, username
             )
 
             if not success:
                 return {"error": "Failed to create verification code."}
 
-            # Send email with verification code
-            email_sent = EmailService.send_password_reset_email(
-                email_address, code, username
-            )
-
-            if not email_sent:
-                return {"error": "Failed to send verification email."}
-
-            print("[CHANGE PASSWORD SERVICE] Verification email sent successfully")
+            print("[CHANGE PASSWORD SERVICE] Verification email queued")
             return {
                 "success": True,
                 "message": "Verification code sent to your email.",
@@ -688,20 +661,12 @@ class UserServices:
 
             # Store new code
             success = UserRepository.create_password_reset_code(
-                user_id, code, expires_at
+                user_id, code, expires_at, email_address, username
             )
 
             if not success:
                 return {"error": "Failed to create verification code."}
 
-            # Send email
-            email_sent = EmailService.send_password_reset_email(
-                email_address, code, username
-            )
-
-            if not email_sent:
-                return {"error": "Failed to send email."}
-
             print("[RESEND CHANGE PASSWORD CODE] Code resent successfully")
             return {
                 "success": True,
@@ -7,6 +7,11 @@ from datetime import datetime, timezone
 
 from app.features.wallets.services import WalletServices
 
+from app.common.constants import OutboxEventTypeEnum
+
+from app.services.outbox import OutboxServices
+from app.services.presence import PresenceRegistry
+
 webhooks_bp = Blueprint("webhooks", __name__)
 
 
@@ -53,10 +58,13 @@ def handle_invoice_paid(payload):
 
     amount_to_readits_dict = {100: 200, 150: 600, 350: 1000, 750: 5000}
 
-    socketio.emit(
-        "payment_success",
-        {"readitsAmount": amount_to_readits_dict[amount]},
-        room=parsed_external_id[1],
+    OutboxServices.enqueue(
+        OutboxEventTypeEnum.socket_emit,
+        {
+            "event": "payment_success",
+            "data": {"readitsAmount": amount_to_readits_dict[amount]},
+            "room": parsed_external_id[1],
+        },
     )
 
     return jsonify({"status": "Successful purchase."}), 200
@@ -66,11 +74,13 @@ def handle_invoice_paid(payload):
 def handle_join(data):
     user_id = data["userId"]
     join_room(user_id)
+    PresenceRegistry.join(request.sid, user_id)  # type: ignore[attr-defined]
     print(f"----------------------------------User {user_id} joined room")
 
 
 @socketio.on("disconnect")
 def handle_disconnect():
+    PresenceRegistry.disconnect(request.sid)  # type: ignore[attr-defined]
     print("----------------------------------Client disconnected")
 
 
@@ -78,4 +88,5 @@ def handle_disconnect():
 def handle_leave(data):
     user_id = data["userId"]
     leave_room(user_id)
+    PresenceRegistry.leave(request.sid, user_id)  # type: ignore[attr-defined]
     print(f"----------------------------------User {user_id} left room")
@@ -1,116 +1,566 @@
 import eventlet
+from eventlet.queue import Empty, LightQueue
 from flask import Flask
 import logging
-from datetime import datetime, timedelta
+import os
+import socket
+import time
+import traceback
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from app.db.listener import DatabaseListener
+from app.db.queries import SchedulerQueries
+from app.utils.clock import get_clock
+from app.utils.due_time_heap import DueTimeHeap
 
 logger = logging.getLogger(__name__)
 
 # Global variable to track if scheduler is running
 _scheduler_greenthread = None
 
+# Anything put here wakes the scheduler to re-check when the next task is due
+_wake_queue: LightQueue = LightQueue()
+
+# Due times of pending work, kept current by the scheduler_due_times NOTIFY channel
+_due_times = DueTimeHeap()
+
+# True until the due times are loaded, and again whenever notifications may be lost
+_due_times_stale = True
+
+# True if the last load hit SCHEDULER_DUE_TIMES_LOAD_LIMIT
+_due_times_truncated = False
+
+# Sleep a little past the due time so the task queries see it as due
+_DUE_TIME_SLACK_SECONDS = 0.5
+
+# Bounded pool the jobs run in, created on the first run
+_job_pool: eventlet.GreenPool | None = None
+
+# Jobs currently running in this process, so a slow job is never started twice
+_running_jobs: set[str] = set()
+
+# When each periodic job (see get_periodic_jobs) runs next, as time.time() timestamps
+_periodic_jobs_next_run: dict[str, float] = {}
+
+# Identifies this process in scheduler_job_runs
+_WORKER_NAME = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def wake_scheduler() -> None:
+    """
+    Make the scheduler re-check when its next task is due.
+
+    Call after creating or approving a rental or purchase, or anything else that
+    may move the next reservation expiry, meetup, or return earlier.
+    """
+    _wake_queue.put(None)
+
+
+def get_scheduler_jobs() -> list[tuple[str, str, Callable[[], Any]]]:
+    """
+    Return the scheduler jobs in the order they run.
+
+    Returns:
+        list[tuple]: (job name, label, function) for each job.
+    """
+    from app.tasks import (
+        RentalCleanupTask,
+        RentalStatusTask,
+        PurchaseCleanupTask,
+        PurchaseStatusTask,
+    )
+
+    return [
+        (
+            "cleanup_expired_rentals",
+            "Rental cleanup",
+            RentalCleanupTask.cleanup_expired_rentals,
+        ),
+        (
+            "update_rentals_to_pickup_confirmation",
+            "Rental pickup confirmation",
+            RentalStatusTask.update_approved_to_pickup_confirmation,
+        ),
+        (
+            "update_rentals_to_return_confirmation",
+            "Rental return confirmation",
+            RentalStatusTask.update_ongoing_to_return_confirmation,
+        ),
+        (
+            "cleanup_expired_purchases",
+            "Purchase cleanup",
+            PurchaseCleanupTask.cleanup_expired_purchases,
+        ),
+        (
+            "update_purchases_to_pickup_confirmation",
+            "Purchase pickup confirmation",
+            PurchaseStatusTask.update_approved_to_pickup_confirmation,
+        ),
+    ]
+
+
+def get_periodic_jobs(app: Flask) -> list[tuple[str, str, Callable[[], Any], float]]:
+    """
+    Return the maintenance jobs, which run on a fixed interval instead of when rows
+    become due.
+
+    Returns:
+        list[tuple]: (job name, label, function, interval in seconds) for each job.
+    """
+    from app.tasks import (
+        BookImagesTask,
+        NotificationChangesTask,
+        NotificationCountsTask,
+        NotificationDigestsTask,
+        NotificationPartitionsTask,
+    )
+
+    jobs = [
+        (
+            "repair_unread_notification_counts",
+            "Unread notification counts repair",
+            NotificationCountsTask.repair_unread_counts,
+            app.config.get("NOTIFICATION_COUNTS_REPAIR_INTERVAL_SECONDS", 6 * 3600),
+        ),
+        (
+            "maintain_notification_partitions",
+            "Notifications partition maintenance",
+            NotificationPartitionsTask.maintain_partitions,
+            app.config.get(
+                "NOTIFICATIONS_PARTITION_MAINTENANCE_INTERVAL_SECONDS", 24 * 3600
+            ),
+        ),
+        (
+            "prune_notification_changes",
+            "Notification changes pruning",
+            NotificationChangesTask.prune_changes,
+            app.config.get("NOTIFICATION_CHANGES_PRUNE_INTERVAL_SECONDS", 3600),
+        ),
+        (
+            "fail_orphaned_book_image_uploads",
+            "Orphaned book image uploads",
+            BookImagesTask.fail_orphaned_uploads,
+            app.config.get("BOOK_IMAGES_PENDING_CHECK_INTERVAL_SECONDS", 300),
+        ),
+    ]
+
+    if app.config.get("NOTIFICATION_DIGESTS_ENABLED"):
+        jobs.append(
+            (
+                "send_notification_digests",
+                "Notification digest emails",
+                NotificationDigestsTask.send_digests,
+                app.config.get("NOTIFICATION_DIGEST_INTERVAL_SECONDS", 3600),
+            )
+        )
+
+    return jobs
+
+
+def start_periodic_jobs(app: Flask) -> float:
+    """
+    Start the periodic jobs that are due in the job pool, without waiting for them.
+
+    Each job first runs when the scheduler starts, then every interval after that.
+    Runs are locked and recorded like the other jobs (see _run_job).
+
+    Returns:
+        float: When the next periodic job is due, as a time.time() timestamp.
+    """
+    now = time.time()
+
+    for job_name, label, job, interval in get_periodic_jobs(app):
+        next_run = _periodic_jobs_next_run.get(job_name, now)
+
+        if next_run <= now:
+            if job_name in _running_jobs:
+                logger.info(f"Skipping {job_name}: previous run still in progress")
+            else:
+                _running_jobs.add(job_name)
+                _get_job_pool(app).spawn(
+                    _run_job,
+                    app,
+                    job_name,
+                    label,
+                    job,
+                    datetime.fromtimestamp(next_run, timezone.utc),
+                )
+
+            next_run = now + interval
+
+        _periodic_jobs_next_run[job_name] = next_run
+
+    return min(_periodic_jobs_next_run.values(), default=now + 3600)
+
+
+def _get_job_pool(app: Flask) -> eventlet.GreenPool:
+    global _job_pool
+
+    if _job_pool is None:
+        _job_pool = eventlet.GreenPool(app.config.get("SCHEDULER_JOB_CONCURRENCY", 2))
+
+    return _job_pool
+
+
+def load_due_times(app: Flask) -> None:
+    """
+    Replace the in-memory due times with the earliest ones in the database.
+
+    Loads at most SCHEDULER_DUE_TIMES_LOAD_LIMIT due times. If there were more,
+    they are reloaded once the loaded ones have all been handled.
+    """
+    global _due_times_stale, _due_times_truncated
+
+    limit = app.config.get("SCHEDULER_DUE_TIMES_LOAD_LIMIT", 1000)
+
+    with app.app_context():
+        db = app.extensions["db"]
+        rows = (
+            db.fetch_all(
+                SchedulerQueries.GET_UPCOMING_DUE_TIMES,
+                {**get_clock().query_params(), "limit": limit},
+            )
+            or []
+        )
+
+    now = time.time()
+
+    _due_times.clear()
+    for row in rows:
+        _due_times.set(row["key"], now + float(row["seconds_until_due"]))
+
+    _due_times_stale = False
+    _due_times_truncated = len(rows) >= limit
+
+    logger.info(f"Loaded {len(rows)} scheduler due times")
+
+
+def _on_due_time_notification(payload: str) -> None:
+    """Apply a due time published by the notify_scheduler_due_time() trigger."""
+    data = json.loads(payload)
+
+    seconds_until_due = data["seconds_until_due"]
+
+    _due_times.set(
+        data["key"],
+        (
+            time.time() + float(seconds_until_due)
+            if seconds_until_due is not None
+            else None
+        ),
+    )
+
+    wake_scheduler()
+
+
+def _on_due_time_listener_connect() -> None:
+    """Notifications sent while the listener was disconnected are lost; reload."""
+    global _due_times_stale
+
+    _due_times_stale = True
+    wake_scheduler()
+
+
+def _wait_for_wake(timeout: float) -> bool:
+    """Sleep up to `timeout` seconds. Returns True if woken early by wake_scheduler()."""
+    try:
+        _wake_queue.get(timeout=timeout)
+    except Empty:
+        return False
+
+    # Collapse a burst of wake-ups into one re-check
+    while not _wake_queue.empty():
+        _wake_queue.get_nowait()
+
+    return True
+
+
+def run_scheduler_jobs(app: Flask, scheduled_for: datetime | None = None) -> list[str]:
+    """
+    Start every scheduler job once, concurrently, without waiting for them.
+
+    Each job runs in its own greenthread of a shared GreenPool bounded by
+    SCHEDULER_JOB_CONCURRENCY, under a SCHEDULER_JOB_TIMEOUT_SECONDS timeout, so a
+    slow or failing job neither delays nor skips the others, nor the scheduler
+    loop. A job still running from an earlier call is not started again; the due
+    times are reloaded instead, so rows that became due meanwhile are picked up by
+    a later run. Each run is recorded in scheduler_job_runs (see record_job_run).
+
+    Args:
+        scheduled_for (datetime | None): When the earliest task became due, used to
+            record how late the jobs started. None for runs that were not due.
+
+    Returns:
+        list[str]: The names of the jobs started.
+    """
+    global _due_times_stale
+
+    print("\n" + "=" * 60)
+    print(f"SCHEDULER RUN - {datetime.now()}")
+    print("=" * 60)
+
+    started_jobs = []
+
+    for job_name, label, job in get_scheduler_jobs():
+        if job_name in _running_jobs:
+            logger.info(f"Skipping {job_name}: previous run still in progress")
+            print(f"   • {label}: skipped (previous run still in progress)")
+            _due_times_stale = True
+            continue
+
+        # Marked here rather than in the greenthread, which may wait for a pool slot
+        _running_jobs.add(job_name)
+        _get_job_pool(app).spawn(
+            _run_job, app, job_name, label, job, scheduled_for
+        ).link(_on_scheduler_job_done)
+        started_jobs.append(job_name)
+
+    with app.app_context():
+        app.extensions["db"].execute_query(
+            SchedulerQueries.DELETE_OLD_JOB_RUNS,
+            (app.config.get("SCHEDULER_JOB_RUNS_RETENTION_DAYS", 30),),
+        )
+
+    print("=" * 60 + "\n")
+
+    return started_jobs
+
+
+def _on_scheduler_job_done(job_greenthread: eventlet.greenthread.GreenThread) -> None:
+    """
+    Reload the due times on the next scheduler check after a job failed or timed out,
+    which leaves due rows behind. The loop is not woken, so a failing job is retried
+    on a later check rather than straight away.
+    """
+    global _due_times_stale
+
+    result = job_greenthread.wait()
+
+    if isinstance(result, dict) and result.get("error"):
+        _due_times_stale = True
+
+
+def _run_job(
+    app: Flask,
+    job_name: str,
+    label: str,
+    job: Callable[[], Any],
+    scheduled_for: datetime | None,
+) -> Any:
+    """
+    Run one scheduler job in its own app context and record the run.
+
+    Returns:
+        Any: The job result, or None if another app instance is running the job.
+    """
+    job_timeout = app.config.get("SCHEDULER_JOB_TIMEOUT_SECONDS", 120)
+
+    try:
+        with app.app_context():
+            db = app.extensions["db"]
+
+            # Only one app instance runs a given job at a time
+            with db.advisory_lock(f"libris:scheduler:{job_name}") as acquired:
+                if not acquired:
+                    logger.info(f"Skipping {job_name}: running on another worker")
+                    print(f"   • {label}: skipped (running on another worker)")
+                    return None
+
+                logger.info(f"Running {job_name} job...")
+
+                started_at = datetime.now(timezone.utc)
+                start = time.perf_counter()
+                error: BaseException | None = None
+
+                # Raised inside the job at its next I/O; open transactions roll back
+                timeout = eventlet.Timeout(job_timeout)
+
+                try:
+                    result = job()
+                except eventlet.Timeout as e:
+                    if e is not timeout:
+                        raise
+
+                    logger.error(f"{label} timed out after {job_timeout}s")
+                    result = {"error": f"Timed out after {job_timeout}s"}
+                    error = e
+                except Exception as e:
+                    logger.error(f"{label} failed: {str(e)}")
+                    traceback.print_exc()
+                    result = {"error": str(e)}
+                    error = e
+                finally:
+                    timeout.cancel()
+
+                duration_ms = (time.perf_counter() - start) * 1000
+
+                record_job_run(
+                    job_name, result, started_at, duration_ms, scheduled_for, error
+                )
+
+                print(f"   • {label}: {result} ({duration_ms:.0f}ms)")
+                logger.info(f"{label} completed: {result}")
+
+                return result
+
+    except Exception as e:
+        # e.g. the database is unreachable, so the lock could not be taken
+        logger.error(f"{label} could not run: {str(e)}")
+        traceback.print_exc()
+        return {"error": str(e)}
+
+    finally:
+        _running_jobs.discard(job_name)
+
+
+def record_job_run(
+    job_name: str,
+    result: Any,
+    started_at: datetime,
+    duration_ms: float,
+    scheduled_for: datetime | None,
+    error: BaseException | None = None,
+) -> None:
+    """
+    Save one job run to scheduler_job_runs. Must run inside an app context.
+
+    The job results follow the task conventions: rows handled under "cleaned" or
+    "updated", a failed run under "error", and per-row failures under "errors".
+    """
+    from flask import current_app
+
+    result = result if isinstance(result, dict) else {}
+
+    rows_affected = result.get("cleaned", result.get("updated"))
+    error_message = result.get("error") or (str(error) if error else None)
+
+    lag_ms = None
+    if scheduled_for is not None and started_at >= scheduled_for:
+        lag_ms = (started_at - scheduled_for).total_seconds() * 1000
+
+    try:
+        current_app.extensions["db"].execute_query(
+            SchedulerQueries.INSERT_JOB_RUN,
+            (
+                job_name,
+                "failed" if error_message else "succeeded",
+                started_at,
+                duration_ms,
+                lag_ms,
+                rows_affected,
+                result.get("errors", 0),
+                error_message,
+                _WORKER_NAME,
+            ),
+        )
+    except Exception as e:
+        # Losing a history row must not stop the remaining jobs
+        logger.error(f"Recording the {job_name} run failed: {str(e)}")
+
 
 def init_scheduler(app: Flask):
     """
-    Initialize cleanup scheduler using eventlet (compatible with SocketIO).
+    Initialize the deadline-driven scheduler using eventlet (compatible with SocketIO).
+
+    The scheduler keeps the due times of pending work (reservation expiry, 1 hour
+    before meetup, 1 hour before return) in an in-memory heap, sleeps until the
+    earliest one, and runs the jobs. Triggers on rented_books and purchased_books
+    publish every new or changed due time on a NOTIFY channel, so the heap stays
+    current without scanning either table. The heap is reloaded from the database
+    at startup, whenever the listener reconnects, and every
+    SCHEDULER_MAX_SLEEP_SECONDS as a safety net. Maintenance jobs (see
+    get_periodic_jobs) run on their own intervals alongside.
+
+    Every app process may run a scheduler; each job run takes a Postgres advisory
+    lock first, so a job is never run by two processes at once.
     """
     global _scheduler_greenthread
 
+    min_sleep = app.config.get("SCHEDULER_MIN_SLEEP_SECONDS", 5)
+    max_sleep = app.config.get("SCHEDULER_MAX_SLEEP_SECONDS", 300)
+
+    DatabaseListener(
+        app.config.get("SCHEDULER_LISTEN_DATABASE_URL") or app.config["DATABASE_URL"],
+        SchedulerQueries.DUE_TIMES_CHANNEL,
+        _on_due_time_notification,
+        on_connect=_on_due_time_listener_connect,
+    ).start()
+
     def scheduler_loop():
-        """Run cleanup and status updates every minute."""
+        """Run cleanup and status updates whenever one of them is due."""
+        global _due_times_stale
+
         logger.info("=" * 60)
         logger.info("SCHEDULER LOOP STARTED")
         logger.info(f"Current time: {datetime.now()}")
-        logger.info("Next run in: 1 minute (60 seconds)")
         logger.info("=" * 60)
 
+        just_ran_jobs = False
+        next_reload_at = 0.0
+        next_periodic_job_at = 0.0
+
         while True:
             try:
-                # Wait 1 minute (60 seconds)
-                eventlet.sleep(60)
-
-                print("\n" + "=" * 60)
-                print(f"SCHEDULER RUN - {datetime.now()}")
-                print("=" * 60)
-
-                # Run cleanup and status updates
-                with app.app_context():
-                    from app.tasks import (
-                        RentalCleanupTask,
-                        RentalStatusTask,
-                        PurchaseCleanupTask,
-                        PurchaseStatusTask,
-                    )
-
-                    # === RENTAL TASKS ===
-                    print("\nRENTAL TASKS:")
-                    print("-" * 60)
-
-                    # 1. Clean up expired rentals
-                    logger.info("Running cleanup_expired_rentals job...")
-                    rental_cleanup_result = RentalCleanupTask.cleanup_expired_rentals()
-                    print(f"   • Cleanup: {rental_cleanup_result}")
-                    logger.info(f"Rental cleanup completed: {rental_cleanup_result}")
-
-                    # 2. Update approved rentals to pickup confirmation
-                    logger.info("Updating rentals to pickup confirmation...")
-                    rental_pickup_result = (
-                        RentalStatusTask.update_approved_to_pickup_confirmation()
-                    )
-                    print(f"   • Pickup confirmation: {rental_pickup_result}")
-                    logger.info(
-                        f"Rental pickup confirmation update: {rental_pickup_result}"
-                    )
-
-                    # 3. Update ongoing rentals to return confirmation
-                    logger.info("Updating rentals to return confirmation...")
-                    rental_return_result = (
-                        RentalStatusTask.update_ongoing_to_return_confirmation()
-                    )
-                    print(f"   • Return confirmation: {rental_return_result}")
-                    logger.info(
-                        f"Rental return confirmation update: {rental_return_result}"
-                    )
-
-                    # === PURCHASE TASKS ===
-                    print("\nPURCHASE TASKS:")
-                    print("-" * 60)
-
-                    # 4. Clean up expired purchases
-                    logger.info("Running cleanup_expired_purchases job...")
-                    purchase_cleanup_result = (
-                        PurchaseCleanupTask.cleanup_expired_purchases()
-                    )
-                    print(f"   • Cleanup: {purchase_cleanup_result}")
-                    logger.info(
-                        f"Purchase cleanup completed: {purchase_cleanup_result}"
-                    )
-
-                    # 5. Update approved purchases to pickup confirmation
-                    logger.info("Updating purchases to pickup confirmation...")
-                    purchase_pickup_result = (
-                        PurchaseStatusTask.update_approved_to_pickup_confirmation()
-                    )
-                    print(f"   • Pickup confirmation: {purchase_pickup_result}")
-                    logger.info(
-                        f"Purchase pickup confirmation update: {purchase_pickup_result}"
-                    )
-
-                    print("\n" + "=" * 60 + "\n")
+                if time.time() >= next_periodic_job_at:
+                    next_periodic_job_at = start_periodic_jobs(app)
+
+                if (
+                    _due_times_stale
+                    or (_due_times_truncated and not _due_times)
+                    or time.time() >= next_reload_at
+                ):
+                    load_due_times(app)
+                    next_reload_at = time.time() + max_sleep
+
+                next_due_at = _due_times.peek()
+
+                wake_at = min(next_reload_at, next_periodic_job_at)
+                if next_due_at is not None:
+                    wake_at = min(wake_at, next_due_at + _DUE_TIME_SLACK_SECONDS)
+
+                sleep_seconds = wake_at - time.time()
+
+                # Rows that stay due after a run (e.g. a failing cleanup) must not
+                # make the loop spin
+                if just_ran_jobs:
+                    sleep_seconds = max(sleep_seconds, min_sleep)
+
+                just_ran_jobs = False
+
+                if sleep_seconds > 0:
+                    logger.info(f"Next scheduler check in {sleep_seconds:.1f}s")
+
+                    if _wait_for_wake(sleep_seconds):
+                        continue
+
+                if not _due_times.pop_due(time.time()):
+                    # Woke up to reload the due times or to start a periodic job
+                    continue
+
+                run_scheduler_jobs(
+                    app,
+                    scheduled_for=datetime.fromtimestamp(next_due_at, timezone.utc),
+                )
+                just_ran_jobs = True
 
             except Exception as e:
                 print(f"Scheduler job failed: {str(e)}")
                 logger.error(f"Scheduler job failed: {str(e)}")
-                import traceback
-
                 traceback.print_exc()
 
+                _due_times_stale = True
+                just_ran_jobs = False
+                eventlet.sleep(min_sleep)
+
     # Start the scheduler in a greenthread
     _scheduler_greenthread = eventlet.spawn(scheduler_loop)
 
     # Print to console (not just log)
     print("\n" + "=" * 60)
     print("EVENTLET SCHEDULER STARTED SUCCESSFULLY")
-    print("Jobs will run every minute:")
+    print("Jobs run when the next one is due:")
     print("   RENTALS:")
     print("      • Cleanup expired rentals")
     print("      • Update to pickup confirmation (1hr before meetup)")
@@ -118,12 +568,13 @@ def init_scheduler(app: Flask):
     print("   PURCHASES:")
     print("      • Cleanup expired purchases")
     print("      • Update to pickup confirmation (1hr before meetup)")
-    print(
-        f"First run at: {datetime.now().replace(second=0, microsecond=0) + timedelta(minutes=1)}"
-    )
+    print("   MAINTENANCE:")
+    for _, label, _, interval in get_periodic_jobs(app):
+        print(f"      • {label} (every {interval:.0f}s)")
+    print(f"Reloading due times at least every {max_sleep} seconds")
     print("=" * 60 + "\n")
 
-    logger.info("Eventlet scheduler started - Jobs run every minute")
+    logger.info("Eventlet scheduler started - Jobs run when due")
 
     return _scheduler_greenthread
 
@@ -0,0 +1,76 @@
+import logging
+import traceback
+
+from queue import Queue
+from typing import Any, Callable
+
+from flask import current_app
+
+from app import socketio
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundQueue:
+    """
+    In-process job queue drained by a small set of long-lived socketio background workers.
+
+    Used for slow side work (e.g. uploading book images to storage) that should not hold
+    the HTTP request open. Jobs run inside the app context of the app that queued them.
+    Queued jobs are lost if the process stops; BookImagesTask fails the book image
+    uploads left behind.
+    """
+
+    _queue: Queue = Queue()
+    _workers: list[Any] = []
+
+    @staticmethod
+    def enqueue(job: Callable[..., Any], *args, **kwargs) -> None:
+        """
+        Queue a job to run on a background worker.
+
+        Args:
+            job (Callable): The function to run.
+            *args: Positional arguments passed to the job.
+            **kwargs: Keyword arguments passed to the job.
+        """
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        BackgroundQueue._start_workers(app.config.get("BACKGROUND_QUEUE_WORKERS", 2))
+
+        BackgroundQueue._queue.put((app, job, args, kwargs))
+
+    @staticmethod
+    def pending_jobs() -> int:
+        """Return the number of jobs waiting for a worker."""
+
+        return BackgroundQueue._queue.qsize()
+
+    @staticmethod
+    def _start_workers(worker_count: int) -> None:
+        """Start the workers the first time a job is queued."""
+
+        if BackgroundQueue._workers:
+            return
+
+        for _ in range(max(worker_count, 1)):
+            BackgroundQueue._workers.append(
+                socketio.start_background_task(BackgroundQueue._worker_loop)
+            )
+
+        logger.info(f"Background queue started with {worker_count} worker(s)")
+
+    @staticmethod
+    def _worker_loop() -> None:
+        while True:
+            app, job, args, kwargs = BackgroundQueue._queue.get()
+
+            try:
+                with app.app_context():
+                    job(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Background job {job.__name__} failed: {str(e)}")
+                traceback.print_exc()
+            finally:
+                BackgroundQueue._queue.task_done()
@@ -1,4 +1,6 @@
+import html
 import smtplib
+import traceback
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.config import Config
@@ -274,3 +276,181 @@ class EmailService:
 
             traceback.print_exc()
             return False
+
+    @staticmethod
+    def build_notification_digest_email(
+        to_email: str, username: str, notifications: list, pending_count: int
+    ) -> MIMEMultipart:
+        """
+        Build one email listing a user's unread notifications.
+
+        Args:
+            to_email (str): The user's email address.
+            username (str): The user's username.
+            notifications (list[Notification]): The notifications to list, newest first.
+            pending_count (int): How many unread notifications the digest covers,
+                which may be more than are listed.
+
+        Returns:
+            MIMEMultipart: The email, ready for send_emails.
+        """
+
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = (
+            f"You have {pending_count} unread Libris notification"
+            f"{'' if pending_count == 1 else 's'}"
+        )
+        msg["From"] = Config.MAIL_DEFAULT_SENDER
+        msg["To"] = to_email
+
+        items = "".join(
+            f"""
+                    <div class="item">
+                        <div class="header">{html.escape(notification.header)}</div>
+                        <p>{html.escape(notification.message)}</p>
+                    </div>"""
+            for notification in notifications
+        )
+
+        more_count = pending_count - len(notifications)
+        more = (
+            f"<p>...and {more_count} more. Open Libris to see them all.</p>"
+            if more_count > 0
+            else ""
+        )
+
+        html_content = f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <style>
+                    body {{
+                        font-family: Arial, sans-serif;
+                        background-color: #f4f4f4;
+                        padding: 20px;
+                    }}
+                    .container {{
+                        max-width: 600px;
+                        margin: 0 auto;
+                        background-color: white;
+                        padding: 40px;
+                        border-radius: 10px;
+                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+                    }}
+                    .logo {{
+                        text-align: center;
+                        margin-bottom: 30px;
+                    }}
+                    .logo h1 {{
+                        color: #10b981;
+                        font-size: 32px;
+                        margin: 0;
+                    }}
+                    .item {{
+                        border-left: 4px solid #10b981;
+                        padding: 10px 15px;
+                        margin: 15px 0;
+                    }}
+                    .header {{
+                        font-weight: bold;
+                    }}
+                    .footer {{
+                        text-align: center;
+                        color: #666;
+                        font-size: 12px;
+                        margin-top: 30px;
+                    }}
+                </style>
+            </head>
+            <body>
+                <div class="container">
+                    <div class="logo">
+                        <h1>📚 Libris</h1>
+                    </div>
+                    <h2>Hello {html.escape(username)},</h2>
+                    <p>Here is what happened while you were away:</p>
+                    {items}
+                    {more}
+                    <div class="footer">
+                        <p>© 2025 Libris. All rights reserved.</p>
+                        <p>Open the door to endless reading.</p>
+                    </div>
+                </div>
+            </body>
+            </html>
+            """
+
+        msg.attach(MIMEText(html_content, "html"))
+
+        return msg
+
+    @staticmethod
+    def send_emails(messages: list[MIMEMultipart]) -> list[bool]:
+        """
+        Send many emails over a single SMTP connection, instead of connecting and
+        logging in once per email.
+
+        If the server drops the connection midway, it is reopened once per email.
+        An email the server refuses does not stop the others.
+
+        Returns:
+            list[bool]: Whether each email was sent, in the order given.
+        """
+
+        sent = [False] * len(messages)
+        server = None
+
+        try:
+            for index, msg in enumerate(messages):
+                for attempt in range(2):
+                    # Failing to connect or log in stops the whole batch
+                    if server is None:
+                        server = EmailService._connect()
+
+                    try:
+                        server.send_message(msg)
+                        sent[index] = True
+                        break
+
+                    except smtplib.SMTPServerDisconnected:
+                        server = None
+
+                        if attempt:
+                            raise
+
+                    except smtplib.SMTPException as e:
+                        # Refused sender, recipient, or data; the connection is
+                        # still usable
+                        print(
+                            f"[EMAIL SERVICE] Sending to {msg['To']} failed: {str(e)}"
+                        )
+                        break
+
+        except Exception as e:
+            print(f"[EMAIL SERVICE] ERROR: {str(e)}")
+            traceback.print_exc()
+
+        finally:
+            if server is not None:
+                try:
+                    server.quit()
+                except smtplib.SMTPException:
+                    pass
+
+        print(f"[EMAIL SERVICE] Sent {sum(sent)} of {len(messages)} emails")
+
+        return sent
+
+    @staticmethod
+    def _connect() -> smtplib.SMTP:
+        """Open and log in to an SMTP connection with the MAIL_* settings."""
+
+        server = smtplib.SMTP(Config.MAIL_SERVER, Config.MAIL_PORT)
+
+        if Config.MAIL_USE_TLS:
+            server.starttls()
+
+        if Config.MAIL_USERNAME and Config.MAIL_PASSWORD:
+            server.login(Config.MAIL_USERNAME, Config.MAIL_PASSWORD)
+
+        return server
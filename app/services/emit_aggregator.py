@@ -0,0 +1,112 @@
+import logging
+import traceback
+
+from queue import Queue
+from typing import Any
+
+from flask import current_app
+
+from app import socketio
+from app.services.presence import PresenceRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class EmitAggregator:
+    """
+    Collects Socket.IO emits per room and sends them from one long-lived sender.
+
+    Emits queued within SOCKETIO_EMIT_WINDOW_SECONDS of each other are flushed
+    together, in batches of SOCKETIO_EMIT_BATCH_SIZE with a yield in between. For
+    coalesced events only the latest data per room is sent, so a burst of
+    notifications to one user results in a single unread count update. Emits to
+    users with no connection (see PresenceRegistry) are dropped.
+    """
+
+    # (event, room) for coalesced emits, (event, room, sequence) for the others;
+    # dicts keep insertion order, so emits go out in the order they were queued
+    _pending: dict[tuple, tuple[str, Any, str]] = {}
+    _sequence = 0
+
+    _wake_queue: Queue = Queue()
+    _sender = None
+
+    @staticmethod
+    def emit(event: str, data: Any, room: str, coalesce: bool = True) -> None:
+        """
+        Queue an emit to a room. Returns immediately.
+
+        Args:
+            event (str): The Socket.IO event name.
+            data (Any): The event data.
+            room (str): The room to emit to, e.g. a user ID.
+            coalesce (bool): Replace any queued emit of the same event to the same
+                room. Use False for events where every emit matters.
+        """
+
+        room = str(room)
+
+        # Rooms are user IDs; nobody would receive the emit
+        if not PresenceRegistry.is_online(room):
+            return
+
+        if coalesce:
+            key: tuple = (event, room)
+
+            # Moved to the end, so the latest data keeps its place in the order
+            EmitAggregator._pending.pop(key, None)
+        else:
+            EmitAggregator._sequence += 1
+            key = (event, room, EmitAggregator._sequence)
+
+        EmitAggregator._pending[key] = (event, data, room)
+
+        EmitAggregator._start_sender()
+        EmitAggregator._wake_queue.put(None)
+
+    @staticmethod
+    def pending_emits() -> int:
+        """Return the number of emits waiting to be sent."""
+
+        return len(EmitAggregator._pending)
+
+    @staticmethod
+    def _start_sender() -> None:
+        """Start the sender the first time an emit is queued."""
+
+        if EmitAggregator._sender is not None:
+            return
+
+        config = current_app.config if current_app else {}
+
+        EmitAggregator._sender = socketio.start_background_task(
+            EmitAggregator._sender_loop,
+            config.get("SOCKETIO_EMIT_WINDOW_SECONDS", 0.1),
+            config.get("SOCKETIO_EMIT_BATCH_SIZE", 100),
+        )
+
+        logger.info("Socket.IO emit aggregator started")
+
+    @staticmethod
+    def _sender_loop(window_seconds: float, batch_size: int) -> None:
+        while True:
+            EmitAggregator._wake_queue.get()
+
+            # Let the rest of the burst arrive
+            socketio.sleep(window_seconds)
+
+            while not EmitAggregator._wake_queue.empty():
+                EmitAggregator._wake_queue.get_nowait()
+
+            pending = EmitAggregator._pending
+            EmitAggregator._pending = {}
+
+            for index, (event, data, room) in enumerate(pending.values()):
+                if index and index % batch_size == 0:
+                    socketio.sleep(0)
+
+                try:
+                    socketio.emit(event, data, room=room)
+                except Exception as e:
+                    logger.error(f"Emitting {event} to room {room} failed: {str(e)}")
+                    traceback.print_exc()
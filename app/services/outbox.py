@@ -0,0 +1,322 @@
+import json
+import logging
+import random
+import time
+import traceback
+
+from functools import partial
+from typing import Any, Callable
+
+import eventlet
+from eventlet.queue import Empty, LightQueue
+from flask import Flask, current_app
+from psycopg import Connection
+from psycopg.types.json import Json
+
+from app.common.constants import OutboxEventTypeEnum
+from app.db.queries import OutboxQueries
+
+logger = logging.getLogger(__name__)
+
+# Payloads may hold UUIDs and datetimes; they are stored as strings
+_json_dumps = partial(json.dumps, default=str)
+
+# Anything put here wakes the outbox worker of this process
+_wake_queue: LightQueue = LightQueue()
+
+_worker_greenthread = None
+
+
+class OutboxServices:
+    """
+    Transactional outbox for side effects (notifications, emails, socket emits).
+
+    Callers enqueue an event, ideally on the connection of the transaction that makes
+    the business change, so the event is stored if and only if the change commits.
+    The outbox worker of any app instance then delivers it, retrying with backoff.
+    """
+
+    @staticmethod
+    def enqueue(
+        event_type: OutboxEventTypeEnum,
+        payload: dict[str, Any],
+        conn: Connection | None = None,
+    ) -> None:
+        """
+        Store one event in the outbox.
+
+        Args:
+            event_type (OutboxEventTypeEnum): Selects the handler that delivers the event.
+            payload (dict): The handler arguments. Must be JSON serializable.
+            conn (Connection | None): Connection of the current transaction, if any.
+                Without it the event is committed on its own.
+        """
+
+        OutboxServices.enqueue_many([(event_type, payload)], conn)
+
+    @staticmethod
+    def enqueue_many(
+        events: list[tuple[OutboxEventTypeEnum, dict[str, Any]]],
+        conn: Connection | None = None,
+    ) -> None:
+        """
+        Store several events in the outbox with a single statement.
+
+        Args:
+            events (list[tuple]): (event type, payload) for each event.
+            conn (Connection | None): Connection of the current transaction, if any.
+        """
+
+        if not events:
+            return
+
+        params = (
+            [event_type.value for event_type, _ in events],
+            [Json(payload, dumps=_json_dumps) for _, payload in events],
+        )
+
+        db = current_app.extensions["db"]
+
+        if conn is not None:
+            conn.execute(OutboxQueries.INSERT_EVENTS, params)
+
+            # Woken before the commit, the worker would not see the events yet
+            db.after_commit(conn, lambda: _wake_queue.put(None))
+        else:
+            db.execute_query(OutboxQueries.INSERT_EVENTS, params)
+            _wake_queue.put(None)
+
+    @staticmethod
+    def process_outbox_batch(app: Flask) -> int:
+        """
+        Claim one batch of due events and deliver them.
+
+        Each event is marked done as soon as it is delivered. A failed event goes
+        back to 'pending' with an exponential backoff, or to 'failed' after
+        OUTBOX_MAX_ATTEMPTS attempts.
+
+        Once half of the OUTBOX_LOCK_SECONDS lease has passed, the lease of each
+        remaining event is renewed before it is delivered; an event whose lease ran
+        out and was claimed by another worker is skipped, so it is not sent twice.
+
+        Returns:
+            int: The number of events claimed.
+        """
+
+        with app.app_context():
+            db = app.extensions["db"]
+            lock_seconds = app.config.get("OUTBOX_LOCK_SECONDS", 60)
+
+            events = (
+                db.fetch_all(
+                    OutboxQueries.CLAIM_EVENTS,
+                    (app.config.get("OUTBOX_BATCH_SIZE", 100), lock_seconds),
+                )
+                or []
+            )
+            renew_after = time.monotonic() + lock_seconds / 2
+
+            handlers = get_outbox_handlers()
+            done_event_ids = OutboxServices._deliver_notifications_together(events)
+
+            if done_event_ids:
+                db.execute_query(OutboxQueries.MARK_EVENTS_DONE, (done_event_ids,))
+
+            for event in events:
+                if event["event_id"] in done_event_ids:
+                    continue
+
+                if time.monotonic() >= renew_after and not db.execute_query_returning(
+                    OutboxQueries.RENEW_EVENT_LEASE,
+                    (lock_seconds, event["event_id"], event["attempts"]),
+                ):
+                    logger.warning(
+                        f"Outbox event {event['event_id']} was claimed by another "
+                        "worker after its lease expired, skipping it"
+                    )
+                    continue
+
+                try:
+                    handlers[event["event_type"]](event["payload"])
+                except Exception as e:
+                    logger.error(
+                        f"Outbox event {event['event_id']} ({event['event_type']}) "
+                        f"failed on attempt {event['attempts']}: {str(e)}"
+                    )
+                    traceback.print_exc()
+
+                    db.execute_query(
+                        OutboxQueries.MARK_EVENT_FAILED,
+                        (
+                            app.config.get("OUTBOX_MAX_ATTEMPTS", 8),
+                            OutboxServices._get_retry_delay(app, event["attempts"]),
+                            str(e)[:1000],
+                            event["event_id"],
+                        ),
+                    )
+                    continue
+
+                db.execute_query(OutboxQueries.MARK_EVENTS_DONE, ([event["event_id"]],))
+
+        return len(events)
+
+    @staticmethod
+    def _deliver_notifications_together(events: list[dict[str, Any]]) -> list[int]:
+        """
+        Deliver the notifications of every notification event in a batch with one
+        insert, one unread count lookup, and one socket emit per receiver.
+
+        If that fails, nothing is marked delivered and the events are delivered one
+        by one, so a bad event only fails itself.
+
+        Returns:
+            list[int]: The IDs of the delivered events.
+        """
+        from app.features.notifications.services import NotificationServices
+
+        notification_events = [
+            event
+            for event in events
+            if event["event_type"]
+            in (
+                OutboxEventTypeEnum.notification.value,
+                OutboxEventTypeEnum.notifications.value,
+            )
+        ]
+
+        if len(notification_events) < 2:
+            return []
+
+        notifications = []
+
+        for event in notification_events:
+            if event["event_type"] == OutboxEventTypeEnum.notification.value:
+                notifications.append(event["payload"])
+            else:
+                notifications.extend(event["payload"]["notifications"])
+
+        try:
+            NotificationServices.deliver_notifications_bulk_service(notifications)
+        except Exception as e:
+            logger.warning(
+                f"Delivering {len(notification_events)} notification events together "
+                f"failed, delivering them one by one: {str(e)}"
+            )
+            return []
+
+        return [event["event_id"] for event in notification_events]
+
+    @staticmethod
+    def delete_done_events(app: Flask) -> None:
+        """Delete delivered events older than OUTBOX_RETENTION_SECONDS."""
+
+        with app.app_context():
+            app.extensions["db"].execute_query(
+                OutboxQueries.DELETE_DONE_EVENTS,
+                (app.config.get("OUTBOX_RETENTION_SECONDS", 7 * 24 * 60 * 60),),
+            )
+
+    @staticmethod
+    def _get_retry_delay(app: Flask, attempts: int) -> float:
+        """Exponential backoff with jitter, so failing events do not retry in lockstep."""
+
+        delay = min(
+            app.config.get("OUTBOX_RETRY_BASE_SECONDS", 5) * 2 ** (attempts - 1),
+            app.config.get("OUTBOX_RETRY_MAX_SECONDS", 900),
+        )
+
+        return delay * random.uniform(0.5, 1)
+
+
+def get_outbox_handlers() -> dict[str, Callable[[dict[str, Any]], None]]:
+    """
+    Return the function that delivers each outbox event type.
+
+    Returns:
+        dict: Handler keyed by event type. A handler raises if delivery failed.
+    """
+    from app import socketio
+    from app.features.notifications.services import NotificationServices
+    from app.services.email_service import EmailService
+    from app.services.presence import PresenceRegistry
+
+    def send_email(payload: dict[str, Any]) -> None:
+        send = {
+            "verification": EmailService.send_verification_email,
+            "password_reset": EmailService.send_password_reset_email,
+        }[payload["template"]]
+
+        if not send(payload["to_email"], payload["code"], payload["username"]):
+            raise RuntimeError(f"Sending {payload['template']} email failed")
+
+    def emit(payload: dict[str, Any]) -> None:
+        if PresenceRegistry.is_online(payload["room"]):
+            socketio.emit(payload["event"], payload["data"], room=payload["room"])
+
+    return {
+        OutboxEventTypeEnum.notification.value: lambda payload: (
+            NotificationServices.deliver_notification_service(**payload)
+        ),
+        OutboxEventTypeEnum.notifications.value: lambda payload: (
+            NotificationServices.deliver_notifications_bulk_service(
+                payload["notifications"]
+            )
+        ),
+        OutboxEventTypeEnum.email.value: send_email,
+        OutboxEventTypeEnum.socket_emit.value: emit,
+    }
+
+
+def _wait_for_wake(timeout: float) -> None:
+    """Sleep up to `timeout` seconds, or until an event is enqueued in this process."""
+    try:
+        _wake_queue.get(timeout=timeout)
+    except Empty:
+        return
+
+    while not _wake_queue.empty():
+        _wake_queue.get_nowait()
+
+
+def init_outbox_worker(app: Flask):
+    """
+    Start the outbox worker of this process in a greenthread.
+
+    Every app instance may run one; FOR UPDATE SKIP LOCKED hands each of them a
+    different batch, and events claimed by a crashed worker are reclaimed once
+    their OUTBOX_LOCK_SECONDS lease expires.
+    """
+    global _worker_greenthread
+
+    if _worker_greenthread is not None:
+        return _worker_greenthread
+
+    poll_interval = app.config.get("OUTBOX_POLL_INTERVAL_SECONDS", 1)
+    batch_size = app.config.get("OUTBOX_BATCH_SIZE", 100)
+    retention_check_interval = 60 * 60
+
+    def worker_loop():
+        logger.info("Outbox worker started")
+
+        next_retention_check = 0.0
+
+        while True:
+            try:
+                # A full batch means more events are probably waiting
+                if OutboxServices.process_outbox_batch(app) >= batch_size:
+                    eventlet.sleep(0)
+                    continue
+
+                if time.monotonic() >= next_retention_check:
+                    OutboxServices.delete_done_events(app)
+                    next_retention_check = time.monotonic() + retention_check_interval
+
+            except Exception as e:
+                logger.error(f"Outbox worker failed: {str(e)}")
+                traceback.print_exc()
+
+            _wait_for_wake(poll_interval)
+
+    _worker_greenthread = eventlet.spawn(worker_loop)
+
+    return _worker_greenthread
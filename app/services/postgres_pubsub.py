@@ -0,0 +1,102 @@
+import json
+import logging
+
+from typing import Optional
+
+from eventlet.queue import LightQueue
+from psycopg import Connection, OperationalError, connect
+from socketio import PubSubManager
+
+from app.db.listener import DatabaseListener
+from app.db.queries import SocketIOQueries
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresManager(PubSubManager):
+    """
+    Socket.IO client manager that relays emits between app processes through
+    Postgres LISTEN/NOTIFY, so a user connected to any process receives them.
+
+    Pass it to socketio.init_app() as client_manager. Every emit is published as a
+    NOTIFY on `channel`, and every process (the sender included) listens on it and
+    delivers the emit to its own clients. Messages over the NOTIFY payload limit
+    are stored in socketio_messages and only their ID is sent.
+    """
+
+    name = "postgres"
+
+    # NOTIFY payloads must be shorter than 8000 bytes
+    _max_notify_bytes = 7900
+
+    def __init__(
+        self,
+        conninfo: str,
+        channel: str = "socketio",
+        write_only: bool = False,
+        logger=None,
+    ) -> None:
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+        self.conninfo = conninfo
+        self._publish_conn: Optional[Connection] = None
+
+    def _publish(self, data) -> None:
+        message = json.dumps(data)
+
+        for attempt in range(2):
+            try:
+                if self._publish_conn is None or self._publish_conn.closed:
+                    self._publish_conn = connect(self.conninfo, autocommit=True)
+
+                if len(message.encode()) > self._max_notify_bytes:
+                    row = self._publish_conn.execute(
+                        SocketIOQueries.INSERT_MESSAGE, (message,)
+                    ).fetchone()
+                    assert row is not None
+
+                    message = json.dumps({"message_id": row[0]})
+
+                self._publish_conn.execute(
+                    SocketIOQueries.NOTIFY, (self.channel, message)
+                )
+                return
+
+            except OperationalError:
+                # The connection dropped; reconnect once
+                self._publish_conn = None
+
+                if attempt:
+                    raise
+
+    def _listen(self):
+        messages: LightQueue = LightQueue()
+
+        DatabaseListener(self.conninfo, self.channel, messages.put).start()
+
+        while True:
+            message = json.loads(messages.get())
+
+            if "message_id" in message:
+                message = self._load_stored_message(message["message_id"])
+
+                if message is None:
+                    continue
+
+            yield message
+
+    def _load_stored_message(self, message_id: int):
+        try:
+            with connect(self.conninfo, autocommit=True) as conn:
+                row = conn.execute(
+                    SocketIOQueries.GET_MESSAGE, (message_id,)
+                ).fetchone()
+        except OperationalError as e:
+            logger.error(f"Loading Socket.IO message {message_id} failed: {str(e)}")
+            return None
+
+        if row is None:
+            logger.warning(f"Socket.IO message {message_id} expired before delivery")
+            return None
+
+        return row[0]
@@ -0,0 +1,87 @@
+import logging
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceRegistry:
+    """
+    In-memory registry of the users connected to this process over Socket.IO.
+
+    A user may be connected from several tabs or devices, so each user has a count
+    of connections that joined their room. Emitters check is_online() first and skip
+    users nobody is listening for.
+
+    The registry only sees this process's connections. When emits are relayed
+    between processes (SOCKETIO_MESSAGE_QUEUE), a user may be connected elsewhere,
+    so is_online() then always returns True.
+    """
+
+    _connections_by_user: dict[str, int] = {}
+    _users_by_sid: dict[str, set[str]] = {}
+    _authoritative = True
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        PresenceRegistry._authoritative = not app.config.get("SOCKETIO_MESSAGE_QUEUE")
+
+    @staticmethod
+    def join(sid: str, user_id: str) -> None:
+        """Record that connection `sid` joined the room of `user_id`."""
+
+        user_id = str(user_id)
+        user_ids = PresenceRegistry._users_by_sid.setdefault(sid, set())
+
+        # Joining the same room twice does not add a second connection
+        if user_id in user_ids:
+            return
+
+        user_ids.add(user_id)
+        PresenceRegistry._connections_by_user[user_id] = (
+            PresenceRegistry._connections_by_user.get(user_id, 0) + 1
+        )
+
+    @staticmethod
+    def leave(sid: str, user_id: str) -> None:
+        """Record that connection `sid` left the room of `user_id`."""
+
+        user_id = str(user_id)
+        user_ids = PresenceRegistry._users_by_sid.get(sid)
+
+        if not user_ids or user_id not in user_ids:
+            return
+
+        user_ids.discard(user_id)
+        if not user_ids:
+            del PresenceRegistry._users_by_sid[sid]
+
+        remaining = PresenceRegistry._connections_by_user.get(user_id, 0) - 1
+        if remaining > 0:
+            PresenceRegistry._connections_by_user[user_id] = remaining
+        else:
+            PresenceRegistry._connections_by_user.pop(user_id, None)
+
+    @staticmethod
+    def disconnect(sid: str) -> None:
+        """Remove connection `sid` from every room it joined."""
+
+        for user_id in list(PresenceRegistry._users_by_sid.get(sid, ())):
+            PresenceRegistry.leave(sid, user_id)
+
+    @staticmethod
+    def is_online(user_id) -> bool:
+        """Return False only if `user_id` certainly has no connection to emit to."""
+
+        return (
+            not PresenceRegistry._authoritative
+            or str(user_id) in PresenceRegistry._connections_by_user
+        )
+
+    @staticmethod
+    def connected_user_count() -> int:
+        return len(PresenceRegistry._connections_by_user)
+
+    @staticmethod
+    def connection_count() -> int:
+        return len(PresenceRegistry._users_by_sid)
@@ -0,0 +1,223 @@
+import os
+import logging
+import threading
+
+from typing import Any, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class StorageBackend(Protocol):
+    """Interface implemented by every object storage backend."""
+
+    def upload(
+        self, bucket_name: str, file_path: str, data: bytes, content_type: str | None
+    ) -> None: ...
+
+    def remove(self, bucket_name: str, file_paths: list[str]) -> None: ...
+
+    def get_public_url_prefix(self, bucket_name: str) -> str: ...
+
+
+class SupabaseStorageBackend:
+    """
+    Supabase Storage backend.
+
+    A single client is created on first use and shared by every request and background
+    worker, so its HTTP connections are kept alive between uploads.
+    """
+
+    def __init__(self, supabase_url: str, supabase_service_key: str) -> None:
+        self.supabase_url = supabase_url.rstrip("/")
+        self.supabase_service_key = supabase_service_key
+
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from supabase import create_client
+
+                    self._client = create_client(
+                        self.supabase_url, self.supabase_service_key
+                    )
+
+                    logger.info("Supabase storage client initialized")
+
+        return self._client
+
+    def upload(
+        self, bucket_name: str, file_path: str, data: bytes, content_type: str | None
+    ) -> None:
+        self._get_client().storage.from_(bucket_name).upload(
+            file=data,
+            path=file_path,
+            file_options={
+                # Object paths are never reused, so they can be cached for a year
+                "cache-control": "31536000",
+                "upsert": "true",
+                "content-type": content_type or "application/octet-stream",
+            },
+        )
+
+    def remove(self, bucket_name: str, file_paths: list[str]) -> None:
+        self._get_client().storage.from_(bucket_name).remove(file_paths)
+
+    def get_public_url_prefix(self, bucket_name: str) -> str:
+        return f"{self.supabase_url}/storage/v1/object/public/{bucket_name}/"
+
+
+class LocalStorageBackend:
+    """
+    Local filesystem backend, for development and for benchmarking uploads offline.
+
+    Objects are written to `<root_dir>/<bucket>/<path>` and served by the
+    `/local-storage/<bucket>/<path>` route registered in create_app().
+    """
+
+    URL_PREFIX = "/local-storage"
+
+    def __init__(self, root_dir: str) -> None:
+        self.root_dir = os.path.abspath(root_dir)
+
+    def upload(
+        self, bucket_name: str, file_path: str, data: bytes, content_type: str | None
+    ) -> None:
+        full_path = self._get_full_path(bucket_name, file_path)
+
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        with open(full_path, "wb") as file:
+            file.write(data)
+
+    def remove(self, bucket_name: str, file_paths: list[str]) -> None:
+        for file_path in file_paths:
+            try:
+                os.remove(self._get_full_path(bucket_name, file_path))
+            except FileNotFoundError:
+                pass
+
+    def get_public_url_prefix(self, bucket_name: str) -> str:
+        return f"{LocalStorageBackend.URL_PREFIX}/{bucket_name}/"
+
+    def _get_full_path(self, bucket_name: str, file_path: str) -> str:
+        bucket_dir = os.path.join(self.root_dir, bucket_name)
+        full_path = os.path.abspath(os.path.join(bucket_dir, file_path))
+
+        if not full_path.startswith(bucket_dir + os.sep):
+            raise ValueError(f"Invalid object path: {file_path}")
+
+        return full_path
+
+
+class StorageGateway:
+    """Singleton entry point to object storage (book images), backed by Supabase or the local disk."""
+
+    _instance: Optional["StorageGateway"] = None
+
+    # Supabase accepts at most 1000 objects per delete request
+    _remove_batch_size = 1000
+
+    # type hint for mypy
+    backend: Optional[StorageBackend] = None
+
+    def __new__(cls) -> "StorageGateway":
+        if cls._instance is None:
+            cls._instance = super(StorageGateway, cls).__new__(cls)
+        return cls._instance
+
+    def init_app(self, app) -> None:
+        """
+        Select the storage backend using the Flask app config.
+        Should be called once from create_app().
+        """
+
+        backend_name = app.config.get("STORAGE_BACKEND", "supabase")
+
+        if backend_name == "supabase":
+            self.backend = SupabaseStorageBackend(
+                app.config.get("SUPABASE_URL") or "",
+                app.config.get("SUPABASE_SERVICE_KEY") or "",
+            )
+        elif backend_name == "local":
+            self.backend = LocalStorageBackend(app.config.get("LOCAL_STORAGE_DIR"))
+        else:
+            raise RuntimeError(f"Unknown STORAGE_BACKEND: {backend_name}")
+
+        logger.info(f"Storage gateway initialized with the {backend_name} backend")
+
+    def _get_backend(self) -> StorageBackend:
+        if self.backend is None:
+            raise RuntimeError("Storage gateway is not initialized.")
+        return self.backend
+
+    def upload(
+        self, bucket_name: str, file_path: str, data: bytes, content_type: str | None
+    ) -> str:
+        """
+        Upload an object to a bucket.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            file_path (str): The path of the object inside the bucket.
+            data (bytes): The contents of the object.
+            content_type (str | None): The MIME type of the object.
+
+        Returns:
+            str: The public URL of the uploaded object.
+        """
+
+        self._get_backend().upload(bucket_name, file_path, data, content_type)
+
+        return self.get_public_url(bucket_name, file_path)
+
+    def remove(self, bucket_name: str, file_paths: list[str]) -> None:
+        """
+        Remove objects from a bucket, in as few requests as the backend allows.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            file_paths (list[str]): The paths of the objects inside the bucket.
+        """
+
+        for start in range(0, len(file_paths), self._remove_batch_size):
+            self._get_backend().remove(
+                bucket_name, file_paths[start : start + self._remove_batch_size]
+            )
+
+    def remove_by_public_urls(self, bucket_name: str, public_urls: list[str]) -> None:
+        """Remove objects from a bucket given their public URLs."""
+
+        self.remove(
+            bucket_name,
+            [
+                self.get_object_path(bucket_name, public_url)
+                for public_url in public_urls
+            ],
+        )
+
+    def get_public_url(self, bucket_name: str, file_path: str) -> str:
+        """Get the public URL of an object."""
+
+        return f"{self.get_public_url_prefix(bucket_name)}{file_path}"
+
+    def get_public_url_prefix(self, bucket_name: str) -> str:
+        """Get the URL that every public URL of a bucket starts with."""
+
+        return self._get_backend().get_public_url_prefix(bucket_name)
+
+    def get_object_path(self, bucket_name: str, public_url: str) -> str:
+        """
+        Get the path of an object inside a bucket from its public URL.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            public_url (str): e.g. ".../storage/v1/object/public/book_images/<book_id>/<file>"
+
+        Returns:
+            str: The object path, e.g. "<book_id>/<file>".
+        """
+
+        return public_url.split(f"/{bucket_name}/", 1)[-1].split("?", 1)[0]
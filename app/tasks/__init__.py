@@ -2,10 +2,20 @@ from .rental_cleanup import RentalCleanupTask
 from .rental_status import RentalStatusTask
 from .purchase_cleanup import PurchaseCleanupTask
 from .purchase_status import PurchaseStatusTask
+from .notification_changes import NotificationChangesTask
+from .notification_counts import NotificationCountsTask
+from .notification_digests import NotificationDigestsTask
+from .notification_partitions import NotificationPartitionsTask
+from .book_images import BookImagesTask
 
 __all__ = [
     "RentalCleanupTask",
     "RentalStatusTask",
     "PurchaseCleanupTask",
     "PurchaseStatusTask",
+    "NotificationChangesTask",
+    "NotificationCountsTask",
+    "NotificationDigestsTask",
+    "NotificationPartitionsTask",
+    "BookImagesTask",
 ]
@@ -0,0 +1,43 @@
+from flask import current_app
+import logging
+
+from app import socketio
+from ..common.constants import BookImagesStatusEnum
+from ..features.books.repository import BookRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BookImagesTask:
+    @staticmethod
+    def fail_orphaned_uploads():
+        """
+        Mark as 'failed' the books whose images have been 'pending' for longer than
+        BOOK_IMAGES_PENDING_TIMEOUT_SECONDS, and tell their owners so they can upload
+        the images again.
+
+        Upload jobs are queued in the memory of the process that received the book,
+        so a crash or restart loses them and leaves the book 'pending' for good.
+        """
+        try:
+            books = BookRepository.fail_stale_pending_book_images(
+                current_app.config.get("BOOK_IMAGES_PENDING_TIMEOUT_SECONDS", 1800)
+            )
+
+            for book in books:
+                socketio.emit(
+                    "book_images_status",
+                    {
+                        "bookId": str(book["book_id"]),
+                        "imagesStatus": BookImagesStatusEnum.failed.value,
+                    },
+                    room=str(book["owner_id"]),
+                )
+
+            logger.info(f"✅ Failed {len(books)} orphaned book image uploads")
+
+            return {"cleaned": len(books)}
+
+        except Exception as e:
+            logger.error(f"❌ Error failing orphaned book image uploads: {str(e)}")
+            return {"cleaned": 0, "error": str(e)}
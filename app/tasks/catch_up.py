@@ -0,0 +1,63 @@
+import eventlet
+import logging
+import time
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class CatchUpThrottle:
+    """
+    Paces a scheduler task that handles its rows in fixed-size batches.
+
+    A full batch means a backlog is waiting (e.g. after downtime). The task then
+    runs in catch-up mode: batches are limited to SCHEDULER_CATCH_UP_ROWS_PER_SECOND,
+    and the task yields between them. Each batch commits and returns its pooled
+    connection first, so requests get the connections while the backlog clears.
+    """
+
+    def __init__(self, task_name: str, batch_size: int) -> None:
+        self.task_name = task_name
+        self.batch_size = batch_size
+        self.rows_per_second = current_app.config.get(
+            "SCHEDULER_CATCH_UP_ROWS_PER_SECOND", 1000
+        )
+
+        self.full_batches = 0
+        self._batch_started = time.perf_counter()
+
+    def next_batch(self, batch_rows: int) -> bool:
+        """
+        Call after each batch. Pauses if the batch was full.
+
+        Args:
+            batch_rows (int): The number of rows the batch handled.
+
+        Returns:
+            bool: True if another batch should run.
+        """
+
+        if batch_rows < self.batch_size:
+            if self.full_batches:
+                logger.info(
+                    f"{self.task_name}: caught up after {self.full_batches + 1} batches"
+                )
+            return False
+
+        self.full_batches += 1
+
+        if self.full_batches == 1:
+            logger.info(
+                f"{self.task_name}: backlog found, catching up in batches of "
+                f"{self.batch_size} at up to {self.rows_per_second} rows/s"
+            )
+
+        elapsed = time.perf_counter() - self._batch_started
+
+        # Always yields, even when the batch already took longer than its budget
+        eventlet.sleep(max(self.batch_size / self.rows_per_second - elapsed, 0))
+
+        self._batch_started = time.perf_counter()
+
+        return True
@@ -0,0 +1,28 @@
+from flask import current_app
+import logging
+
+from ..features.notifications.repository import NotificationRepository
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationChangesTask:
+    @staticmethod
+    def prune_changes():
+        """
+        Delete the logged notification changes older than
+        NOTIFICATION_CHANGES_RETENTION_HOURS. Clients whose sync cursor is older
+        than the pruned changes are told to reload their inbox.
+        """
+        try:
+            pruned_count = NotificationRepository.prune_notification_changes(
+                current_app.config.get("NOTIFICATION_CHANGES_RETENTION_HOURS", 72)
+            )
+
+            logger.info(f"✅ Pruned {pruned_count} notification changes")
+
+            return {"cleaned": pruned_count}
+
+        except Exception as e:
+            logger.error(f"❌ Error pruning notification changes: {str(e)}")
+            return {"cleaned": 0, "error": str(e)}
@@ -0,0 +1,30 @@
+import logging
+
+from ..features.notifications.services import NotificationServices
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationCountsTask:
+    @staticmethod
+    def repair_unread_counts():
+        """
+        Recount unread notifications and fix the per-user counters that drifted.
+        The counters are normally kept exact by the triggers on notifications; this
+        is a safety net, run every NOTIFICATION_COUNTS_REPAIR_INTERVAL_SECONDS.
+        """
+        try:
+            repaired_count = (
+                NotificationServices.repair_unread_notifications_counts_service()
+            )
+
+            if repaired_count:
+                logger.warning(f"Repaired {repaired_count} unread notification counts")
+            else:
+                logger.info("Unread notification counts are consistent")
+
+            return {"updated": repaired_count}
+
+        except Exception as e:
+            logger.error(f"❌ Error repairing unread notification counts: {str(e)}")
+            return {"updated": 0, "error": str(e)}
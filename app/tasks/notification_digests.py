@@ -0,0 +1,36 @@
+from flask import current_app
+import logging
+
+from ..features.notifications.services import NotificationServices
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDigestsTask:
+    @staticmethod
+    def send_digests():
+        """
+        Email users their unread notifications as one digest per user.
+        This task:
+        1. Groups each user's unread notifications created since their last digest,
+           leaving out the ones younger than NOTIFICATION_DIGEST_DELAY_SECONDS
+        2. Sends the digests NOTIFICATION_DIGEST_BATCH_SIZE at a time, each batch
+           over one SMTP connection
+        Run every NOTIFICATION_DIGEST_INTERVAL_SECONDS, so a burst of notifications
+        results in at most one email per user per interval.
+        """
+        try:
+            sent_count = NotificationServices.send_notification_digests_service(
+                current_app.config.get("NOTIFICATION_DIGEST_WINDOW_SECONDS", 24 * 3600),
+                current_app.config.get("NOTIFICATION_DIGEST_DELAY_SECONDS", 15 * 60),
+                current_app.config.get("NOTIFICATION_DIGEST_MAX_ITEMS", 10),
+                current_app.config.get("NOTIFICATION_DIGEST_BATCH_SIZE", 50),
+            )
+
+            logger.info(f"✅ Sent {sent_count} notification digests")
+
+            return {"updated": sent_count}
+
+        except Exception as e:
+            logger.error(f"❌ Error sending notification digests: {str(e)}")
+            return {"updated": 0, "error": str(e)}
@@ -0,0 +1,41 @@
+from flask import current_app
+import logging
+
+from ..features.notifications.repository import NotificationRepository
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationPartitionsTask:
+    @staticmethod
+    def maintain_partitions():
+        """
+        Keep the monthly notifications partitions in shape.
+        This task:
+        1. Creates the partitions for the next NOTIFICATIONS_PARTITIONS_AHEAD_MONTHS months,
+           and for any month whose rows went to the default partition meanwhile
+        2. Drops the partitions older than NOTIFICATIONS_RETENTION_MONTHS, copying
+           their rows to notifications_archive first if NOTIFICATIONS_ARCHIVE is on
+        Dropping a partition removes a whole month of notifications at once, without
+        leaving dead rows to vacuum.
+        """
+        try:
+            created_count = NotificationRepository.create_notification_partitions(
+                current_app.config.get("NOTIFICATIONS_PARTITIONS_AHEAD_MONTHS", 2)
+            )
+
+            retired_count = NotificationRepository.retire_notification_partitions(
+                current_app.config.get("NOTIFICATIONS_RETENTION_MONTHS", 12),
+                current_app.config.get("NOTIFICATIONS_ARCHIVE", True),
+            )
+
+            logger.info(
+                f"✅ Created {created_count} and retired {retired_count} "
+                "notifications partitions"
+            )
+
+            return {"cleaned": retired_count, "created": created_count}
+
+        except Exception as e:
+            logger.error(f"❌ Error maintaining notifications partitions: {str(e)}")
+            return {"cleaned": 0, "created": 0, "error": str(e)}
@@ -1,14 +1,14 @@
+from app.db.queries.purchase_queries import PurchasesQueries
 from flask import current_app
-from datetime import datetime, timezone
 import logging
 
 from ..features.notifications.services import NotificationServices
 
-from ..features.books.services import BookServices
+from app.common.constants import NotificationTemplates
 
-from ..features.users.services import UserServices
+from app.utils.clock import get_clock
 
-from app.common.constants import NotificationMessages
+from .catch_up import CatchUpThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -18,124 +18,93 @@ class PurchaseCleanupTask:
     def cleanup_expired_purchases():
         """
         Clean up expired purchase requests.
-        This task:
-        1. Finds all pending purchases where reservation_expires_at < now
-        2. Releases reserved funds for each expired purchase
+        This task, in batches of SCHEDULER_BATCH_SIZE (paced by CatchUpThrottle):
+        1. Locks pending purchases where reservation_expires_at < now
+        2. Releases their reserved funds, grouped per buyer
         3. Deletes the expired purchase entries
+        All three steps run in one statement per batch, and the buyers' notifications
+        are queued in the outbox in the same transaction.
         """
         try:
             db = current_app.extensions["db"]
 
-            # Get current time in UTC
-            now = datetime.now(timezone.utc)
-
-            # Get all expired pending purchases
-            query = """
-                SELECT
-                    pb.purchase_id,
-                    pb.user_id,
-                    pb.book_id,
-                    pb.total_buy_cost,
-                    pb.reservation_expires_at
-                FROM purchased_books pb
-                WHERE pb.purchase_status = 'pending'
-                AND pb.reservation_expires_at < (NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours');
-            """
-
-            expired_purchases = db.fetch_all(query, ())
-
-            if not expired_purchases:
-                logger.info("No expired purchases found.")
-                return {"cleaned": 0, "errors": 0}
+            batch_size = current_app.config.get("SCHEDULER_BATCH_SIZE", 500)
+            throttle = CatchUpThrottle("cleanup_expired_purchases", batch_size)
 
             cleaned_count = 0
             error_count = 0
+            purchase_ids = []
 
-            for purchase in expired_purchases:
-                purchase_id = purchase.get("purchase_id")
-                buyer_id = str(purchase.get("user_id"))
-                total_cost = int(purchase.get("total_buy_cost", 0))
-
-                try:
-                    # Release reserved funds
-                    release_query = """
-                        UPDATE readits_wallets
-                        SET
-                            reserved_amount = reserved_amount - %s,
-                            last_updated = %s
-                        WHERE user_id = %s
-                        AND reserved_amount >= %s
-                        RETURNING wallet_id;
-                    """
-
-                    wallet_result = db.fetch_one(
-                        release_query, (total_cost, now, buyer_id, total_cost)
-                    )
-
-                    if not wallet_result:
-                        logger.warning(
-                            f"Failed to release funds for expired purchase {purchase_id}. "
-                            f"User: {buyer_id}, Amount: {total_cost}"
-                        )
-
-                    # Delete the purchase entry
-                    delete_query = """
-                        DELETE FROM purchased_books
-                        WHERE purchase_id = %s
-                        AND purchase_status = 'pending'
-                        RETURNING purchase_id;
-                    """
+            while True:
+                # The expiry notifications are queued in the outbox in the same
+                # transaction as the cleanup of their batch
+                with db.transaction() as conn:
+                    expired_purchases = conn.execute(
+                        PurchasesQueries.CLEANUP_EXPIRED_PURCHASES_BATCH,
+                        {**get_clock().query_params(), "batch_size": batch_size},
+                    ).fetchall()
 
-                    delete_result = db.fetch_one(delete_query, (purchase_id,))
-
-                    book_details = BookServices.get_book_details_service(
-                        purchase.get("book_id")
-                    )
-
-                    owner_id = (
-                        str(book_details["owner_user_id"]) if book_details else None
-                    )
+                    notifications = []
 
-                    owner_username = UserServices.get_username_service(owner_id)
+                    for purchase in expired_purchases:
+                        purchase_id = purchase["purchase_id"]
+                        buyer_id = str(purchase["user_id"])
 
-                    notification_header = (
-                        NotificationMessages.PURCHASE_REQUEST_EXPIRED_HEADER
-                    )
-                    notification_message = (
-                        NotificationMessages.PURCHASE_REQUEST_EXPIRED_MESSAGE.format(
-                            title=f"{book_details['title'] if book_details else None}",
-                            username=owner_username,
-                        )
-                    )
-
-                    NotificationServices.add_notification_service(
-                        owner_id,
-                        buyer_id,
-                        "purchase",
-                        notification_header,
-                        notification_message,
-                    )
-
-                    if delete_result:
                         cleaned_count += 1
-                        logger.info(
-                            f"Cleaned up expired purchase {purchase_id}. "
-                            f"Released {total_cost} readits for user {buyer_id}."
-                        )
-                    else:
-                        error_count += 1
-                        logger.error(f"Failed to delete expired purchase {purchase_id}")
+                        purchase_ids.append(purchase_id)
+
+                        if not purchase["funds_released"]:
+                            logger.warning(
+                                f"Failed to release funds for expired purchase {purchase_id}. "
+                                f"User: {buyer_id}, Amount: {purchase['total_buy_cost']}"
+                            )
+
+                        try:
+                            owner_id = (
+                                str(purchase["owner_id"])
+                                if purchase["owner_id"]
+                                else None
+                            )
+
+                            notifications.append(
+                                {
+                                    "sender_user_id": owner_id,
+                                    "receiver_user_id": buyer_id,
+                                    "notification_type": "purchase",
+                                    "template_id": NotificationTemplates.PURCHASE_REQUEST_EXPIRED,
+                                    "params": {
+                                        "title": purchase["title"],
+                                        "username": purchase["owner_username"],
+                                    },
+                                }
+                            )
+                        except Exception as e:
+                            error_count += 1
+                            logger.error(
+                                f"Error notifying expired purchase {purchase_id}: {str(e)}"
+                            )
+
+                    NotificationServices.add_notifications_bulk_service(
+                        notifications, conn=conn
+                    )
 
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error cleaning up purchase {purchase_id}: {str(e)}")
+                # A short batch means nothing expired is left
+                if not throttle.next_batch(len(expired_purchases)):
+                    break
 
-            logger.info(
-                f"Cleanup completed. Cleaned: {cleaned_count}, Errors: {error_count}"
-            )
+            if not cleaned_count:
+                logger.info("No expired purchases found.")
+            else:
+                logger.info(
+                    f"Cleanup completed. Cleaned: {cleaned_count}, Errors: {error_count}"
+                )
 
-            return {"cleaned": cleaned_count, "errors": error_count}
+            return {
+                "cleaned": cleaned_count,
+                "errors": error_count,
+                "purchase_ids": purchase_ids,
+            }
 
         except Exception as e:
             logger.error(f"Error in cleanup_expired_purchases: {str(e)}")
-            return {"cleaned": 0, "errors": 1}
+            return {"cleaned": 0, "errors": 1, "purchase_ids": []}
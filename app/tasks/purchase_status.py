@@ -1,14 +1,15 @@
 from app.db.queries.purchase_queries import PurchasesQueries
 from flask import current_app
 import logging
+from typing import Any
 
 from ..features.notifications.services import NotificationServices
 
-from ..features.books.services import BookServices
+from app.common.constants import NotificationTemplates
 
-from ..features.users.services import UserServices
+from app.utils.clock import get_clock
 
-from app.common.constants import NotificationMessages
+from .catch_up import CatchUpThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -23,65 +24,38 @@ class PurchaseStatusTask:
         db = current_app.extensions["db"]
 
         try:
-            updated_purchases = db.fetch_all(
-                PurchasesQueries.UPDATE_APPROVED_TO_PICKUP_CONFIRMATION, ()
+            batch_size = current_app.config.get("SCHEDULER_BATCH_SIZE", 500)
+            throttle = CatchUpThrottle(
+                "update_purchases_to_pickup_confirmation", batch_size
             )
 
-            updated_count = len(updated_purchases) if updated_purchases else 0
-
-            logger.info(
-                f"✅ Updated {updated_count} purchases to awaiting_pickup_confirmation"
-            )
-
-            for updated_purchase in updated_purchases:
-                if updated_purchase["book_id"]:
-
-                    book_details = BookServices.get_book_details_service(
-                        updated_purchase["book_id"]
-                    )
-
-                    owner_user_id = (
-                        str(book_details["owner_user_id"]) if book_details else None
+            updated_purchases = []
+
+            while True:
+                # The reminders are queued in the outbox in the same transaction as
+                # the status change. Each row already carries the book title and both
+                # usernames.
+                with db.transaction() as conn:
+                    batch = conn.execute(
+                        PurchasesQueries.UPDATE_APPROVED_TO_PICKUP_CONFIRMATION,
+                        {**get_clock().query_params(), "batch_size": batch_size},
+                    ).fetchall()
+
+                    NotificationServices.add_notifications_bulk_service(
+                        PurchaseStatusTask._build_pickup_reminder_notifications(batch),
+                        conn=conn,
                     )
 
-                    owner_username = UserServices.get_username_service(owner_user_id)
-                    buyer_username = UserServices.get_username_service(
-                        updated_purchase["user_id"]
-                    )
+                updated_purchases.extend(batch)
 
-                    notification_header = (
-                        NotificationMessages.PURCHASE_PICKUP_REMINDER_HEADER
-                    )
+                if not throttle.next_batch(len(batch)):
+                    break
 
-                    notification_message_renter = NotificationMessages.PURCHASE_PICKUP_REMINDER_BUYER_MESSAGE.format(
-                        title=f"{book_details['title'] if book_details else None}",
-                        meetup_location=updated_purchase["meetup_location"],
-                        username=owner_username,
-                    )
-
-                    notification_message_owner = NotificationMessages.PURCHASE_PICKUP_REMINDER_OWNER_MESSAGE.format(
-                        title=f"{book_details['title'] if book_details else None}",
-                        meetup_location=updated_purchase["meetup_location"],
-                        username=buyer_username,
-                    )
-
-                    # Send notification to buyer
-                    NotificationServices.add_notification_service(
-                        owner_user_id,
-                        updated_purchase["user_id"],
-                        "purchase",
-                        notification_header,
-                        notification_message_renter,
-                    )
+            updated_count = len(updated_purchases) if updated_purchases else 0
 
-                    # Send notification to owner
-                    NotificationServices.add_notification_service(
-                        updated_purchase["user_id"],
-                        owner_user_id,
-                        "purchase",
-                        notification_header,
-                        notification_message_owner,
-                    )
+            logger.info(
+                f"✅ Updated {updated_count} purchases to awaiting_pickup_confirmation"
+            )
 
             return {
                 "updated": updated_count,
@@ -95,3 +69,61 @@ class PurchaseStatusTask:
         except Exception as e:
             logger.error(f"❌ Error updating purchase statuses: {str(e)}")
             return {"updated": 0, "purchase_ids": [], "error": str(e)}
+
+    @staticmethod
+    def _build_pickup_reminder_notifications(
+        updated_purchases,
+    ) -> list[dict[str, Any]]:
+        """
+        Build the buyer and owner pickup reminders for a batch of updated purchases.
+
+        Args:
+            updated_purchases (list[dict]): Rows returned by the status update query.
+
+        Returns:
+            list[dict]: The notifications, ready for add_notifications_bulk_service.
+        """
+
+        notifications = []
+
+        for updated_purchase in updated_purchases or []:
+            if not updated_purchase["book_id"]:
+                continue
+
+            owner_user_id = (
+                str(updated_purchase["owner_id"])
+                if updated_purchase["owner_id"]
+                else None
+            )
+
+            # Send notification to buyer
+            notifications.append(
+                {
+                    "sender_user_id": owner_user_id,
+                    "receiver_user_id": str(updated_purchase["user_id"]),
+                    "notification_type": "purchase",
+                    "template_id": NotificationTemplates.PURCHASE_PICKUP_REMINDER_BUYER,
+                    "params": {
+                        "title": f"{updated_purchase['title']}",
+                        "meetup_location": updated_purchase["meetup_location"],
+                        "username": updated_purchase["owner_username"],
+                    },
+                }
+            )
+
+            # Send notification to owner
+            notifications.append(
+                {
+                    "sender_user_id": str(updated_purchase["user_id"]),
+                    "receiver_user_id": owner_user_id,
+                    "notification_type": "purchase",
+                    "template_id": NotificationTemplates.PURCHASE_PICKUP_REMINDER_OWNER,
+                    "params": {
+                        "title": f"{updated_purchase['title']}",
+                        "meetup_location": updated_purchase["meetup_location"],
+                        "username": updated_purchase["buyer_username"],
+                    },
+                }
+            )
+
+        return notifications
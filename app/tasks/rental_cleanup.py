@@ -1,14 +1,14 @@
+from app.db.queries.rental_queries import RentalsQueries
 from flask import current_app
-from datetime import datetime, timezone
 import logging
 
 from ..features.notifications.services import NotificationServices
 
-from ..features.books.services import BookServices
+from app.common.constants import NotificationTemplates
 
-from ..features.users.services import UserServices
+from app.utils.clock import get_clock
 
-from app.common.constants import NotificationMessages
+from .catch_up import CatchUpThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -18,132 +18,91 @@ class RentalCleanupTask:
     def cleanup_expired_rentals():
         """
         Clean up expired rental requests.
-        This task:
-        1. Finds all pending rentals where reservation_expires_at < now
-        2. Releases reserved funds for each expired rental
+        This task, in batches of SCHEDULER_BATCH_SIZE (paced by CatchUpThrottle):
+        1. Locks pending rentals where reservation_expires_at < now
+        2. Releases their reserved funds, grouped per renter
         3. Deletes the expired rental entries
+        All three steps run in one statement per batch, and the renters' notifications
+        are queued in the outbox in the same transaction.
         """
         try:
             db = current_app.extensions["db"]
 
-            # Get current time in UTC
-            now = datetime.now(timezone.utc)
-
-            print(f"Current time (UTC): {now}")
-
-            # Get all expired pending rentals
-            query = """
-                SELECT
-                    rb.rental_id,
-                    rb.user_id,
-                    rb.book_id,
-                    rb.total_rent_cost,
-                    rb.reservation_expires_at
-                FROM rented_books rb
-                WHERE rb.rent_status = 'pending'
-                AND rb.reservation_expires_at < (NOW() AT TIME ZONE 'UTC' + INTERVAL '8 hours');
-            """
-
-            expired_rentals = db.fetch_all(query, ())
-
-            if expired_rentals:
-                for r in expired_rentals:
-                    print(
-                        f"  - Rental {r.get('rental_id')}: expires at {r.get('reservation_expires_at')}"
-                    )
-
-            if not expired_rentals:
-                logger.info("No expired rentals found.")
-                return {"cleaned": 0, "errors": 0}
+            batch_size = current_app.config.get("SCHEDULER_BATCH_SIZE", 500)
+            throttle = CatchUpThrottle("cleanup_expired_rentals", batch_size)
 
             cleaned_count = 0
             error_count = 0
+            rental_ids = []
 
-            for rental in expired_rentals:
-                rental_id = rental.get("rental_id")
-                user_id = str(rental.get("user_id"))
-                total_cost = int(rental.get("total_rent_cost", 0))
-
-                try:
-                    # Release reserved funds
-                    release_query = """
-                        UPDATE readits_wallets
-                        SET
-                            reserved_amount = reserved_amount - %s,
-                            last_updated = %s
-                        WHERE user_id = %s
-                        AND reserved_amount >= %s
-                        RETURNING wallet_id;
-                    """
-
-                    wallet_result = db.fetch_one(
-                        release_query, (total_cost, now, user_id, total_cost)
-                    )
-
-                    if not wallet_result:
-                        logger.warning(
-                            f"Failed to release funds for expired rental {rental_id}. "
-                            f"User: {user_id}, Amount: {total_cost}"
-                        )
+            while True:
+                # The expiry notifications are queued in the outbox in the same
+                # transaction as the cleanup of their batch
+                with db.transaction() as conn:
+                    expired_rentals = conn.execute(
+                        RentalsQueries.CLEANUP_EXPIRED_RENTALS_BATCH,
+                        {**get_clock().query_params(), "batch_size": batch_size},
+                    ).fetchall()
 
-                    # Delete the rental entry
-                    delete_query = """
-                        DELETE FROM rented_books
-                        WHERE rental_id = %s
-                        AND rent_status = 'pending'
-                        RETURNING rental_id;
-                    """
+                    notifications = []
 
-                    delete_result = db.fetch_one(delete_query, (rental_id,))
-
-                    book_details = BookServices.get_book_details_service(
-                        rental.get("book_id")
-                    )
-
-                    owner_id = (
-                        str(book_details["owner_user_id"]) if book_details else None
-                    )
+                    for rental in expired_rentals:
+                        rental_id = rental["rental_id"]
+                        user_id = str(rental["user_id"])
 
-                    owner_username = UserServices.get_username_service(owner_id)
-
-                    notification_header = (
-                        NotificationMessages.RENTAL_REQUEST_EXPIRED_HEADER
-                    )
-                    notification_message = (
-                        NotificationMessages.RENTAL_REQUEST_EXPIRED_MESSAGE.format(
-                            title=f"{book_details['title'] if book_details else None}",
-                            username=owner_username,
-                        )
-                    )
-
-                    NotificationServices.add_notification_service(
-                        owner_id,
-                        user_id,
-                        "rent",
-                        notification_header,
-                        notification_message,
-                    )
-
-                    if delete_result:
                         cleaned_count += 1
-                        logger.info(
-                            f"Cleaned up expired rental {rental_id}. "
-                            f"Released {total_cost} readits for user {user_id}."
-                        )
-                    else:
-                        error_count += 1
-                        logger.error(f"Failed to delete expired rental {rental_id}")
+                        rental_ids.append(rental_id)
+
+                        if not rental["funds_released"]:
+                            logger.warning(
+                                f"Failed to release funds for expired rental {rental_id}. "
+                                f"User: {user_id}, Amount: {rental['total_rent_cost']}"
+                            )
+
+                        try:
+                            owner_id = (
+                                str(rental["owner_id"]) if rental["owner_id"] else None
+                            )
+
+                            notifications.append(
+                                {
+                                    "sender_user_id": owner_id,
+                                    "receiver_user_id": user_id,
+                                    "notification_type": "rent",
+                                    "template_id": NotificationTemplates.RENTAL_REQUEST_EXPIRED,
+                                    "params": {
+                                        "title": rental["title"],
+                                        "username": rental["owner_username"],
+                                    },
+                                }
+                            )
+                        except Exception as e:
+                            error_count += 1
+                            logger.error(
+                                f"Error notifying expired rental {rental_id}: {str(e)}"
+                            )
+
+                    NotificationServices.add_notifications_bulk_service(
+                        notifications, conn=conn
+                    )
 
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error cleaning up rental {rental_id}: {str(e)}")
+                # A short batch means nothing expired is left
+                if not throttle.next_batch(len(expired_rentals)):
+                    break
 
-            logger.info(
-                f"Cleanup completed. Cleaned: {cleaned_count}, Errors: {error_count}"
-            )
+            if not cleaned_count:
+                logger.info("No expired rentals found.")
+            else:
+                logger.info(
+                    f"Cleanup completed. Cleaned: {cleaned_count}, Errors: {error_count}"
+                )
 
-            return {"cleaned": cleaned_count, "errors": error_count}
+            return {
+                "cleaned": cleaned_count,
+                "errors": error_count,
+                "rental_ids": rental_ids,
+            }
 
         except Exception as e:
             logger.error(f"Error in cleanup_expired_rentals: {str(e)}")
-            return {"cleaned": 0, "errors": 1}
+            return {"cleaned": 0, "errors": 1, "rental_ids": []}
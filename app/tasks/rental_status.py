@@ -1,14 +1,15 @@
 from app.db.queries.rental_queries import RentalsQueries
 from flask import current_app
 import logging
+from typing import Any
 
 from ..features.notifications.services import NotificationServices
 
-from ..features.books.services import BookServices
+from app.common.constants import NotificationTemplates
 
-from ..features.users.services import UserServices
+from app.utils.clock import get_clock
 
-from app.common.constants import NotificationMessages
+from .catch_up import CatchUpThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -23,64 +24,42 @@ class RentalStatusTask:
         db = current_app.extensions["db"]
 
         try:
-            updated_rentals = db.fetch_all(
-                RentalsQueries.UPDATE_APPROVED_TO_PICKUP_CONFIRMATION, ()
+            batch_size = current_app.config.get("SCHEDULER_BATCH_SIZE", 500)
+            throttle = CatchUpThrottle(
+                "update_rentals_to_pickup_confirmation", batch_size
             )
 
-            updated_count = len(updated_rentals) if updated_rentals else 0
+            updated_rentals = []
 
-            logger.info(
-                f"✅ Updated {updated_count} rentals to awaiting_pickup_confirmation"
-            )
+            while True:
+                # The reminders are queued in the outbox in the same transaction as
+                # the status change. Each row already carries the book title and both
+                # usernames.
+                with db.transaction() as conn:
+                    batch = conn.execute(
+                        RentalsQueries.UPDATE_APPROVED_TO_PICKUP_CONFIRMATION,
+                        {**get_clock().query_params(), "batch_size": batch_size},
+                    ).fetchall()
 
-            for updated_rental in updated_rentals:
-                if updated_rental["book_id"]:
-                    book_details = BookServices.get_book_details_service(
-                        updated_rental["book_id"]
+                    NotificationServices.add_notifications_bulk_service(
+                        RentalStatusTask._build_reminder_notifications(
+                            batch,
+                            NotificationTemplates.RENTAL_PICKUP_REMINDER_RENTER,
+                            NotificationTemplates.RENTAL_PICKUP_REMINDER_OWNER,
+                        ),
+                        conn=conn,
                     )
 
-                    owner_id = (
-                        str(book_details["owner_user_id"]) if book_details else None
-                    )
+                updated_rentals.extend(batch)
 
-                    owner_username = UserServices.get_username_service(owner_id)
-                    renter_username = UserServices.get_username_service(
-                        updated_rental["user_id"]
-                    )
+                if not throttle.next_batch(len(batch)):
+                    break
 
-                    notification_header = (
-                        NotificationMessages.RENTAL_PICKUP_REMINDER_HEADER
-                    )
-
-                    notification_message_renter = NotificationMessages.RENTAL_PICKUP_REMINDER_RENTER_MESSAGE.format(
-                        title=f"{book_details['title'] if book_details else None}",
-                        username=owner_username,
-                        meetup_location=updated_rental["meetup_location"],
-                    )
-
-                    notification_message_owner = NotificationMessages.RENTAL_PICKUP_REMINDER_OWNER_MESSAGE.format(
-                        title=f"{book_details['title'] if book_details else None}",
-                        username=renter_username,
-                        meetup_location=updated_rental["meetup_location"],
-                    )
-
-                    # Send notification to renter
-                    NotificationServices.add_notification_service(
-                        owner_id,
-                        updated_rental["user_id"],
-                        "rent",
-                        notification_header,
-                        notification_message_renter,
-                    )
+            updated_count = len(updated_rentals) if updated_rentals else 0
 
-                    # Send notification to owner
-                    NotificationServices.add_notification_service(
-                        updated_rental["user_id"],
-                        owner_id,
-                        "rent",
-                        notification_header,
-                        notification_message_owner,
-                    )
+            logger.info(
+                f"✅ Updated {updated_count} rentals to awaiting_pickup_confirmation"
+            )
 
             return {
                 "updated": updated_count,
@@ -102,65 +81,42 @@ class RentalStatusTask:
         db = current_app.extensions["db"]
 
         try:
-            updated_rentals = db.fetch_all(
-                RentalsQueries.UPDATE_ONGOING_TO_RETURN_CONFIRMATION, ()
+            batch_size = current_app.config.get("SCHEDULER_BATCH_SIZE", 500)
+            throttle = CatchUpThrottle(
+                "update_rentals_to_return_confirmation", batch_size
             )
 
-            updated_count = len(updated_rentals) if updated_rentals else 0
-
-            logger.info(
-                f"✅ Updated {updated_count} rentals to awaiting_return_confirmation"
-            )
-
-            for updated_rental in updated_rentals:
-                if updated_rental["book_id"]:
-
-                    book_details = BookServices.get_book_details_service(
-                        updated_rental["book_id"]
-                    )
-
-                    owner_user_id = (
-                        str(book_details["owner_user_id"]) if book_details else None
-                    )
+            updated_rentals = []
 
-                    owner_username = UserServices.get_username_service(owner_user_id)
-                    renter_username = UserServices.get_username_service(
-                        updated_rental["user_id"]
-                    )
+            while True:
+                # The reminders are queued in the outbox in the same transaction as
+                # the status change. Each row already carries the book title and both
+                # usernames.
+                with db.transaction() as conn:
+                    batch = conn.execute(
+                        RentalsQueries.UPDATE_ONGOING_TO_RETURN_CONFIRMATION,
+                        {**get_clock().query_params(), "batch_size": batch_size},
+                    ).fetchall()
 
-                    notification_header = (
-                        NotificationMessages.RENTAL_RETURN_REMINDER_HEADER
+                    NotificationServices.add_notifications_bulk_service(
+                        RentalStatusTask._build_reminder_notifications(
+                            batch,
+                            NotificationTemplates.RENTAL_RETURN_REMINDER_RENTER,
+                            NotificationTemplates.RENTAL_RETURN_REMINDER_OWNER,
+                        ),
+                        conn=conn,
                     )
 
-                    notification_message_renter = NotificationMessages.RENTAL_RETURN_REMINDER_RENTER_MESSAGE.format(
-                        title=f"{book_details['title'] if book_details else None}",
-                        meetup_location=updated_rental["meetup_location"],
-                        username=owner_username,
-                    )
+                updated_rentals.extend(batch)
 
-                    notification_message_owner = NotificationMessages.RENTAL_RETURN_REMINDER_OWNER_MESSAGE.format(
-                        title=f"{book_details['title'] if book_details else None}",
-                        meetup_location=updated_rental["meetup_location"],
-                        username=renter_username,
-                    )
+                if not throttle.next_batch(len(batch)):
+                    break
 
-                    # Send notification to renter
-                    NotificationServices.add_notification_service(
-                        owner_user_id,
-                        updated_rental["user_id"],
-                        "rent",
-                        notification_header,
-                        notification_message_renter,
-                    )
+            updated_count = len(updated_rentals) if updated_rentals else 0
 
-                    # Send notification to owner
-                    NotificationServices.add_notification_service(
-                        updated_rental["user_id"],
-                        owner_user_id,
-                        "rent",
-                        notification_header,
-                        notification_message_owner,
-                    )
+            logger.info(
+                f"✅ Updated {updated_count} rentals to awaiting_return_confirmation"
+            )
 
             return {
                 "updated": updated_count,
@@ -172,3 +128,61 @@ class RentalStatusTask:
         except Exception as e:
             logger.error(f"❌ Error updating rental statuses for returns: {str(e)}")
             return {"updated": 0, "rental_ids": [], "error": str(e)}
+
+    @staticmethod
+    def _build_reminder_notifications(
+        updated_rentals, renter_template_id, owner_template_id
+    ) -> list[dict[str, Any]]:
+        """
+        Build the renter and owner reminders for a batch of updated rentals.
+
+        Args:
+            updated_rentals (list[dict]): Rows returned by the status update query.
+            renter_template_id (str): The NotificationTemplates ID sent to the renter.
+            owner_template_id (str): The NotificationTemplates ID sent to the owner.
+
+        Returns:
+            list[dict]: The notifications, ready for add_notifications_bulk_service.
+        """
+
+        notifications = []
+
+        for updated_rental in updated_rentals or []:
+            if not updated_rental["book_id"]:
+                continue
+
+            owner_user_id = (
+                str(updated_rental["owner_id"]) if updated_rental["owner_id"] else None
+            )
+
+            # Send notification to renter
+            notifications.append(
+                {
+                    "sender_user_id": owner_user_id,
+                    "receiver_user_id": str(updated_rental["user_id"]),
+                    "notification_type": "rent",
+                    "template_id": renter_template_id,
+                    "params": {
+                        "title": f"{updated_rental['title']}",
+                        "username": updated_rental["owner_username"],
+                        "meetup_location": updated_rental["meetup_location"],
+                    },
+                }
+            )
+
+            # Send notification to owner
+            notifications.append(
+                {
+                    "sender_user_id": str(updated_rental["user_id"]),
+                    "receiver_user_id": owner_user_id,
+                    "notification_type": "rent",
+                    "template_id": owner_template_id,
+                    "params": {
+                        "title": f"{updated_rental['title']}",
+                        "username": updated_rental["renter_username"],
+                        "meetup_location": updated_rental["meetup_location"],
+                    },
+                }
+            )
+
+        return notifications
@@ -6,9 +6,10 @@ from .get_cookie_max_age import (  # noqa: F401
 from .camel_case_converter import to_camel_case, dict_keys_to_camel  # noqa: F401
 from .asdict_enum_safe import asdict_enum_safe  # noqa: F401
 from .date_utils import DateUtils  # noqa: F401
-from .supabase import (  # noqa: F401
+from .book_image_upload import (  # noqa: F401
     upload_images_to_bucket_from_add_book_service,
     upload_images_to_bucket_from_edit_book_service,
 )
 from .password_validator import PasswordValidator  # noqa: F401
 from .to_int import to_int  # noqa: F401
+from .notification_templates import render_notification  # noqa: F401
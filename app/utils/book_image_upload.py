@@ -0,0 +1,114 @@
+import logging
+import traceback
+
+from typing import Any
+from datetime import datetime
+
+from uuid import uuid4
+
+from eventlet import tpool
+
+from app.common.dataclasses import QueuedBookImage
+from app.services.storage_gateway import StorageGateway
+from app.utils.image_variants import generate_image_variants
+
+logger = logging.getLogger(__name__)
+
+
+def upload_images_to_bucket_from_add_book_service(
+    storage: StorageGateway,
+    book_images: list[QueuedBookImage],
+    book_id,
+    bucket_name,
+    variant_format="webp",
+) -> list[dict[str, Any]]:
+    uploaded_urls = []
+
+    for book_image in book_images:
+        uploaded_urls.append(
+            _upload_book_image(
+                storage, book_image, book_id, bucket_name, variant_format
+            )
+        )
+
+    return uploaded_urls
+
+
+def upload_images_to_bucket_from_edit_book_service(
+    storage: StorageGateway,
+    book_images: list[QueuedBookImage],
+    book_id,
+    bucket_name,
+    existing_book_image_urls,
+    all_book_order,
+    variant_format="webp",
+) -> list[tuple[int, dict[str, Any]]]:
+    uploaded_urls_with_order_num = []
+
+    for book_image in book_images:
+        if not all_book_order:
+            order_num = len(existing_book_image_urls) + 1
+        else:
+            order_num = all_book_order.index(book_image.filename) + 1
+
+        uploaded_urls_with_order_num.append(
+            (
+                order_num,
+                _upload_book_image(
+                    storage, book_image, book_id, bucket_name, variant_format
+                ),
+            )
+        )
+
+    return uploaded_urls_with_order_num
+
+
+def _upload_book_image(
+    storage: StorageGateway,
+    book_image: QueuedBookImage,
+    book_id,
+    bucket_name,
+    variant_format,
+) -> dict[str, Any]:
+    """
+    Upload the original image and its thumbnail, card, and full variants.
+
+    The variant URLs are None if the image could not be decoded, in which case
+    clients fall back to the original.
+    """
+
+    # Create a path inside the bucket
+    object_name = f"{book_id}/{uuid4()}"
+
+    uploaded_url = {
+        "image_url": storage.upload(
+            bucket_name,
+            object_name,
+            book_image.data,
+            book_image.content_type,
+        ),
+        "thumbnail_url": None,
+        "card_url": None,
+        "full_url": None,
+        "uploaded_at": datetime.now(),
+    }
+
+    try:
+        # Resizing is CPU-bound, so run it on a native thread instead of the eventlet hub
+        variants = tpool.execute(
+            generate_image_variants, book_image.data, variant_format
+        )
+    except Exception as e:
+        logger.error(f"Generating variants of {book_image.filename} failed: {str(e)}")
+        traceback.print_exc()
+        return uploaded_url
+
+    for variant_name, variant in variants.items():
+        uploaded_url[f"{variant_name}_url"] = storage.upload(
+            bucket_name,
+            f"{object_name}_{variant_name}.{variant['extension']}",
+            variant["data"],
+            variant["content_type"],
+        )
+
+    return uploaded_url
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+
+class SystemClock:
+    """
+    Source of the current time for the scheduler and its tasks.
+
+    The clock is registered as app.extensions["clock"], so tests and benchmarks can
+    replace it with a FixedClock and run the tasks at any moment.
+    """
+
+    # Meetup and return dates and times are stored as local (UTC+8) wall-clock times
+    LOCAL_UTC_OFFSET = timedelta(hours=8)
+
+    def now(self) -> datetime:
+        """The current time, timezone-aware, in UTC."""
+        return datetime.now(timezone.utc)
+
+    def now_local(self) -> datetime:
+        """The current local time, naive, comparable with meetup dates and times."""
+        return self.to_local(self.now())
+
+    def to_local(self, moment: datetime) -> datetime:
+        return (moment.astimezone(timezone.utc) + self.LOCAL_UTC_OFFSET).replace(
+            tzinfo=None
+        )
+
+    def query_params(self) -> dict[str, datetime]:
+        """
+        Both readings of one instant, for queries taking %(now)s and %(now_local)s.
+
+        Returns:
+            dict: "now" (timestamptz) and "now_local" (timestamp without time zone).
+        """
+        now = self.now()
+        return {"now": now, "now_local": self.to_local(now)}
+
+
+class FixedClock(SystemClock):
+    """A clock that only moves when told to."""
+
+    def __init__(self, now: datetime) -> None:
+        self._now = now
+
+    def now(self) -> datetime:
+        return self._now
+
+    def set(self, now: datetime) -> None:
+        self._now = now
+
+    def advance(self, delta: timedelta) -> None:
+        self._now += delta
+
+
+_system_clock = SystemClock()
+
+
+def get_clock() -> SystemClock:
+    """Return the clock of the current app, or the system clock outside of one."""
+    if current_app:
+        return current_app.extensions.get("clock", _system_clock)
+    return _system_clock
@@ -9,6 +9,8 @@ from app.common.constants import (
 
 from app.common.dataclasses import User, Book, MyLibraryBook, Notification
 
+from .notification_templates import render_notification
+
 
 def convert_user_dict(user: dict) -> User:
     """Converts dict from db to a User class instance"""
@@ -137,20 +139,31 @@ def convert_my_library_book_dict(my_library_book: dict) -> MyLibraryBook:
         renter_username=my_library_book["renter_username"],
         renter_profile_image_url=my_library_book["renter_profile_image_url"],
         first_image_url=my_library_book["first_image_url"],
+        images_status=(
+            my_library_book["images_status"]
+            if my_library_book.get("images_status") is not None
+            else "ready"
+        ),
     )
 
 
 def convert_notification_dict(notification: dict) -> Notification:
-    """Converts dict from db to a Book class instance"""
+    """
+    Converts dict from db to a Notification class instance. Notifications stored
+    as a template are rendered here; older rows carry their text.
+    """
+
+    header, message = notification.get("header"), notification.get("message")
+
+    if notification.get("template_id") is not None:
+        header, message = render_notification(
+            notification["template_id"], notification.get("params")
+        )
 
     return Notification(
         notification_id=notification["notification_id"],
-        header=(
-            notification["header"] if notification.get("header") is not None else "-"
-        ),
-        message=(
-            notification["message"] if notification.get("message") is not None else "-"
-        ),
+        header=header if header is not None else "-",
+        message=message if message is not None else "-",
         created_at=(
             notification["created_at"]
             if isinstance(notification.get("created_at"), datetime)
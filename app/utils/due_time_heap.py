@@ -0,0 +1,72 @@
+import heapq
+
+
+class DueTimeHeap:
+    """
+    Min-heap of due times keyed by an ID, where each key has at most one due time.
+
+    Setting a key again replaces its due time; the old heap entry is left in place
+    and skipped when it reaches the top, so every operation stays O(log n).
+    Not thread-safe; meant for a single eventlet hub, where no method yields.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, str]] = []
+        self._due_times: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._due_times)
+
+    def set(self, key: str, due_at: float | None) -> None:
+        """
+        Set or replace the due time of a key.
+
+        Args:
+            key (str): e.g. "rented_books:<rental_id>".
+            due_at (float | None): Due time as a time.time() timestamp, or None if
+                the key no longer has anything due.
+        """
+
+        if due_at is None:
+            self._due_times.pop(key, None)
+            return
+
+        self._due_times[key] = due_at
+        heapq.heappush(self._heap, (due_at, key))
+
+        # Rebuild once stale entries outnumber live ones, to bound memory
+        if len(self._heap) > 2 * len(self._due_times) + 64:
+            self._heap = [(due, key) for key, due in self._due_times.items()]
+            heapq.heapify(self._heap)
+
+    def peek(self) -> float | None:
+        """Return the earliest due time, or None if the heap is empty."""
+
+        self._drop_stale_top()
+
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> list[str]:
+        """
+        Remove and return every key due at or before `now`, earliest first.
+
+        Args:
+            now (float): The current time.time() timestamp.
+        """
+
+        due_keys = []
+
+        while self.peek() is not None and self._heap[0][0] <= now:
+            _, key = heapq.heappop(self._heap)
+            del self._due_times[key]
+            due_keys.append(key)
+
+        return due_keys
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._due_times.clear()
+
+    def _drop_stale_top(self) -> None:
+        while self._heap and self._due_times.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
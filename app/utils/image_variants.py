@@ -0,0 +1,74 @@
+from io import BytesIO
+
+from PIL import Image, ImageOps, features
+
+# Longest edge (in pixels) of each generated variant of a book image
+BOOK_IMAGE_VARIANT_SIZES = {
+    "thumbnail": 200,
+    "card": 480,
+    "full": 1280,
+}
+
+_FORMATS = {
+    "webp": ("WEBP", "image/webp", "webp"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+}
+
+
+def generate_image_variants(
+    data: bytes, image_format: str = "webp", quality: int = 80
+) -> dict[str, dict[str, bytes | str]]:
+    """
+    Generate downscaled variants of an uploaded image.
+
+    The EXIF orientation of phone photos is applied to the pixels first, so the variants
+    display upright even without their metadata. Images are never upscaled.
+
+    Args:
+        data (bytes): The original image file.
+        image_format (str): "webp" or "jpeg". Falls back to "jpeg" if Pillow has no WebP support.
+        quality (int): The encoder quality (1-100).
+
+    Returns:
+        dict: A dictionary keyed by variant name ("thumbnail", "card", "full"), each containing:
+            - data (bytes): The encoded variant
+            - content_type (str): The MIME type of the variant
+            - extension (str): The file extension of the variant
+    """
+
+    if image_format == "webp" and not features.check("webp"):
+        image_format = "jpeg"
+
+    pil_format, content_type, extension = _FORMATS[image_format]
+
+    largest_edge = max(BOOK_IMAGE_VARIANT_SIZES.values())
+
+    with Image.open(BytesIO(data)) as original:
+        # Let the JPEG decoder skip detail the largest variant does not need
+        original.draft("RGB", (largest_edge, largest_edge))
+
+        image = ImageOps.exif_transpose(original)
+
+        if pil_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+
+        variants: dict[str, dict[str, bytes | str]] = {}
+
+        # Largest first, so each smaller variant is resized from the previous one
+        for variant_name, max_edge in sorted(
+            BOOK_IMAGE_VARIANT_SIZES.items(), key=lambda item: item[1], reverse=True
+        ):
+            variant = image.copy()
+            variant.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+            image = variant
+
+            buffer = BytesIO()
+            variant.save(buffer, format=pil_format, quality=quality, optimize=True)
+
+            variants[variant_name] = {
+                "data": buffer.getvalue(),
+                "content_type": content_type,
+                "extension": extension,
+            }
+
+    return variants
@@ -0,0 +1,52 @@
+from string import Formatter
+from typing import Any
+
+from app.common.constants import NotificationTemplates
+
+# A template split into (literal text, field name or None) parts
+CompiledTemplate = tuple[tuple[str, str | None], ...]
+
+
+def _compile_template(template: str) -> CompiledTemplate:
+    return tuple(
+        (literal, field) for literal, field, _, _ in Formatter().parse(template)
+    )
+
+
+# Parsed once at import, so rendering a notification is a join of its parts
+_COMPILED_TEMPLATES: dict[str, tuple[CompiledTemplate, CompiledTemplate]] = {
+    template_id: (_compile_template(header), _compile_template(message))
+    for template_id, (header, message) in NotificationTemplates.TEMPLATES.items()
+}
+
+
+def _render(template: CompiledTemplate, params: dict[str, Any]) -> str:
+    return "".join(
+        literal if field is None else f"{literal}{params.get(field, '')}"
+        for literal, field in template
+    )
+
+
+def render_notification(
+    template_id: str, params: dict[str, Any] | None
+) -> tuple[str | None, str | None]:
+    """
+    Render a stored notification template.
+
+    Args:
+        template_id (str): One of NotificationTemplates.
+        params (dict | None): The values of the template's fields. Missing ones
+            render empty.
+
+    Returns:
+        tuple: The header and message, or (None, None) for an unknown template.
+    """
+
+    compiled = _COMPILED_TEMPLATES.get(template_id)
+
+    if compiled is None:
+        return None, None
+
+    header, message = compiled
+
+    return _render(header, params or {}), _render(message, params or {})
@@ -0,0 +1,303 @@
+"""
+Measure scheduler task throughput and queries per tick against a local Postgres.
+
+Seeds N due rentals (expired reservations, pickups and returns within the hour) and
+N due purchases (expired reservations and pickups within the hour), then runs every
+scheduler task once per tick under a FixedClock. The first tick drains the seeded
+rows; later ticks show the cost of a tick with nothing due.
+
+Run it against a disposable local database with the migrations applied: the seeded
+users, books, rentals and purchases are deleted afterwards, along with any outbox
+events created during the run.
+
+Usage (from the project root, with the usual .env in place):
+    python -m benchmarks.scheduler_benchmark --rentals 3000 --purchases 2000 --ticks 3
+"""
+
+import argparse
+import os
+import time
+import uuid
+
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask
+from psycopg import Cursor
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+
+from app.db.connection import Database
+from app.tasks import (
+    PurchaseCleanupTask,
+    PurchaseStatusTask,
+    RentalCleanupTask,
+    RentalStatusTask,
+)
+from app.utils.clock import FixedClock
+
+
+class CountingCursor(Cursor):
+    """Cursor that counts the statements sent through it."""
+
+    statements = 0
+
+    def execute(self, query, params=None, **kwargs):
+        CountingCursor.statements += 1
+        return super().execute(query, params, **kwargs)
+
+
+TASKS = [
+    ("cleanup_expired_rentals", RentalCleanupTask.cleanup_expired_rentals),
+    ("cleanup_expired_purchases", PurchaseCleanupTask.cleanup_expired_purchases),
+    (
+        "update_rentals_to_pickup_confirmation",
+        RentalStatusTask.update_approved_to_pickup_confirmation,
+    ),
+    (
+        "update_rentals_to_return_confirmation",
+        RentalStatusTask.update_ongoing_to_return_confirmation,
+    ),
+    (
+        "update_purchases_to_pickup_confirmation",
+        PurchaseStatusTask.update_approved_to_pickup_confirmation,
+    ),
+]
+
+SEED_USERS = """
+    INSERT INTO users (username, email_address, password_hash, trust_score)
+    SELECT %(prefix)s || i, %(prefix)s || i || '@example.com', 'benchmark', 500
+    FROM generate_series(0, %(count)s - 1) AS i
+    RETURNING user_id;
+"""
+
+SEED_WALLETS = """
+    INSERT INTO readits_wallets (user_id, balance, reserved_amount)
+    SELECT unnest(%(user_ids)s::uuid[]), 1000000000, 1000000000;
+"""
+
+SEED_BOOKS = """
+    INSERT INTO books (
+        title, author, condition, description, availability, daily_rent_price,
+        security_deposit, purchase_price, rental_duration, owner_id, images_status
+    )
+    SELECT %(prefix)s || i, 'Benchmark', 'good', 'Benchmark book', 'both', 10, 100,
+        500, 7, %(owner_id)s, 'ready'
+    FROM generate_series(0, %(count)s - 1) AS i
+    RETURNING book_id;
+"""
+
+SEED_RENTAL = """
+    INSERT INTO rented_books (
+        rental_id, user_id, original_owner_id, book_id, rent_status, reserved_at,
+        reservation_expires_at, total_rent_cost, rental_duration_days, all_fees_captured,
+        meetup_time_window, meetup_location, latitude, longitude, meetup_date,
+        meetup_time, rent_end_date, actual_rate, actual_deposit
+    )
+    VALUES (
+        gen_random_uuid(), %s, %s, %s, %s, %s, %s, 170, 7, false, '9:00 AM - 10:00 AM',
+        'Benchmark', 10.3, 123.9, %s, %s, %s, 10, 100
+    );
+"""
+
+SEED_PURCHASE = """
+    INSERT INTO purchased_books (
+        purchase_id, user_id, book_id, original_owner_id, purchase_status, reserved_at,
+        reservation_expires_at, total_buy_cost, all_fees_captured, meetup_time_window,
+        meetup_location, latitude, longitude, meetup_date, meetup_time
+    )
+    VALUES (
+        gen_random_uuid(), %s, %s, %s, %s, %s, %s, 500, false, '9:00 AM - 10:00 AM',
+        'Benchmark', 10.3, 123.9, %s, %s
+    );
+"""
+
+GET_LAST_OUTBOX_EVENT_ID = (
+    "SELECT COALESCE(MAX(event_id), 0) AS event_id FROM outbox_events;"
+)
+
+CLEANUP = [
+    "DELETE FROM outbox_events WHERE event_id > %(last_event_id)s;",
+    "DELETE FROM rented_books WHERE user_id = ANY(%(user_ids)s::uuid[]);",
+    "DELETE FROM purchased_books WHERE user_id = ANY(%(user_ids)s::uuid[]);",
+    "DELETE FROM books WHERE owner_id = ANY(%(user_ids)s::uuid[]);",
+    "DELETE FROM readits_wallets WHERE user_id = ANY(%(user_ids)s::uuid[]);",
+    "DELETE FROM users WHERE user_id = ANY(%(user_ids)s::uuid[]);",
+]
+
+
+def split(total: int, parts: int) -> list[int]:
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def seed(conn, clock: FixedClock, rentals: int, purchases: int, users: int) -> list:
+    """
+    Insert the benchmark rows, all due at the clock's current time.
+
+    Returns:
+        list: The IDs of the seeded users; the first one owns every book.
+    """
+
+    prefix = f"bench_{uuid.uuid4().hex[:8]}_"
+
+    user_ids = [
+        row["user_id"]
+        for row in conn.execute(
+            SEED_USERS, {"prefix": prefix, "count": users + 1}
+        ).fetchall()
+    ]
+    owner_id, renter_ids = user_ids[0], user_ids[1:]
+
+    conn.execute(SEED_WALLETS, {"user_ids": user_ids})
+
+    book_ids = [
+        row["book_id"]
+        for row in conn.execute(
+            SEED_BOOKS,
+            {"prefix": prefix, "count": max(rentals, purchases), "owner_id": owner_id},
+        ).fetchall()
+    ]
+
+    now_local = clock.now_local()
+    expired_at = now_local - timedelta(minutes=5)
+    # Inside the one-hour reminder window of both status tasks
+    meetup_at = now_local + timedelta(minutes=30)
+    meetup_time = meetup_at.strftime("%H:%M")
+
+    expired, pickups, returns = split(rentals, 3)
+    rental_kinds = (
+        [("pending", expired_at, None, None)] * expired
+        + [("approved", expired_at, meetup_at.date(), None)] * pickups
+        + [("ongoing", expired_at, meetup_at.date(), meetup_at.date())] * returns
+    )
+
+    with conn.cursor() as cur:
+        cur.executemany(
+            SEED_RENTAL,
+            [
+                (
+                    renter_ids[i % len(renter_ids)],
+                    owner_id,
+                    book_ids[i],
+                    status,
+                    now_local - timedelta(hours=1),
+                    reservation_expires_at,
+                    meetup_date,
+                    meetup_time if meetup_date else None,
+                    rent_end_date,
+                )
+                for i, (status, reservation_expires_at, meetup_date, rent_end_date) in (
+                    enumerate(rental_kinds)
+                )
+            ],
+        )
+
+        expired, pickups = split(purchases, 2)
+        purchase_kinds = [("pending", expired_at, None)] * expired + [
+            ("approved", expired_at, meetup_at.date())
+        ] * pickups
+
+        cur.executemany(
+            SEED_PURCHASE,
+            [
+                (
+                    renter_ids[i % len(renter_ids)],
+                    book_ids[i],
+                    owner_id,
+                    status,
+                    now_local - timedelta(hours=1),
+                    reservation_expires_at,
+                    meetup_date,
+                    meetup_time if meetup_date else None,
+                )
+                for i, (status, reservation_expires_at, meetup_date) in enumerate(
+                    purchase_kinds
+                )
+            ],
+        )
+
+    return user_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--rentals", type=int, default=3000)
+    parser.add_argument("--purchases", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=2)
+    parser.add_argument("--tick-seconds", type=int, default=60)
+    parser.add_argument("--batch-size", type=int, default=500)
+    # Catch-up pacing is effectively off by default, to measure the raw query cost
+    parser.add_argument("--rows-per-second", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    clock = FixedClock(datetime.now(timezone.utc))
+
+    app = Flask(__name__)
+    app.config.update(
+        DATABASE_URL=args.database_url,
+        SCHEDULER_BATCH_SIZE=args.batch_size,
+        SCHEDULER_CATCH_UP_ROWS_PER_SECOND=args.rows_per_second,
+    )
+    app.extensions["clock"] = clock
+
+    # Same pool settings as Database.init_app, with statement counting added
+    db = Database()
+    db.conninfo = args.database_url
+    db.pool = ConnectionPool(
+        conninfo=args.database_url,
+        min_size=2,
+        max_size=3,
+        kwargs={
+            "row_factory": dict_row,
+            "prepare_threshold": None,
+            "cursor_factory": CountingCursor,
+        },
+    )
+    app.extensions["db"] = db
+
+    with db.transaction() as conn:
+        last_event_id = conn.execute(GET_LAST_OUTBOX_EVENT_ID).fetchone()["event_id"]
+        user_ids = seed(conn, clock, args.rentals, args.purchases, args.users)
+
+    print(
+        f"Seeded {args.rentals} due rentals and {args.purchases} due purchases "
+        f"(batch size {args.batch_size})"
+    )
+
+    try:
+        with app.app_context():
+            for tick in range(1, args.ticks + 1):
+                print(f"Tick {tick} at {clock.now_local():%Y-%m-%d %H:%M:%S} local")
+
+                for name, task in TASKS:
+                    statements = CountingCursor.statements
+                    start = time.perf_counter()
+
+                    result = task()
+
+                    elapsed = time.perf_counter() - start
+                    statements = CountingCursor.statements - statements
+                    rows = result.get("cleaned", result.get("updated", 0))
+
+                    print(
+                        f"  {name}: {rows} rows, {statements} queries, "
+                        f"{elapsed * 1000:.0f}ms, {rows / elapsed:.0f} rows/s"
+                        + (f", error: {result['error']}" if "error" in result else "")
+                    )
+
+                clock.advance(timedelta(seconds=args.tick_seconds))
+    finally:
+        with db.transaction() as conn:
+            for query in CLEANUP:
+                conn.execute(
+                    query, {"last_event_id": last_event_id, "user_ids": user_ids}
+                )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
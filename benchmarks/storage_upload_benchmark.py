@@ -0,0 +1,74 @@
+"""
+Measure book image upload throughput (variant generation + storage writes) offline.
+
+Uploads go through the same StorageGateway and upload helper as the book endpoints, using
+the local filesystem backend, so no Supabase project or network is needed.
+
+Usage (from the project root, with the usual .env in place):
+    python -m benchmarks.storage_upload_benchmark --images 20 --width 4000 --height 3000
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+from io import BytesIO
+
+from flask import Flask
+from PIL import Image
+
+from app.common.dataclasses import QueuedBookImage
+from app.services.storage_gateway import StorageGateway
+from app.utils import upload_images_to_bucket_from_add_book_service
+
+
+def make_photo(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.effect_noise((width, height), 64).convert("RGB").save(
+        buffer, format="JPEG", quality=90
+    )
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--format", default="webp", choices=["webp", "jpeg"])
+    args = parser.parse_args()
+
+    storage_dir = tempfile.mkdtemp(prefix="libris_storage_")
+
+    app = Flask(__name__)
+    app.config.update(STORAGE_BACKEND="local", LOCAL_STORAGE_DIR=storage_dir)
+
+    storage = StorageGateway()
+    storage.init_app(app)
+
+    photo = make_photo(args.width, args.height)
+    book_images = [
+        QueuedBookImage(filename=f"{i}.jpg", content_type="image/jpeg", data=photo)
+        for i in range(args.images)
+    ]
+
+    try:
+        start = time.perf_counter()
+
+        upload_images_to_bucket_from_add_book_service(
+            storage, book_images, "benchmark", "book_images", args.format
+        )
+
+        elapsed = time.perf_counter() - start
+
+        print(f"Uploaded {args.images} images ({len(photo) / 1024:.0f} KiB each)")
+        print(f"  total: {elapsed:.2f}s")
+        print(f"  per image: {elapsed / args.images * 1000:.0f}ms")
+        print(f"  throughput: {args.images / elapsed:.1f} images/s")
+    finally:
+        shutil.rmtree(storage_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
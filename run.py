@@ -8,8 +8,10 @@ from app import create_app, socketio  # noqa: E402
 app = create_app()
 if os.environ.get("WERKZEUG_RUN_MAIN") == "true" or not app.debug:
     from app.scheduler import init_scheduler
+    from app.services.outbox import init_outbox_worker
 
     init_scheduler(app)
+    init_outbox_worker(app)
 
 if __name__ == "__main__":
     socketio.run(app, host="0.0.0.0", port=8080, debug=True, use_reloader=False)